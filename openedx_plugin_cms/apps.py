@@ -76,6 +76,10 @@ class CustomPluginCMSConfig(AppConfig):
             return
 
         from . import signals  # pylint: disable=unused-import
+        # register the Celery tasks that are only queued by name, so that
+        # workers, which never import the management commands, know them.
+        from . import fleet  # pylint: disable=unused-import
+        from .views import course_audit  # pylint: disable=unused-import
         from .__about__ import __version__
         from .waffle import waffle_init
 
@@ -6,13 +6,15 @@ Oct-2021
 Log changes to published course content.
 """
 # python stuff
-from datetime import datetime
+from collections import defaultdict
 import json
 import logging
 
 # django stuff
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
 
 # open edx common libs
 from opaque_keys.edx.keys import CourseKey, UsageKey
@@ -24,33 +26,78 @@ from cms.djangoapps.contentstore.utils import (
     is_currently_visible_to_students,
 )
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 
 try:
     # for olive and later
     from xmodule.modulestore.django import (
         modulestore,
     )  # lint-amnesty, pylint: disable=wrong-import-order
+    from xmodule.modulestore import (
+        ModuleStoreEnum,
+    )  # lint-amnesty, pylint: disable=wrong-import-order
 except ImportError:
     # for backward compatibility with nutmeg and earlier
     from common.lib.xmodule.xmodule.modulestore.django import (
         modulestore,
     )  # lint-amnesty, pylint: disable=wrong-import-order
+    from common.lib.xmodule.xmodule.modulestore import (
+        ModuleStoreEnum,
+    )  # lint-amnesty, pylint: disable=wrong-import-order
 
 # our stuff
 from .utils import (
     round_seconds,
-    get_user,
+    get_cached_user,
+    prefetch_users,
     get_parent_location,
     is_dirty,
+    is_visible_to_students,
+    get_logged_versions,
+    logged_version_key,
     xblock_publication_date,
     make_url,
     get_ordinal_position,
+    get_display_name,
+    get_course_display_name,
 )
-from .models import CourseChangeLog
+from .http_cache import invalidate_change_log
+from .models import CourseBlockSnapshot, CourseChangeLog, CourseChangeLogWatermark
+from .block_index import CourseBlockIndex, normalize_key
+from .metrics import AuditorMetrics, get_modulestore
+from .writers import SNAPSHOT_FIELDS, CourseChangeLogWriter, write_block_snapshots
 
 log = logging.getLogger(__name__)
 User = get_user_model()
 
+# block categories for which a CourseChangeLogWatermark is kept. the auditor
+# skips the subtree of any of these that has not been published since the
+# last scan.
+WATERMARK_CATEGORIES = ("chapter", "sequential")
+
+
+def get_deleted_course_display_name(course_key: CourseKey) -> str:
+    """
+    Returns the display name of a course that is already gone from the
+    modulestore: from its CourseOverview if that has not been deleted yet,
+    else from the snapshot of its course block, else from the change log.
+    """
+    display_name = CourseOverview.objects.filter(id=course_key).values_list("display_name", flat=True).first()
+    if display_name is None:
+        display_name = (
+            CourseBlockSnapshot.objects.filter(course_id=course_key, category="course")
+            .values_list("display_name", flat=True)
+            .first()
+        )
+    if display_name is None:
+        display_name = (
+            CourseChangeLog.objects.filter(course_id=course_key, course_display_name__gt="")
+            .order_by("-id")
+            .values_list("course_display_name", flat=True)
+            .first()
+        )
+    return str(display_name or "")[:255]
+
 
 def write_log_delete_course(course_key: CourseKey, user_id: User) -> None:
     """
@@ -60,37 +107,69 @@ def write_log_delete_course(course_key: CourseKey, user_id: User) -> None:
         course_id=course_key, operation=CourseChangeLog.DB_DELETE
     )
     course_change_log.edited_by = user_id
+    if not course_change_log.course_display_name:
+        course_change_log.course_display_name = get_deleted_course_display_name(course_key)
     course_change_log.save()
+    transaction.on_commit(lambda: invalidate_change_log([course_key]))
+
+
+def write_log(
+    course_change_log: CourseChangeLog,
+    usage_key: UsageKey,
+    user: User,
+    xblock=None,
+    block_index=None,
+    writer: CourseChangeLogWriter = None,
+    published: bool = False,
+):
+    """
+    block_index: optional block_index.CourseBlockIndex for the course. When
+    provided, the parent and chapter/sequential/vertical ancestry of the block
+    are resolved from the index instead of from the modulestore.
 
+    writer: optional CourseChangeLogWriter. When provided, course_change_log
+    is queued for a bulk write rather than saved immediately.
 
-def write_log(course_change_log: CourseChangeLog, usage_key: UsageKey, user: User, xblock=None):
-    course_key = usage_key.course_key
+    published: True if xblock was loaded from the published branch, in which
+    case its visibility is evaluated without re-reading it from the modulestore.
+    """
     if not xblock:
-        xblock = modulestore().get_item(usage_key)
+        xblock = get_modulestore().get_item(usage_key)
+
+    # locations of the published branch carry branch and version information,
+    # which must not reach the stored keys or the urls.
+    location = normalize_key(xblock.location)
+    course_key = location.course_key
 
     # for building misc url's
     # ----------------------
     scheme = "https" if settings.HTTPS == "on" else "http"
     # ----------------------
 
-    parent = xblock.get_parent()
-    chapter_location = get_parent_location("chapter", xblock.location)
-    sequential_location = get_parent_location("sequential", xblock.location)
-    vertical_location = get_parent_location("vertical", xblock.location)
+    if block_index is not None and location in block_index:
+        parent_location = block_index.get_parent(location)
+    else:
+        parent = xblock.get_parent()
+        parent_location = normalize_key(parent.location) if parent else None
+    chapter_location = normalize_key(get_parent_location("chapter", xblock.location, block_index))
+    sequential_location = normalize_key(get_parent_location("sequential", xblock.location, block_index))
+    vertical_location = normalize_key(get_parent_location("vertical", xblock.location, block_index))
     display_name = xblock.display_name if len(str(xblock.display_name)) > 1 else "MISSING"
 
     # add the log data
     # ----------------------
-    course_change_log.url = scheme + ":" + get_lms_link_for_item(xblock.location)
+    course_change_log.url = scheme + ":" + get_lms_link_for_item(location)
     course_change_log.display_name = display_name
-    course_change_log.visible = is_currently_visible_to_students(xblock)
+    course_change_log.visible = (
+        is_visible_to_students(xblock) if published else is_currently_visible_to_students(xblock)
+    )
     course_change_log.category = xblock.category
-    course_change_log.course_id = xblock.location.course_key or course_key
+    course_change_log.course_id = course_key
 
-    if parent:
-        course_change_log.ordinal_position = get_ordinal_position(xblock.location, parent.location)
-        course_change_log.parent_location = parent.location
-        course_change_log.parent_url = make_url(parent.location, parent.category)
+    if parent_location:
+        course_change_log.ordinal_position = get_ordinal_position(location, parent_location, block_index)
+        course_change_log.parent_location = parent_location
+        course_change_log.parent_url = make_url(parent_location, parent_location.block_type)
 
     course_change_log.chapter_location = chapter_location
     course_change_log.chapter_url = make_url(chapter_location)
@@ -99,6 +178,16 @@ def write_log(course_change_log: CourseChangeLog, usage_key: UsageKey, user: Use
     course_change_log.vertical_location = vertical_location
     course_change_log.vertical_url = make_url(vertical_location)
 
+    # display names are captured now so that reports never read them from the modulestore.
+    course_location = get_parent_location("course", xblock.location, block_index) if block_index is not None else None
+    course_change_log.course_display_name = (
+        get_display_name(course_location, block_index) if course_location else get_course_display_name(course_key)
+    )
+    course_change_log.parent_display_name = get_display_name(parent_location, block_index)
+    course_change_log.chapter_display_name = get_display_name(chapter_location, block_index)
+    course_change_log.sequential_display_name = get_display_name(sequential_location, block_index)
+    course_change_log.vertical_display_name = get_display_name(vertical_location, block_index)
+
     course_change_log.edit_info = json.dumps({})
     course_change_log.source_version = None
     course_change_log.update_version = None
@@ -107,11 +196,15 @@ def write_log(course_change_log: CourseChangeLog, usage_key: UsageKey, user: Use
     course_change_log.original_usage_version = None
 
     course_change_log.release_date = xblock.start
-    course_change_log.published_by = get_user(xblock.published_by) if xblock.published_by > 0 else None
+    course_change_log.published_by = get_cached_user(xblock.published_by) if xblock.published_by > 0 else None
     course_change_log.published_on = round_seconds(xblock.published_on)
-    course_change_log.edited_by = get_user(xblock.edited_by) if xblock.edited_by > 0 else user
-    course_change_log.edited_on = round_seconds(xblock.edited_on) or round_seconds(datetime.now())
-    course_change_log.save()
+    course_change_log.edited_by = get_cached_user(xblock.edited_by) if xblock.edited_by > 0 else user
+    course_change_log.edited_on = round_seconds(xblock.edited_on) or round_seconds(timezone.now())
+    if writer is not None:
+        writer.add(course_change_log)
+    else:
+        course_change_log.save()
+        transaction.on_commit(lambda: invalidate_change_log([course_change_log.course_id]))
     # ----------------------
 
     log.info("write_log() logged block: {location}".format(location=xblock.location))
@@ -119,21 +212,102 @@ def write_log(course_change_log: CourseChangeLog, usage_key: UsageKey, user: Use
 
 def write_log_delete_item(usage_key: UsageKey, user: User) -> None:
     """
-    Log deletion of a course run.
-    """
-
-    publication_date = round_seconds(datetime.now())
-    course_change_log, created = CourseChangeLog.objects.update_or_create(
-        course_id=usage_key.course_key,
-        location=usage_key,
-        publication_date=publication_date,
-        operation=CourseChangeLog.DB_DELETE,
-    )
-
-    write_log(course_change_log, usage_key, user)
+    Log deletion of a block along with every block in its subtree.
 
+    By the time Studio sends item_deleted the block is already gone from the
+    modulestore, so the log rows are written entirely from the course's
+    CourseBlockSnapshot, in one batched write.
+    """
+    usage_key = normalize_key(usage_key)
+    course_key = usage_key.course_key
+    publication_date = round_seconds(timezone.now())
+
+    snapshots = {
+        str(snapshot.location): snapshot for snapshot in CourseBlockSnapshot.objects.filter(course_id=course_key)
+    }
+    children = defaultdict(list)
+    for snapshot in snapshots.values():
+        if snapshot.parent_location:
+            children[str(snapshot.parent_location)].append(str(snapshot.location))
+
+    subtree = []
+    pending = [str(usage_key)]
+    while pending:
+        location = pending.pop()
+        subtree.append(location)
+        pending.extend(children.get(location, []))
+
+    def get_snapshot_display_name(location) -> str:
+        # the ancestors of a deleted block are either still in the course or
+        # deleted along with it, and are snapshotted either way.
+        ancestor = snapshots.get(str(location)) if location else None
+        return ancestor.display_name if ancestor else ""
+
+    course_display_name = get_course_display_name(course_key)
+    writer = CourseChangeLogWriter()
+    for location in subtree:
+        snapshot = snapshots.get(location)
+        course_change_log = CourseChangeLog(
+            course_id=course_key,
+            course_display_name=course_display_name,
+            location=snapshot.location if snapshot else usage_key,
+            publication_date=publication_date,
+            operation=CourseChangeLog.DB_DELETE,
+            display_name="MISSING",
+            category=usage_key.block_type,
+            visible=False,
+            edit_info=json.dumps({}),
+            edited_by=user or None,
+            edited_on=publication_date,
+        )
+        if snapshot:
+            for field in SNAPSHOT_FIELDS:
+                setattr(course_change_log, field, getattr(snapshot, field))
+            course_change_log.parent_display_name = get_snapshot_display_name(snapshot.parent_location)
+            course_change_log.chapter_display_name = get_snapshot_display_name(snapshot.chapter_location)
+            course_change_log.sequential_display_name = get_snapshot_display_name(snapshot.sequential_location)
+            course_change_log.vertical_display_name = get_snapshot_display_name(snapshot.vertical_location)
+        else:
+            log.info("write_log_delete_item() no snapshot found for {location}".format(location=location))
+        writer.add(course_change_log)
+    writer.flush()
+
+    CourseBlockSnapshot.objects.filter(
+        course_id=course_key,
+        location__in=[snapshots[location].location for location in subtree if location in snapshots],
+    ).delete()
+
+
+def get_snapshot_values(xblock: XBlock, block_index: CourseBlockIndex) -> dict:
+    """
+    Returns the CourseBlockSnapshot field values of an indexed xblock.
+    """
+    location = normalize_key(xblock.location)
+    parent_location = block_index.get_parent(location)
+    chapter_location = block_index.get_ancestor("chapter", location)
+    sequential_location = block_index.get_ancestor("sequential", location)
+    vertical_location = block_index.get_ancestor("vertical", location)
+    display_name = xblock.display_name if len(str(xblock.display_name)) > 1 else "MISSING"
 
-def write_log_upsert(xblock: XBlock, user: User) -> None:
+    return {
+        "display_name": str(display_name)[:255],
+        "category": xblock.category,
+        "ordinal_position": block_index.get_ordinal_position(location, parent_location) if parent_location else None,
+        "url": make_url(location, xblock.category),
+        "parent_location": parent_location,
+        "parent_url": make_url(parent_location, parent_location.block_type) if parent_location else None,
+        "chapter_location": chapter_location,
+        "chapter_url": make_url(chapter_location),
+        "sequential_location": sequential_location,
+        "sequential_url": make_url(sequential_location),
+        "vertical_location": vertical_location,
+        "vertical_url": make_url(vertical_location),
+    }
+
+
+def write_log_upsert(
+    xblock: XBlock, user: User, block_index=None, writer: CourseChangeLogWriter = None, published: bool = False
+) -> None:
     """
     xblock_info: either an XBlockWithMixins or a dict
 
@@ -149,32 +323,90 @@ def write_log_upsert(xblock: XBlock, user: User) -> None:
     common.lib.xmodule.xmodule.modulestore.edit_info.EditInfoMixin
 
     a potentially good-to-know trick: xblock_orig_key, orig_version = store.get_block_original_usage(block_key)
+
+    writer: optional CourseChangeLogWriter. When provided, the upsert is deferred
+    to the writer's next flush().
+
+    published: True if xblock was loaded from the published branch.
     """
 
     publication_date = xblock_publication_date(xblock)
-    course_change_log, created = CourseChangeLog.objects.update_or_create(
-        location=xblock.location,
-        publication_date=publication_date,
-        operation=CourseChangeLog.DB_UPSERT,
-    )
-    write_log(course_change_log, xblock.location, user, xblock)
+    if writer is not None:
+        course_change_log = CourseChangeLog(
+            location=normalize_key(xblock.location),
+            publication_date=publication_date,
+            operation=CourseChangeLog.DB_UPSERT,
+        )
+    else:
+        course_change_log, created = CourseChangeLog.objects.update_or_create(
+            location=normalize_key(xblock.location),
+            publication_date=publication_date,
+            operation=CourseChangeLog.DB_UPSERT,
+        )
+    write_log(course_change_log, xblock.location, user, xblock, block_index, writer, published)
+
+
+def get_watermarks(course_key: CourseKey) -> dict:
+    """
+    Returns {location: CourseChangeLogWatermark} for course_key.
+    """
+    return {
+        str(watermark.location): watermark
+        for watermark in CourseChangeLogWatermark.objects.filter(course_id=course_key)
+    }
 
 
-def eval_course_block_changes(course_key: CourseKey, user: User) -> None:
+def save_watermarks(course_key: CourseKey, watermarks: dict, subtree_edited_on: dict) -> None:
     """
-    Inspect the blocks contained in a course structure.
-    Log any blocks whose content has changed since they
-    were last inspected.
+    Advance the watermarks of course_key to the subtree_edited_on values
+    observed during the traversal that just completed.
 
-    course_key:     opaque_keys.edx.keys.CourseKey
-                    nacar course-v1:edX+DemoX+Demo_Course
+    watermarks:         the result of get_watermarks(), prior to the traversal.
+    subtree_edited_on:  {location: datetime} for the chapters and sequentials
+                        that were visited.
+    """
+    to_create = []
+    to_update = []
+    for location, edited_on in subtree_edited_on.items():
+        watermark = watermarks.get(str(location))
+        if watermark is None:
+            to_create.append(
+                CourseChangeLogWatermark(course_id=course_key, location=location, subtree_edited_on=edited_on)
+            )
+        elif watermark.subtree_edited_on != edited_on:
+            watermark.subtree_edited_on = edited_on
+            watermark.modified = timezone.now()
+            to_update.append(watermark)
+
+    batch_size = settings.PLUGIN_CMS_BULK_BATCH_SIZE
+    with transaction.atomic():
+        CourseChangeLogWatermark.objects.bulk_create(to_create, batch_size=batch_size)
+        CourseChangeLogWatermark.objects.bulk_update(
+            to_update, ["subtree_edited_on", "modified"], batch_size=batch_size
+        )
+
+
+def get_published_subtree_edited_on(store, block_key):
     """
+    Returns the subtree_edited_on of the published version of block_key,
+    which changes whenever the block or any of its descendants is published.
+    """
+    with store.branch_setting(ModuleStoreEnum.Branch.published_only, block_key.course_key):
+        try:
+            return getattr(store.get_item(block_key), "subtree_edited_on", None)
+        except Exception:  # noqa: B902
+            return None
 
-    store = modulestore()
-    has_changes = store.has_changes(modulestore().get_course(course_key, depth=None))
-    if has_changes:
-        log.info("{course_key} has changes.".format(course_key=course_key))
 
+def iter_block_structure(store, course_key: CourseKey, filter_func):
+    """
+    Yields (block_key, parent_key, child_keys, xblock) for the blocks in the
+    collected block structure of course_key, in topological order. xblock is
+    fetched from the default (draft) branch of the modulestore.
+
+    filter_func(block_key, xblock=None) -> bool prunes a block along with
+    all of its descendants.
+    """
     # BlockStructureBlockData
     collected_block_structure = get_course_in_cache(course_key)
 
@@ -184,12 +416,232 @@ def eval_course_block_changes(course_key: CourseKey, user: User) -> None:
     # topological tree traversal.
     #
     # block_key is opaque_keys.edx.locator.BlockUsageLocator
-    for block_key in collected_block_structure.topological_traversal():
+    for block_key in collected_block_structure.topological_traversal(
+        filter_func=filter_func, yield_descendants_of_unyielded=False
+    ):
+        parents = collected_block_structure.get_parents(block_key)
+
         # xblock is also a BlockUsageLocator, but it's fully
         # initialized (the data contents at the block location are also initialized)
         xblock = store.get_item(block_key)
 
-        log.debug("auditing {location}.".format(location=xblock.location))
+        yield block_key, parents[0] if parents else None, collected_block_structure.get_children(block_key), xblock
+
+
+def iter_published_course(course: XBlock, filter_func):
+    """
+    Yields (block_key, parent_key, child_keys, xblock) for every block of a
+    course that was loaded from the published branch with full-depth prefetch,
+    parent-first in order of presentation. No further modulestore reads are
+    made beyond those of the prefetch.
+
+    filter_func(block_key, xblock=None) -> bool prunes a block along with
+    all of its descendants.
+    """
+    stack = [(course, None)]
+    while stack:
+        xblock, parent_key = stack.pop()
+        if not filter_func(xblock.location, xblock):
+            continue
+
+        children = xblock.get_children() if xblock.has_children else []
+        yield xblock.location, parent_key, [child.location for child in children], xblock
 
-        if is_dirty(xblock):
-            write_log_upsert(xblock, user)
+        stack.extend((child, xblock.location) for child in reversed(children))
+
+
+def eval_course_block_changes(
+    course_key: CourseKey, user: User, full_scan: bool = False, single_load: bool = None
+) -> dict:
+    """
+    Inspect the blocks contained in a course structure.
+    Log any blocks whose content has changed since they
+    were last inspected.
+
+    course_key:     opaque_keys.edx.keys.CourseKey
+                    nacar course-v1:edX+DemoX+Demo_Course
+    full_scan:      if True, ignore the chapter/sequential watermarks
+                    and visit every block in the course.
+    single_load:    if True, load the published course tree once with
+                    full-depth prefetch and derive everything from it.
+                    Otherwise traverse the block structure cache and
+                    fetch each block individually. Defaults to
+                    settings.PLUGIN_CMS_AUDITOR_SINGLE_LOAD.
+
+    Returns the AuditorMetrics of the run as a dict, which are also reported
+    as monitoring custom attributes.
+    """
+    if single_load is None:
+        single_load = settings.PLUGIN_CMS_AUDITOR_SINGLE_LOAD
+
+    metrics = AuditorMetrics(course_key)
+    with metrics.measure():
+        _eval_course_block_changes(course_key, user, full_scan, single_load, metrics)
+    return metrics.report()
+
+
+def _eval_course_block_changes(
+    course_key: CourseKey, user: User, full_scan: bool, single_load: bool, metrics: AuditorMetrics
+) -> None:
+    store = get_modulestore()
+
+    # every (location, publication_date) pair that we've already logged for
+    # this course, retrieved in a single query. dirty detection for the
+    # entire traversal is evaluated against this set.
+    logged_versions = get_logged_versions(course_key)
+
+    # block -> parent, block -> chapter/sequential/vertical ancestry and
+    # sibling ordinal positions, populated as we go. the traversal is
+    # topological, so every parent is indexed before any of its children.
+    block_index = CourseBlockIndex()
+
+    # change log rows are buffered for the duration of the traversal
+    # and then written in bulk.
+    writer = CourseChangeLogWriter()
+
+    # chapters and sequentials whose published subtree has not changed
+    # since the last scan are pruned from the traversal, along with all
+    # of their descendants.
+    #
+    # the first audit of a course that has no block snapshot yet always
+    # visits every block, so that deletions can be logged from then on.
+    if not full_scan and not CourseBlockSnapshot.objects.filter(course_id=course_key).exists():
+        full_scan = True
+    watermarks = {} if full_scan else get_watermarks(course_key)
+    subtree_edited_on = {}
+    dirty_xblocks = []
+    snapshots = {}
+
+    def is_modified_subtree(block_key, xblock=None) -> bool:
+        if block_key.block_type not in WATERMARK_CATEGORIES:
+            return True
+        if xblock is not None:
+            edited_on = getattr(xblock, "subtree_edited_on", None)
+        else:
+            edited_on = get_published_subtree_edited_on(store, block_key)
+        if edited_on is None:
+            return True
+        location = normalize_key(block_key)
+        subtree_edited_on[location] = edited_on
+        watermark = watermarks.get(str(location))
+        if watermark and watermark.subtree_edited_on and edited_on <= watermark.subtree_edited_on:
+            log.debug("skipping unmodified subtree {location}.".format(location=location))
+            return False
+        return True
+
+    def audit(blocks) -> None:
+        for block_key, parent_key, child_keys, xblock in blocks:
+            block_index.add_block(block_key, parent_key, xblock.display_name)
+            block_index.add_children(block_key, child_keys)
+
+            log.debug("auditing {location}.".format(location=xblock.location))
+            metrics.incr("blocks_visited")
+            snapshots[normalize_key(block_key)] = get_snapshot_values(xblock, block_index)
+
+            if is_dirty(xblock, logged_versions, published=single_load):
+                dirty_xblocks.append(xblock)
+                logged_versions.add(logged_version_key(xblock.location, xblock_publication_date(xblock)))
+
+    if single_load:
+        # since we're auditing changes to published course content, we load
+        # the published branch only, once, and prefetch the entire tree.
+        with store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+            course = store.get_course(course_key, depth=None)
+            audit(iter_published_course(course, is_modified_subtree))
+    else:
+        has_changes = store.has_changes(store.get_course(course_key, depth=None))
+        if has_changes:
+            log.info("{course_key} has changes.".format(course_key=course_key))
+        audit(iter_block_structure(store, course_key, is_modified_subtree))
+
+    # resolve all of the authors of the dirty blocks in one query.
+    prefetch_users({xblock.published_by for xblock in dirty_xblocks} | {xblock.edited_by for xblock in dirty_xblocks})
+    for xblock in dirty_xblocks:
+        write_log_upsert(xblock, user, block_index, writer, published=single_load)
+
+    inserted, updated = writer.flush()
+    write_block_snapshots(course_key, snapshots)
+    save_watermarks(course_key, get_watermarks(course_key) if full_scan else watermarks, subtree_edited_on)
+
+    metrics.incr("dirty_blocks", len(dirty_xblocks))
+    metrics.incr("rows_inserted", inserted)
+    metrics.incr("rows_updated", updated)
+
+
+# the display name columns of CourseChangeLog and the location columns they name.
+ANCESTOR_DISPLAY_NAME_FIELDS = {
+    "parent_display_name": "parent_location",
+    "chapter_display_name": "chapter_location",
+    "sequential_display_name": "sequential_location",
+    "vertical_display_name": "vertical_location",
+}
+
+
+def get_course_display_names(course_key: CourseKey) -> tuple:
+    """
+    Returns (course display name, {str(location): display name}) for the
+    blocks of course_key, from the published course tree, loaded once, and
+    from the change log itself for blocks that no longer exist.
+    """
+    display_names = {
+        str(normalize_key(location)): display_name
+        for location, display_name in CourseChangeLog.objects.filter(course_id=course_key)
+        .exclude(display_name="MISSING")
+        .order_by("id")
+        .values_list("location", "display_name")
+    }
+
+    store = modulestore()
+    with store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+        course = store.get_course(course_key, depth=None)
+    if course is None:
+        return get_deleted_course_display_name(course_key), display_names
+
+    for block_key, _, _, xblock in iter_published_course(course, lambda block_key, xblock=None: True):
+        if xblock.display_name:
+            display_names[str(normalize_key(block_key))] = str(xblock.display_name)[:255]
+    return str(course.display_name or "")[:255], display_names
+
+
+def backfill_display_names(course_key: CourseKey, batch_size: int = None) -> int:
+    """
+    Fill in the course and ancestor display names of the CourseChangeLog rows
+    of course_key that were written before these were captured. Returns the
+    number of rows updated.
+    """
+    batch_size = batch_size or settings.PLUGIN_CMS_BULK_BATCH_SIZE
+    course_display_name, display_names = get_course_display_names(course_key)
+    queryset = (
+        CourseChangeLog.objects.filter(course_id=course_key, course_display_name__isnull=True)
+        .only("id", *ANCESTOR_DISPLAY_NAME_FIELDS.values())
+        .order_by("id")
+    )
+    # modified is part of the change log's http validator, so it must move
+    # for clients to see the backfilled names.
+    update_fields = ["course_display_name", *ANCESTOR_DISPLAY_NAME_FIELDS, "modified"]
+
+    updated = 0
+    last_id = 0
+    while True:
+        chunk = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not chunk:
+            break
+        now = timezone.now()
+        for course_change_log in chunk:
+            course_change_log.modified = now
+            course_change_log.course_display_name = course_display_name
+            for field, location_field in ANCESTOR_DISPLAY_NAME_FIELDS.items():
+                location = getattr(course_change_log, location_field)
+                setattr(
+                    course_change_log, field, display_names.get(str(normalize_key(location)), "") if location else ""
+                )
+        CourseChangeLog.objects.bulk_update(chunk, update_fields, batch_size=batch_size)
+        updated += len(chunk)
+        last_id = chunk[-1].id
+
+    if updated:
+        invalidate_change_log([course_key])
+    log.info(
+        "backfill_display_names() updated {updated} rows of {course_key}".format(updated=updated, course_key=course_key)
+    )
+    return updated
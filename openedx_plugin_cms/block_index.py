@@ -0,0 +1,136 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+In-memory index of the blocks in a course structure.
+
+The auditor builds one of these per traversal so that ancestry lookups
+(parent, chapter, sequential, vertical) are dictionary reads rather than
+modulestore().get_item() -> get_parent() walks up the course tree.
+"""
+# python stuff
+import logging
+
+# open edx common libs
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import UsageKey
+
+log = logging.getLogger(__name__)
+
+# the block categories for which the index maintains a direct
+# block -> ancestor mapping.
+ANCESTOR_CATEGORIES = ("course", "chapter", "sequential", "vertical")
+
+
+def normalize_key(usage_key: UsageKey) -> UsageKey:
+    """
+    strip branch and version information from usage_key so that locations
+    originating from the block structure cache, the modulestore and the
+    Studio signals all compare equal. Course keys are normalized the same way.
+    """
+    if usage_key is None:
+        return None
+    try:
+        usage_key = usage_key.for_branch(None)
+    except AttributeError:
+        return usage_key
+    try:
+        return usage_key.version_agnostic()
+    except (AttributeError, InvalidKeyError):
+        # a key that is only a version has nothing else to compare on.
+        return usage_key
+
+
+class CourseBlockIndex:
+    """
+    block -> parent and block -> course/chapter/sequential/vertical ancestors,
+    plus a {child_location: ordinal} map per parent and the display names
+    of the blocks.
+
+    Blocks must be added parent-first, which is the natural order of
+    BlockStructure.topological_traversal() as well as of a depth-first
+    walk of the course tree.
+    """
+
+    def __init__(self):
+        self._parents = {}
+        self._ancestors = {}
+        self._ordinals = {}
+        self._display_names = {}
+
+    def __contains__(self, block_key) -> bool:
+        return normalize_key(block_key) in self._parents
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def add_block(self, block_key: UsageKey, parent_key: UsageKey = None, display_name: str = None) -> None:
+        """
+        register block_key as a child of parent_key.
+        """
+        block_key = normalize_key(block_key)
+        parent_key = normalize_key(parent_key)
+
+        ancestors = dict(self._ancestors.get(parent_key, {})) if parent_key else {}
+        if block_key.block_type in ANCESTOR_CATEGORIES:
+            ancestors[block_key.block_type] = block_key
+
+        self._parents[block_key] = parent_key
+        self._ancestors[block_key] = ancestors
+        if display_name is not None:
+            self._display_names[block_key] = display_name
+
+    def add_children(self, parent_key: UsageKey, child_keys) -> None:
+        """
+        register the ordered list of children of parent_key. ordinal positions
+        are 1-based, in order of presentation in the course outline.
+        """
+        self._ordinals[normalize_key(parent_key)] = {
+            normalize_key(child_key): ordinal for ordinal, child_key in enumerate(child_keys, start=1)
+        }
+
+    def has_children(self, parent_key: UsageKey) -> bool:
+        """
+        True if the child list of parent_key has been registered.
+        """
+        return normalize_key(parent_key) in self._ordinals
+
+    def get_ordinal_position(self, block_key: UsageKey, parent_key: UsageKey) -> int:
+        """
+        Returns the ordinal position of block_key within parent_key,
+        or -1 if not found.
+        """
+        return self._ordinals.get(normalize_key(parent_key), {}).get(normalize_key(block_key), -1)
+
+    def get_parent(self, block_key: UsageKey) -> UsageKey:
+        """
+        Returns the location of the parent of block_key, or None.
+        """
+        return self._parents.get(normalize_key(block_key))
+
+    def get_display_name(self, block_key: UsageKey) -> str:
+        """
+        Returns the display name that block_key was added with, or None.
+        """
+        return self._display_names.get(normalize_key(block_key))
+
+    def get_ancestor(self, category: str, block_key: UsageKey) -> UsageKey:
+        """
+        Returns the location of the nearest block of type category, starting
+        with block_key itself and then moving up the tree. This mirrors the
+        semantics of utils.get_parent_block().
+
+        Returns None if nothing is found.
+        """
+        category = (category or "").lower()
+        block_key = normalize_key(block_key)
+
+        if category in ANCESTOR_CATEGORIES:
+            return self._ancestors.get(block_key, {}).get(category)
+
+        while block_key:
+            if block_key.block_type == category:
+                return block_key
+            block_key = self._parents.get(block_key)
+        return None
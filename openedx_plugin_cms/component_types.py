@@ -0,0 +1,135 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Process-wide registry of the installed XBlock component types.
+
+XBlock.load_classes() imports every installed XBlock class, which is far too
+expensive to repeat for every course audit. The names that it returns are
+cached for the life of the process, and only recomputed when the
+fingerprint of the xblock.v1 entry points changes. Per-course results are
+memoized on the course's advanced_modules.
+
+Installing a package requires a restart, so the installed entry points are
+read from the package metadata once per process. XBlock.extra_entry_points,
+which tests use to register classes, are re-read on every call because that
+costs nothing. clear_component_types() drops everything.
+"""
+# python stuff
+import logging
+import threading
+
+# open edx stuff
+from xblock.core import XBlock
+
+try:
+    from importlib.metadata import entry_points
+except ImportError:
+    # python 3.7
+    entry_points = None
+    import pkg_resources
+
+log = logging.getLogger(__name__)
+
+XBLOCK_ENTRY_POINT_GROUP = "xblock.v1"
+
+STANDARD_COMPONENT_TYPES = frozenset(
+    [
+        "about",
+        "chapter",
+        "course",
+        "course_info",
+        "discussion",
+        "html",
+        "image",
+        "library",
+        "library_content",
+        "library_sourced",
+        "lti",
+        "lti_consumer",
+        "openassessment",
+        "sequential",
+        "unit",
+        "vertical",
+        "video",
+        "wrapper",
+    ]
+)
+
+_lock = threading.Lock()
+_installed_entry_points = None
+_signature = None
+_component_types = frozenset()
+_advanced_component_types = {}
+
+
+def _read_installed_entry_points() -> tuple:
+    if entry_points is None:
+        points = pkg_resources.iter_entry_points(XBLOCK_ENTRY_POINT_GROUP)
+        return tuple(sorted((point.name, str(point)) for point in points))
+
+    points = entry_points()
+    if hasattr(points, "select"):
+        points = points.select(group=XBLOCK_ENTRY_POINT_GROUP)
+    else:
+        # python 3.8, 3.9
+        points = points.get(XBLOCK_ENTRY_POINT_GROUP, [])
+    return tuple(sorted((point.name, point.value) for point in points))
+
+
+def get_entry_point_signature() -> tuple:
+    """
+    A fingerprint of the XBlock entry points: the installed ones, which are
+    read from the package metadata once per process, plus
+    XBlock.extra_entry_points.
+    """
+    global _installed_entry_points  # pylint: disable=global-statement
+
+    if _installed_entry_points is None:
+        _installed_entry_points = _read_installed_entry_points()
+    extra = tuple(sorted(name for name, _ in XBlock.extra_entry_points))
+    return extra + _installed_entry_points
+
+
+def clear_component_types() -> None:
+    """
+    Forget the installed entry points and the component types, which are
+    then recomputed by the next call.
+    """
+    global _installed_entry_points, _signature  # pylint: disable=global-statement
+
+    with _lock:
+        _installed_entry_points = None
+        _signature = None
+        _advanced_component_types.clear()
+
+
+def get_component_types() -> frozenset:
+    """
+    Returns the names of all of the installed XBlock classes.
+    """
+    global _signature, _component_types  # pylint: disable=global-statement
+
+    signature = get_entry_point_signature()
+    with _lock:
+        if signature != _signature:
+            log.info("get_component_types() loading the installed XBlock classes.")
+            _component_types = frozenset(name for name, class_ in XBlock.load_classes())
+            _advanced_component_types.clear()
+            _signature = signature
+        return _component_types
+
+
+def get_advanced_component_types(advanced_modules) -> tuple:
+    """
+    Returns the sorted names of the installed XBlock classes that are neither
+    standard component types nor listed in a course's advanced_modules.
+    """
+    component_types = get_component_types()
+    key = frozenset(advanced_modules or [])
+    with _lock:
+        retval = _advanced_component_types.get(key)
+        if retval is None:
+            retval = _advanced_component_types[key] = tuple(sorted(component_types - STANDARD_COMPONENT_TYPES - key))
+        return retval
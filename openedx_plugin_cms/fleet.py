@@ -0,0 +1,171 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Fleet-wide course audits.
+
+A run audits a list of courses concurrently, either on a local thread pool
+or as a Celery group, and records the outcome of every course in a
+CourseAuditCheckpoint. A run that is interrupted, or in which some courses
+failed, is resumed by running it again with the same run id: only the
+courses that have not succeeded yet are audited again.
+
+The local backend uses threads rather than processes because the
+modulestore's database clients are not fork-safe; the modulestore's
+branch settings are thread-local.
+"""
+# python stuff
+import logging
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# django stuff
+from django.conf import settings
+from django.db import connection
+from django.db.models import Avg, Count, F, Max, Sum
+from django.utils import timezone
+
+# Celery
+from celery import group, shared_task
+from edx_django_utils.monitoring import set_code_owner_attribute
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# our stuff
+from .models import CourseAuditCheckpoint
+from .views.course_audit import persist_analyzed_course
+
+log = logging.getLogger(__name__)
+
+BACKEND_LOCAL = "local"
+BACKEND_CELERY = "celery"
+BACKENDS = (BACKEND_LOCAL, BACKEND_CELERY)
+
+
+def create_run(course_keys, run_id: str = None) -> str:
+    """
+    Register course_keys under run_id, a new one if None. Courses that are
+    already part of the run keep their checkpoint. Returns the run id.
+    """
+    run_id = run_id or uuid.uuid4().hex
+    CourseAuditCheckpoint.objects.bulk_create(
+        [CourseAuditCheckpoint(run_id=run_id, course_id=course_key) for course_key in course_keys],
+        batch_size=settings.PLUGIN_CMS_BULK_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    return run_id
+
+
+def get_unfinished_course_keys(run_id: str) -> list:
+    """
+    The courses of run_id that are pending, failed, or were still running
+    when an earlier invocation of the run was interrupted.
+    """
+    return list(
+        CourseAuditCheckpoint.objects.filter(run_id=run_id)
+        .exclude(state=CourseAuditCheckpoint.SUCCEEDED)
+        .order_by("id")
+        .values_list("course_id", flat=True)
+    )
+
+
+def audit_course(run_id: str, course_key: CourseKey, incremental: bool = None) -> bool:
+    """
+    Audit one course of run_id and checkpoint the outcome. Failures are
+    recorded rather than raised, so that one course cannot stop the run.
+    Returns True if the course succeeded.
+    """
+    checkpoints = CourseAuditCheckpoint.objects.filter(run_id=run_id, course_id=course_key)
+    started = timezone.now()
+    checkpoints.update(state=CourseAuditCheckpoint.RUNNING, started=started, modified=started)
+    start = time.monotonic()
+    state = CourseAuditCheckpoint.SUCCEEDED
+    rows = None
+    error = None
+
+    try:
+        rows = persist_analyzed_course(course_key, incremental=incremental)
+    except Exception:  # noqa: B902
+        log.exception(
+            "audit_course() {run_id} failed to audit {course_key}".format(run_id=run_id, course_key=course_key)
+        )
+        state = CourseAuditCheckpoint.FAILED
+        error = traceback.format_exc()
+
+    finished = timezone.now()
+    checkpoints.update(
+        state=state,
+        attempts=F("attempts") + 1,
+        finished=finished,
+        modified=finished,
+        duration=time.monotonic() - start,
+        rows=rows,
+        error=error,
+    )
+    return state == CourseAuditCheckpoint.SUCCEEDED
+
+
+def _audit_course_in_thread(run_id: str, course_key: CourseKey, incremental: bool = None) -> bool:
+    try:
+        return audit_course(run_id, course_key, incremental)
+    finally:
+        # each worker thread has its own database connection.
+        connection.close()
+
+
+@shared_task()
+@set_code_owner_attribute
+def audit_course_task(run_id: str, course_key_str: str, incremental: bool = None) -> bool:
+    """
+    Celery backend: audit one course of a fleet run.
+    """
+    return audit_course(run_id, CourseKey.from_string(course_key_str), incremental)
+
+
+def run(run_id: str, concurrency: int = None, backend: str = BACKEND_LOCAL, incremental: bool = None) -> int:
+    """
+    Audit the unfinished courses of run_id. Returns the number of courses
+    that were audited (local backend) or queued (Celery backend).
+
+    The local backend blocks until every course is done, auditing at most
+    concurrency courses at a time. The Celery backend queues one task per
+    course and returns; concurrency is then that of the workers, and the
+    progress of the run is read from its checkpoints.
+    """
+    concurrency = concurrency or settings.PLUGIN_CMS_AUDIT_FLEET_CONCURRENCY
+    course_keys = get_unfinished_course_keys(run_id)
+    log.info(
+        "fleet.run() {run_id}: auditing {count} courses with the {backend} backend".format(
+            run_id=run_id, count=len(course_keys), backend=backend
+        )
+    )
+
+    if backend == BACKEND_CELERY:
+        group(audit_course_task.s(run_id, str(course_key), incremental) for course_key in course_keys).apply_async()
+        return len(course_keys)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda course_key: _audit_course_in_thread(run_id, course_key, incremental), course_keys))
+    return len(course_keys)
+
+
+def get_summary(run_id: str, slowest: int = 10) -> dict:
+    """
+    The state counts, durations and failures of run_id.
+    """
+    checkpoints = CourseAuditCheckpoint.objects.filter(run_id=run_id)
+    finished = checkpoints.filter(duration__isnull=False)
+    return {
+        "run_id": run_id,
+        "states": dict(checkpoints.values_list("state").annotate(count=Count("id")).order_by("state")),
+        "durations": finished.aggregate(total=Sum("duration"), mean=Avg("duration"), max=Max("duration")),
+        "rows": checkpoints.aggregate(total=Sum("rows"))["total"] or 0,
+        "slowest": list(finished.order_by("-duration").values_list("course_id", "duration")[:slowest]),
+        "failures": list(
+            checkpoints.filter(state=CourseAuditCheckpoint.FAILED).values_list("course_id", "error").order_by("id")
+        ),
+    }
@@ -0,0 +1,191 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+HTTP conditional requests and rendered page caching for the report views.
+
+Every report is derived from one of two validators:
+    course audit    the published CourseAuditPointer generation of the course.
+    change log      the latest CourseChangeLog id and modification time of
+                    the course, or of all courses.
+
+Validators are kept in the Django cache, so that answering a conditional GET
+with 304 Not Modified does not query the database. The writers invalidate
+the validators of a course whenever they change its rows; bulk purges bump
+an epoch that invalidates all of them at once. A validator that is not
+cached is recomputed with a single query.
+
+Rendered pages are cached under their validator, so they never have to be
+invalidated: a new validator simply misses the cache.
+"""
+# python stuff
+import logging
+from collections import namedtuple
+from functools import wraps
+from hashlib import md5
+
+# django stuff
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+from django.views.decorators.http import condition
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# our stuff
+from .block_index import normalize_key
+from .models import CourseAuditPointer, CourseChangeLog
+
+log = logging.getLogger(__name__)
+
+HTTP_CACHE_NAMESPACE = "plugin.cms.http_cache."
+ALL_COURSES = "all"
+
+Validator = namedtuple("Validator", ["version", "last_modified"])
+
+
+def _epoch() -> int:
+    return cache.get(HTTP_CACHE_NAMESPACE + "epoch", 0)
+
+
+def _validator_key(name: str, course_key, epoch: int) -> str:
+    # keys of the published branch must invalidate the validator of the course.
+    course_key = normalize_key(course_key) if course_key else ALL_COURSES
+    return "{namespace}{epoch}.{name}.{course_key}".format(
+        namespace=HTTP_CACHE_NAMESPACE, epoch=epoch, name=name, course_key=course_key
+    )
+
+
+def _get_validator(name: str, course_key, compute) -> Validator:
+    key = _validator_key(name, course_key, _epoch())
+    validator = cache.get(key)
+    if validator is None:
+        validator = compute(course_key)
+        cache.set(key, validator, settings.PLUGIN_CMS_HTTP_CACHE_TIMEOUT)
+    return validator
+
+
+def _compute_course_audit_validator(course_key) -> Validator:
+    pointer = CourseAuditPointer.objects.filter(course_id=course_key).values("generation", "modified").first()
+    if not pointer:
+        return Validator("0", None)
+    return Validator(str(pointer["generation"]), pointer["modified"])
+
+
+def _compute_change_log_validator(course_key) -> Validator:
+    queryset = CourseChangeLog.objects.all()
+    if course_key:
+        queryset = queryset.filter(course_id=course_key)
+    latest = queryset.aggregate(id=Max("id"), modified=Max("modified"))
+    if latest["id"] is None:
+        return Validator("0", None)
+    version = "{id}.{modified}".format(id=latest["id"], modified=latest["modified"].timestamp())
+    return Validator(version, latest["modified"])
+
+
+def get_course_audit_validator(course_key: CourseKey) -> Validator:
+    return _get_validator("audit", course_key, _compute_course_audit_validator)
+
+
+def get_change_log_validator(course_key: CourseKey = None) -> Validator:
+    """
+    course_key: None for the change log of all courses.
+    """
+    return _get_validator("change_log", course_key, _compute_change_log_validator)
+
+
+def invalidate_course_audit(course_key: CourseKey) -> None:
+    cache.delete(_validator_key("audit", course_key, _epoch()))
+
+
+def invalidate_change_log(course_keys) -> None:
+    """
+    course_keys: the courses whose change log rows were written.
+    """
+    epoch = _epoch()
+    keys = {_validator_key("change_log", course_key, epoch) for course_key in course_keys}
+    keys.add(_validator_key("change_log", None, epoch))
+    cache.delete_many(list(keys))
+
+
+def invalidate_all() -> None:
+    """
+    Invalidate every validator, for writes that may touch any course.
+    """
+    key = HTTP_CACHE_NAMESPACE + "epoch"
+    # cache.add is a no-op if the key exists; incr fails if it doesn't.
+    cache.add(key, 0, None)
+    cache.incr(key)
+
+
+def get_etag(request, validator: Validator) -> str:
+    """
+    Rendered pages include per-user and per-session content, so the etag of
+    one user's page never matches another's.
+    """
+    session_key = getattr(getattr(request, "session", None), "session_key", None)
+    return md5(
+        "{version}|{user_id}|{session_key}".format(
+            version=validator.version, user_id=request.user.pk, session_key=session_key
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def conditional_view(get_validator, cache_page: bool = True):
+    """
+    Decorate a report view to answer conditional GETs from its validator.
+
+    get_validator: called with the course_key of the request, or None.
+    cache_page: cache the rendered response under its etag. Not for
+    streaming responses.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, course_id=None, **kwargs):
+            course_key = CourseKey.from_string(course_id) if course_id else None
+            validator = get_validator(course_key)
+            etag = get_etag(request, validator)
+
+            def render(request, *args, **kwargs):
+                if not cache_page:
+                    return view_func(request, *args, **kwargs)
+
+                page_key = (
+                    HTTP_CACHE_NAMESPACE
+                    + "page."
+                    + md5(
+                        "{view}|{etag}|{path}".format(
+                            view=view_func.__name__, etag=etag, path=request.get_full_path()
+                        ).encode("utf-8")
+                    ).hexdigest()
+                )
+                cached = cache.get(page_key)
+                if cached is not None:
+                    content, content_type = cached
+                    return HttpResponse(content, content_type=content_type)
+
+                response = view_func(request, *args, **kwargs)
+                if response.status_code == 200 and not response.streaming:
+                    cache.set(
+                        page_key,
+                        (response.content, response["Content-Type"]),
+                        settings.PLUGIN_CMS_HTTP_CACHE_TIMEOUT,
+                    )
+                return response
+
+            conditional_render = condition(
+                etag_func=lambda *args, **kwargs: etag,
+                last_modified_func=lambda *args, **kwargs: validator.last_modified,
+            )(render)
+            response = conditional_render(request, *args, course_id=course_id, **kwargs)
+            # the browser may keep the page, but must revalidate it before each use.
+            response["Cache-Control"] = "private, no-cache"
+            return response
+
+        return wrapper
+
+    return decorator
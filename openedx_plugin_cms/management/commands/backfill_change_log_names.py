@@ -0,0 +1,80 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Management command to fill in the course and ancestor display names of the
+change log rows that were written before these were captured.
+"""
+# python
+import logging
+
+# django
+from django.core.management.base import BaseCommand, CommandError
+
+# open edx
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.auditor import backfill_display_names
+from openedx_plugin_cms.models import CourseChangeLog
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+        Management command to backfill CourseChangeLog display names. Each
+        course is loaded from the modulestore once; courses whose rows are
+        all filled in already are skipped, so the command can be re-run.
+
+    Example usage:
+    ./manage.py cms backfill_change_log_names
+    ./manage.py cms backfill_change_log_names -c course-v1:edX+DemoX+Demo_Course
+    """
+
+    help = """
+    backfill the course and ancestor display names of the change log.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-c",
+            "--course-key",
+            metavar="COURSE_KEY",
+            dest="course_key",
+            help="backfill only this course. nacar: course-v1:edX+DemoX+Demo_Course",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            dest="batch_size",
+            help="overrides PLUGIN_CMS_BULK_BATCH_SIZE.",
+        )
+
+    def handle(self, *args, **options):
+        if options.get("course_key"):
+            try:
+                course_keys = [CourseKey.from_string(options["course_key"])]
+            except InvalidKeyError as e:
+                raise CommandError("You must specify a valid course-key") from e
+        else:
+            course_keys = list(
+                CourseChangeLog.objects.filter(course_display_name__isnull=True)
+                .values_list("course_id", flat=True)
+                .distinct()
+                .order_by("course_id")
+            )
+
+        total = 0
+        for course_key in course_keys:
+            try:
+                updated = backfill_display_names(course_key, batch_size=options.get("batch_size"))
+            except Exception:  # noqa: B902
+                log.exception("backfill_change_log_names failed for {course_key}".format(course_key=course_key))
+                self.stderr.write("{course_key}: failed".format(course_key=course_key))
+                continue
+            self.stdout.write("{course_key}: {updated} rows".format(course_key=course_key, updated=updated))
+            total += updated
+        self.stdout.write("Backfilled {total} rows".format(total=total))
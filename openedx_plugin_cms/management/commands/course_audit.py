@@ -18,6 +18,7 @@ from openedx.core.djangoapps.content.course_overviews.models import CourseOvervi
 
 
 # this repo
+from openedx_plugin_cms import fleet
 from openedx_plugin_cms.views.course_audit import persist_analyzed_course
 
 log = logging.getLogger(__name__)
@@ -29,6 +30,11 @@ class Command(BaseCommand):
 
     Example usage:
     ./manage.py cms audit_course -c course-v1:edX+DemoX+Demo_Course
+
+    Without a course key, every course is audited as a fleet run, see fleet.py:
+    ./manage.py cms audit_course --concurrency 8
+    ./manage.py cms audit_course --run-id 5f0c... # resume an interrupted run
+    ./manage.py cms audit_course --run-id 5f0c... --summary
     """
 
     help = """
@@ -43,6 +49,37 @@ class Command(BaseCommand):
             dest="course_key",
             help="course run key. nacar: course-v1:edX+DemoX+Demo_Course",
         )
+        parser.add_argument(
+            "--full",
+            action="store_false",
+            dest="incremental",
+            default=None,
+            help="re-analyze every vertical, rather than only those that changed since the last audit.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            dest="concurrency",
+            help="number of courses to audit at a time. defaults to PLUGIN_CMS_AUDIT_FLEET_CONCURRENCY.",
+        )
+        parser.add_argument(
+            "--backend",
+            choices=fleet.BACKENDS,
+            default=fleet.BACKEND_LOCAL,
+            dest="backend",
+            help="audit on a local thread pool, or queue one Celery task per course.",
+        )
+        parser.add_argument(
+            "--run-id",
+            dest="run_id",
+            help="resume the fleet run with this id, auditing only the courses that have not succeeded.",
+        )
+        parser.add_argument(
+            "--summary",
+            action="store_true",
+            dest="summary",
+            help="print the summary of --run-id and exit.",
+        )
 
     def handle(self, *args, **options):
         course_key = options.get("course_key")
@@ -53,10 +90,40 @@ class Command(BaseCommand):
             except InvalidKeyError as e:
                 raise CommandError("You must specify a valid course-key") from e
 
-            persist_analyzed_course(course_key)
-        else:
-            courses = CourseOverview.objects.all()
-            for course in courses:
-                course_key = CourseKey.from_string(str(course))
-                print("Analyzing course {course_key}".format(course_key=course_key))
-                persist_analyzed_course(course_key)
+            persist_analyzed_course(course_key, incremental=options.get("incremental"))
+            return
+
+        run_id = options.get("run_id")
+        if options.get("summary"):
+            if not run_id:
+                raise CommandError("You must specify the --run-id of the summary")
+            self.write_summary(fleet.get_summary(run_id))
+            return
+
+        if not run_id:
+            run_id = fleet.create_run(CourseOverview.objects.order_by("id").values_list("id", flat=True))
+        self.stdout.write("Fleet course audit run {run_id}".format(run_id=run_id))
+
+        fleet.run(
+            run_id,
+            concurrency=options.get("concurrency"),
+            backend=options.get("backend"),
+            incremental=options.get("incremental"),
+        )
+        self.write_summary(fleet.get_summary(run_id))
+
+    def write_summary(self, summary: dict):
+        self.stdout.write("Run {run_id}".format(run_id=summary["run_id"]))
+        for state, count in summary["states"].items():
+            self.stdout.write("  {state}: {count}".format(state=state, count=count))
+        for name, value in summary["durations"].items():
+            self.stdout.write("  {name} duration: {value:.1f}s".format(name=name, value=value or 0))
+        self.stdout.write("  rows written: {rows}".format(rows=summary["rows"]))
+        self.stdout.write("  slowest courses:")
+        for course_key, duration in summary["slowest"]:
+            self.stdout.write("    {course_key}: {duration:.1f}s".format(course_key=course_key, duration=duration))
+        if summary["failures"]:
+            self.stdout.write("  failures:")
+            for course_key, error in summary["failures"]:
+                last_line = (error or "").strip().splitlines()[-1:] or [""]
+                self.stdout.write("    {course_key}: {error}".format(course_key=course_key, error=last_line[0]))
@@ -45,6 +45,12 @@ class Command(BaseCommand):
             dest="course_key",
             help="course run key. nacar: course-v1:edX+DemoX+Demo_Course",
         )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            dest="full_scan",
+            help="ignore the audit watermarks and inspect every block in the course.",
+        )
 
     def handle(self, *args, **options):
         course_key = options.get("course_key")
@@ -57,4 +63,9 @@ class Command(BaseCommand):
         except InvalidKeyError as e:
             raise CommandError("You must specify a valid course-key") from e
 
-        eval_course_block_changes(course_key, user=None)
+        metrics = eval_course_block_changes(course_key, user=None, full_scan=options.get("full_scan", False))
+
+        self.stdout.write("Evaluated {course_key}".format(course_key=course_key))
+        for name, value in metrics.items():
+            if name != "course_key":
+                self.stdout.write("  {name}: {value}".format(name=name, value=value))
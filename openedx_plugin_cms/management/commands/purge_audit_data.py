@@ -0,0 +1,114 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Management command to apply the retention policy to the change log and
+course audit tables.
+"""
+# python
+import logging
+
+# django
+from django.core.management.base import BaseCommand, CommandError
+
+# open edx
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.retention import purge_course, purge_deleted_courses, purge_expired
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+        Management command to purge, and optionally archive, expired rows
+        and the rows of deleted courses.
+
+    Example usage:
+    ./manage.py cms purge_audit_data
+    ./manage.py cms purge_audit_data --change-log-days 365 --dry-run
+    ./manage.py cms purge_audit_data -c course-v1:edX+DemoX+Demo_Course
+    ./manage.py cms purge_audit_data --deleted-courses --archive-dir /tmp/plugin_cms
+    """
+
+    help = """
+    purge expired change log and course audit rows, in small chunks.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-c",
+            "--course-key",
+            metavar="COURSE_KEY",
+            dest="course_key",
+            help="purge every row of this course. nacar: course-v1:edX+DemoX+Demo_Course",
+        )
+        parser.add_argument(
+            "--deleted-courses",
+            action="store_true",
+            dest="deleted_courses",
+            help="purge every row of the courses whose deletion was logged and that no longer exist.",
+        )
+        parser.add_argument(
+            "--change-log-days",
+            type=int,
+            dest="change_log_days",
+            help="overrides PLUGIN_CMS_RETENTION_CHANGE_LOG_DAYS.",
+        )
+        parser.add_argument(
+            "--course-audit-days",
+            type=int,
+            dest="course_audit_days",
+            help="overrides PLUGIN_CMS_RETENTION_COURSE_AUDIT_DAYS.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            dest="chunk_size",
+            help="overrides PLUGIN_CMS_RETENTION_CHUNK_SIZE.",
+        )
+        parser.add_argument(
+            "--archive-dir",
+            dest="archive_dir",
+            help="archive purged rows to gzipped csv files in this directory.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            help="report the number of rows that would be purged, without deleting anything.",
+        )
+
+    def handle(self, *args, **options):
+        self.dry_run = options.get("dry_run", False)
+        kwargs = {
+            "chunk_size": options.get("chunk_size"),
+            "archive_dir": options.get("archive_dir"),
+            "dry_run": self.dry_run,
+        }
+
+        if options.get("course_key"):
+            try:
+                course_key = CourseKey.from_string(options["course_key"])
+            except InvalidKeyError as e:
+                raise CommandError("You must specify a valid course-key") from e
+            self._write_counts(str(course_key), purge_course(course_key, **kwargs))
+        elif options.get("deleted_courses"):
+            for course_key, counts in purge_deleted_courses(**kwargs).items():
+                self._write_counts(course_key, counts)
+        else:
+            counts = purge_expired(
+                change_log_days=options.get("change_log_days"),
+                course_audit_days=options.get("course_audit_days"),
+                **kwargs,
+            )
+            self._write_counts("expired", counts)
+
+    def _write_counts(self, label: str, counts: dict):
+        verb = "Would purge" if self.dry_run else "Purged"
+        self.stdout.write("{verb} {label}".format(verb=verb, label=label))
+        for table, purged in counts.items():
+            self.stdout.write("  {table}: {purged}".format(table=table, purged=purged))
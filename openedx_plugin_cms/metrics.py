@@ -0,0 +1,145 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Instrumentation of the change log auditor: per-run timings, counters
+and database query counts, reported as monitoring custom attributes.
+
+Modulestore fetches are counted by reading the modulestore through
+get_modulestore(), which returns a counting proxy while a run is being
+measured on the current thread.
+"""
+# python stuff
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+# django stuff
+from django.db import connection
+
+# open edx stuff
+from edx_django_utils.monitoring import set_custom_attribute
+
+try:
+    # for olive and later
+    from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
+except ImportError:
+    # for backward compatibility with nutmeg and earlier
+    from common.lib.xmodule.xmodule.modulestore.django import (
+        modulestore,
+    )  # lint-amnesty, pylint: disable=wrong-import-order
+
+log = logging.getLogger(__name__)
+
+CUSTOM_ATTRIBUTE_PREFIX = "plugin_cms.auditor."
+
+# modulestore methods that are counted as fetches by CountingModuleStore
+MODULESTORE_FETCH_METHODS = ("get_course", "get_item", "get_items")
+
+# the AuditorMetrics being measured on each thread.
+_measuring = threading.local()
+
+
+def get_modulestore():
+    """
+    Returns the modulestore, wrapped in a CountingModuleStore if an
+    AuditorMetrics run is being measured on the current thread.
+    """
+    metrics = getattr(_measuring, "metrics", None)
+    store = modulestore()
+    return metrics.wrap_modulestore(store) if metrics is not None else store
+
+
+class CountingModuleStore:
+    """
+    Thin proxy around a modulestore that counts the fetches made through it.
+    """
+
+    def __init__(self, store, metrics):
+        self._store = store
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        attr = getattr(self._store, name)
+        if name not in MODULESTORE_FETCH_METHODS:
+            return attr
+
+        def counted(*args, **kwargs):
+            self._metrics.incr("modulestore_fetches")
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+class AuditorMetrics:
+    """
+    Counters and wall time for one eval_course_block_changes() run.
+    """
+
+    COUNTERS = (
+        "blocks_visited",
+        "dirty_blocks",
+        "rows_inserted",
+        "rows_updated",
+        "modulestore_fetches",
+        "db_queries",
+    )
+
+    def __init__(self, course_key):
+        self.course_key = course_key
+        self.wall_time = 0.0
+        self.counters = {name: 0 for name in self.COUNTERS}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def wrap_modulestore(self, store) -> CountingModuleStore:
+        return CountingModuleStore(store, self)
+
+    @contextmanager
+    def measure(self):
+        """
+        Time the enclosed block and count every query that it sends to the
+        default database connection, and every modulestore fetch that it
+        makes through get_modulestore().
+        """
+        previous = getattr(_measuring, "metrics", None)
+        _measuring.metrics = self
+        start = time.monotonic()
+        try:
+            with connection.execute_wrapper(self._count_query):
+                yield self
+        finally:
+            self.wall_time = time.monotonic() - start
+            _measuring.metrics = previous
+
+    def _count_query(self, execute, sql, params, many, context):
+        self.counters["db_queries"] += 1
+        return execute(sql, params, many, context)
+
+    def as_dict(self) -> dict:
+        retval = {"course_key": str(self.course_key), "wall_time": round(self.wall_time, 3)}
+        retval.update(self.counters)
+        return retval
+
+    def report(self) -> dict:
+        """
+        Publish the metrics as monitoring custom attributes and log a summary.
+        """
+        metrics = self.as_dict()
+        for name, value in metrics.items():
+            set_custom_attribute(CUSTOM_ATTRIBUTE_PREFIX + name, value)
+
+        log.info(
+            "eval_course_block_changes() {course_key}: {summary}".format(
+                course_key=self.course_key,
+                summary=", ".join(
+                    "{name}={value}".format(name=name, value=value)
+                    for name, value in metrics.items()
+                    if name != "course_key"
+                ),
+            )
+        )
+        return metrics
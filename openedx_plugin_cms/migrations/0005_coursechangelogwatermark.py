@@ -0,0 +1,77 @@
+# coding=utf-8
+# Generated by Django 4.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("openedx_plugin_cms", "0004_auto_20211215_1645"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseChangeLogWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                (
+                    "course_id",
+                    opaque_keys.edx.django.models.CourseKeyField(
+                        db_index=True,
+                        help_text="Example: course-v1:edX+DemoX+Demo_Course",
+                        max_length=255,
+                        verbose_name="course_id Course Key",
+                    ),
+                ),
+                (
+                    "location",
+                    opaque_keys.edx.django.models.UsageKeyField(
+                        help_text=("Example: block-v1:edX+DemoX+Demo_Course+type@sequential+block@basic_questions"),
+                        max_length=255,
+                        verbose_name="Location Usage Key",
+                    ),
+                ),
+                (
+                    "subtree_edited_on",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text=(
+                            "Datetime when this block or any of its descendants was last published, as of the last"
+                            " audit."
+                        ),
+                        null=True,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("course_id", "location")},
+            },
+        ),
+    ]
@@ -0,0 +1,95 @@
+# coding=utf-8
+# Generated by Django 4.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("openedx_plugin_cms", "0005_coursechangelogwatermark"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseBlockSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                (
+                    "course_id",
+                    opaque_keys.edx.django.models.CourseKeyField(
+                        db_index=True,
+                        help_text="Example: course-v1:edX+DemoX+Demo_Course",
+                        max_length=255,
+                        verbose_name="course_id Course Key",
+                    ),
+                ),
+                (
+                    "location",
+                    opaque_keys.edx.django.models.UsageKeyField(
+                        help_text=("Example: block-v1:edX+DemoX+Demo_Course+type@vertical+block@vertical_1fef54c2b23b"),
+                        max_length=255,
+                        unique=True,
+                        verbose_name="Location Usage Key",
+                    ),
+                ),
+                ("display_name", models.CharField(max_length=255)),
+                (
+                    "category",
+                    models.CharField(
+                        help_text="course, chapter, vertical, sequential, xblock",
+                        max_length=255,
+                        verbose_name="Block Category",
+                    ),
+                ),
+                ("ordinal_position", models.IntegerField(blank=True, null=True)),
+                ("url", models.URLField(blank=True, null=True, verbose_name="LMS URL")),
+                (
+                    "parent_location",
+                    opaque_keys.edx.django.models.UsageKeyField(blank=True, max_length=255, null=True),
+                ),
+                ("parent_url", models.URLField(blank=True, max_length=255, null=True)),
+                (
+                    "chapter_location",
+                    opaque_keys.edx.django.models.UsageKeyField(blank=True, max_length=255, null=True),
+                ),
+                ("chapter_url", models.URLField(blank=True, max_length=255, null=True)),
+                (
+                    "sequential_location",
+                    opaque_keys.edx.django.models.UsageKeyField(blank=True, max_length=255, null=True),
+                ),
+                ("sequential_url", models.URLField(blank=True, max_length=255, null=True)),
+                (
+                    "vertical_location",
+                    opaque_keys.edx.django.models.UsageKeyField(blank=True, max_length=255, null=True),
+                ),
+                ("vertical_url", models.URLField(blank=True, max_length=255, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,37 @@
+# coding=utf-8
+# Generated by Django 4.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("openedx_plugin_cms", "0006_courseblocksnapshot"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="coursechangelog",
+            index=models.Index(fields=["course_id", "-id"], name="cms_changelog_course_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="coursechangelog",
+            index=models.Index(
+                fields=["course_id", "location", "publication_date"], name="cms_changelog_course_loc_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="coursechangelog",
+            index=models.Index(fields=["course_id", "operation"], name="cms_changelog_course_op_idx"),
+        ),
+        migrations.AlterField(
+            model_name="coursechangelog",
+            name="course_id",
+            field=opaque_keys.edx.django.models.CourseKeyField(
+                help_text="Example: course-v1:edX+DemoX+Demo_Course",
+                max_length=255,
+                verbose_name="course_id Course Key",
+            ),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# coding=utf-8
+# Generated by Django 4.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("openedx_plugin_cms", "0007_coursechangelog_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="courseaudit",
+            name="generation",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="The audit run that wrote this row. Only the generation of the CourseAuditPointer is published.",
+                verbose_name="Generation",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="courseaudit",
+            index=models.Index(fields=["course_id", "generation", "id"], name="cms_audit_course_gen_idx"),
+        ),
+        migrations.CreateModel(
+            name="CourseAuditPointer",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                (
+                    "course_id",
+                    opaque_keys.edx.django.models.CourseKeyField(
+                        help_text="Example: course-v1:edX+DemoX+Demo_Course",
+                        max_length=255,
+                        unique=True,
+                        verbose_name="course_id Course Key",
+                    ),
+                ),
+                (
+                    "generation",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="The published generation of CourseAudit rows.",
+                    ),
+                ),
+                (
+                    "last_generation",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="The most recently allocated generation.",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
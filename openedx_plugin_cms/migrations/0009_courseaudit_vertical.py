@@ -0,0 +1,39 @@
+# coding=utf-8
+# Generated by Django 4.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("openedx_plugin_cms", "0008_courseaudit_generation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="courseaudit",
+            name="vertical_location",
+            field=opaque_keys.edx.django.models.UsageKeyField(
+                blank=True,
+                help_text="For the children of a vertical only: the usage key of the vertical.",
+                max_length=255,
+                null=True,
+                verbose_name="Vertical Location",
+            ),
+        ),
+        migrations.AddField(
+            model_name="courseaudit",
+            name="vertical_edited_on",
+            field=models.DateTimeField(
+                blank=True,
+                help_text=(
+                    "For the children of a vertical only: the most recent of the subtree_edited_on of the vertical and"
+                    " the edited_on of its sequence when this row was analyzed. Incremental audits reuse the row while"
+                    " it is unchanged."
+                ),
+                null=True,
+                verbose_name="Vertical Edited On",
+            ),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# coding=utf-8
+# Generated by Django 4.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("openedx_plugin_cms", "0009_courseaudit_vertical"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseAuditCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                ("run_id", models.CharField(db_index=True, max_length=64)),
+                (
+                    "course_id",
+                    opaque_keys.edx.django.models.CourseKeyField(
+                        help_text="Example: course-v1:edX+DemoX+Demo_Course",
+                        max_length=255,
+                        verbose_name="course_id Course Key",
+                    ),
+                ),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("succeeded", "Succeeded"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("started", models.DateTimeField(blank=True, null=True)),
+                ("finished", models.DateTimeField(blank=True, null=True)),
+                (
+                    "duration",
+                    models.FloatField(blank=True, help_text="Seconds taken by the most recent attempt.", null=True),
+                ),
+                (
+                    "rows",
+                    models.IntegerField(blank=True, help_text="Number of CourseAudit rows written.", null=True),
+                ),
+                ("error", models.TextField(blank=True, null=True)),
+            ],
+            options={
+                "unique_together": {("run_id", "course_id")},
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# coding=utf-8
+# Generated by Django 4.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("openedx_plugin_cms", "0011_courseauditjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="coursechangelog",
+            name="course_display_name",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="coursechangelog",
+            name="parent_display_name",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="coursechangelog",
+            name="chapter_display_name",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="coursechangelog",
+            name="sequential_display_name",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="coursechangelog",
+            name="vertical_display_name",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# coding=utf-8
+# Generated by Django 4.2 on 2026-10-18 12:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("openedx_plugin_cms", "0012_coursechangelog_display_names"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="coursechangelog",
+            unique_together={("location", "publication_date", "operation")},
+        ),
+    ]
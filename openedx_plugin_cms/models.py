@@ -5,7 +5,9 @@ Oct-2021
 
 Course Management Studio App Models
 """
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 from model_utils.models import TimeStampedModel
 from django.contrib.auth import get_user_model
 
@@ -14,10 +16,26 @@ from opaque_keys.edx.django.models import CourseKeyField, UsageKeyField
 User = get_user_model()
 
 
+class CourseAuditQuerySet(models.QuerySet):
+    def current(self, course_key):
+        """
+        The rows of the published generation of the audit of course_key.
+        """
+        return self.filter(course_id=course_key, generation=CourseAuditPointer.get_generation(course_key))
+
+
 class CourseAudit(TimeStampedModel):
+    class Meta:
+        indexes = [
+            # report pages and csv export of the published generation
+            models.Index(fields=["course_id", "generation", "id"], name="cms_audit_course_gen_idx"),
+        ]
+
     def __str__(self):
         return f"{self.a_order}"
 
+    objects = CourseAuditQuerySet.as_manager()
+
     course_id = CourseKeyField(
         max_length=255,
         db_index=True,
@@ -188,11 +206,102 @@ class CourseAudit(TimeStampedModel):
         blank=True,
         null=True,
     )
+    vertical_location = UsageKeyField(
+        max_length=255,
+        verbose_name="Vertical Location",
+        help_text="For the children of a vertical only: the usage key of the vertical.",
+        blank=True,
+        null=True,
+    )
+    vertical_edited_on = models.DateTimeField(
+        verbose_name="Vertical Edited On",
+        help_text=(
+            "For the children of a vertical only: the most recent of the subtree_edited_on of the vertical and the"
+            " edited_on of its sequence when this row was analyzed. Incremental audits reuse the row while it is"
+            " unchanged."
+        ),
+        blank=True,
+        null=True,
+    )
+    generation = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Generation",
+        help_text="The audit run that wrote this row. Only the generation of the CourseAuditPointer is published.",
+    )
+
+
+class CourseAuditPointer(TimeStampedModel):
+    """
+    The published generation of the audit of a course.
+
+    Each audit run writes its rows under a newly allocated generation, which
+    is invisible to readers until the run finishes and publish() flips the
+    pointer to it. Older generations are then garbage-collected in the
+    background. Courses without a pointer publish generation 0, the
+    generation of the rows written before audits were versioned.
+    """
+
+    def __str__(self):
+        return f"{self.course_id}: {self.generation}"
+
+    course_id = CourseKeyField(
+        max_length=255,
+        unique=True,
+        verbose_name="course_id Course Key",
+        help_text="Example: course-v1:edX+DemoX+Demo_Course",
+    )
+    generation = models.PositiveIntegerField(
+        default=0,
+        help_text="The published generation of CourseAudit rows.",
+    )
+    last_generation = models.PositiveIntegerField(
+        default=0,
+        help_text="The most recently allocated generation.",
+    )
+
+    @classmethod
+    def get_generation(cls, course_key) -> int:
+        return cls.objects.filter(course_id=course_key).values_list("generation", flat=True).first() or 0
+
+    @classmethod
+    def allocate_generation(cls, course_key) -> int:
+        """
+        Reserve a new, unpublished generation for an audit run of course_key.
+        """
+        with transaction.atomic():
+            cls.objects.get_or_create(course_id=course_key)
+            cls.objects.filter(course_id=course_key).update(last_generation=F("last_generation") + 1)
+            return cls.objects.select_for_update().get(course_id=course_key).last_generation
+
+    @classmethod
+    def publish(cls, course_key, generation: int) -> bool:
+        """
+        Atomically make generation the published generation of course_key,
+        unless a more recent run has already been published.
+        """
+        return bool(
+            cls.objects.filter(course_id=course_key, generation__lt=generation).update(
+                generation=generation, modified=timezone.now()
+            )
+        )
 
 
 class CourseChangeLog(TimeStampedModel):
     class Meta:
-        unique_together = ("location", "publication_date")
+        # (location, publication_date) is served by the unique_together index,
+        # which includes operation so that the deletion of a block never
+        # replaces the upsert of the same version.
+        # course_id is the leading column of each composite index below, so
+        # it does not need an index of its own.
+        unique_together = ("location", "publication_date", "operation")
+        indexes = [
+            # course change log listing and csv export, newest first
+            models.Index(fields=["course_id", "-id"], name="cms_changelog_course_id_idx"),
+            # auditor batch dirty-check, satisfied from the index alone
+            models.Index(fields=["course_id", "location", "publication_date"], name="cms_changelog_course_loc_idx"),
+            # course deletion lookups
+            models.Index(fields=["course_id", "operation"], name="cms_changelog_course_op_idx"),
+        ]
 
     def __str__(self):
         return f"{self.course_id}: {self.location}"
@@ -237,7 +346,6 @@ class CourseChangeLog(TimeStampedModel):
     )
     course_id = CourseKeyField(
         max_length=255,
-        db_index=True,
         verbose_name="course_id Course Key",
         help_text="Example: course-v1:edX+DemoX+Demo_Course",
     )
@@ -280,6 +388,16 @@ class CourseChangeLog(TimeStampedModel):
         null=True,
     )
 
+    # display names of the course and of the ancestors of the block, captured
+    # when the row is written so that reports do not read them from the
+    # modulestore. NULL course_display_name marks rows that predate these
+    # columns; see the backfill_change_log_names management command.
+    course_display_name = models.CharField(max_length=255, blank=True, null=True)
+    parent_display_name = models.CharField(max_length=255, blank=True, null=True)
+    chapter_display_name = models.CharField(max_length=255, blank=True, null=True)
+    sequential_display_name = models.CharField(max_length=255, blank=True, null=True)
+    vertical_display_name = models.CharField(max_length=255, blank=True, null=True)
+
     #
     # edit_info
     # see: common.lib.xmodule.xmodule.modulestore
@@ -353,3 +471,185 @@ class CourseChangeLog(TimeStampedModel):
         blank=True,
         null=True,
     )
+
+
+class CourseChangeLogWatermark(TimeStampedModel):
+    """
+    The published subtree_edited_on of a chapter or sequential as of the last
+    time the auditor scanned it. Subtrees that have not been edited since are
+    skipped by auditor.eval_course_block_changes().
+    """
+
+    class Meta:
+        unique_together = ("course_id", "location")
+
+    def __str__(self):
+        return f"{self.location}: {self.subtree_edited_on}"
+
+    course_id = CourseKeyField(
+        max_length=255,
+        db_index=True,
+        verbose_name="course_id Course Key",
+        help_text="Example: course-v1:edX+DemoX+Demo_Course",
+    )
+    location = UsageKeyField(
+        max_length=255,
+        verbose_name="Location Usage Key",
+        help_text=("Example:" " block-v1:edX+DemoX+Demo_Course+type@sequential+block@basic_questions"),  # noqa: B950
+    )
+    subtree_edited_on = models.DateTimeField(
+        help_text="Datetime when this block or any of its descendants was last published, as of the last audit.",
+        blank=True,
+        null=True,
+    )
+
+
+class CourseBlockSnapshot(TimeStampedModel):
+    """
+    Block metadata as of the last audit of the course: display name, category,
+    parent chain and urls. Deletions are logged from this snapshot, because
+    by the time item_deleted fires the block is no longer in the modulestore.
+    """
+
+    def __str__(self):
+        return f"{self.course_id}: {self.location}"
+
+    course_id = CourseKeyField(
+        max_length=255,
+        db_index=True,
+        verbose_name="course_id Course Key",
+        help_text="Example: course-v1:edX+DemoX+Demo_Course",
+    )
+    location = UsageKeyField(
+        max_length=255,
+        unique=True,
+        verbose_name="Location Usage Key",
+        help_text=(  # noqa: B950
+            "Example:" " block-v1:edX+DemoX+Demo_Course+type@vertical+block@vertical_1fef54c2b23b"
+        ),
+    )
+    display_name = models.CharField(max_length=255)
+    category = models.CharField(
+        max_length=255,
+        verbose_name="Block Category",
+        help_text="course, chapter, vertical, sequential, xblock",
+    )
+    ordinal_position = models.IntegerField(blank=True, null=True)
+    url = models.URLField(verbose_name="LMS URL", blank=True, null=True)
+    parent_location = UsageKeyField(max_length=255, blank=True, null=True)
+    parent_url = models.URLField(max_length=255, blank=True, null=True)
+    chapter_location = UsageKeyField(max_length=255, blank=True, null=True)
+    chapter_url = models.URLField(max_length=255, blank=True, null=True)
+    sequential_location = UsageKeyField(max_length=255, blank=True, null=True)
+    sequential_url = models.URLField(max_length=255, blank=True, null=True)
+    vertical_location = UsageKeyField(max_length=255, blank=True, null=True)
+    vertical_url = models.URLField(max_length=255, blank=True, null=True)
+
+
+class CourseAuditCheckpoint(TimeStampedModel):
+    """
+    The progress of one course in a fleet-wide course audit run, see
+    fleet.py. Interrupted runs resume with the courses that have not
+    succeeded yet.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    class Meta:
+        unique_together = ("run_id", "course_id")
+
+    def __str__(self):
+        return f"{self.run_id}: {self.course_id} {self.state}"
+
+    run_id = models.CharField(max_length=64, db_index=True)
+    course_id = CourseKeyField(
+        max_length=255,
+        verbose_name="course_id Course Key",
+        help_text="Example: course-v1:edX+DemoX+Demo_Course",
+    )
+    state = models.CharField(max_length=16, choices=STATES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    started = models.DateTimeField(blank=True, null=True)
+    finished = models.DateTimeField(blank=True, null=True)
+    duration = models.FloatField(blank=True, null=True, help_text="Seconds taken by the most recent attempt.")
+    rows = models.IntegerField(blank=True, null=True, help_text="Number of CourseAudit rows written.")
+    error = models.TextField(blank=True, null=True)
+
+
+class CourseAuditJob(TimeStampedModel):
+    """
+    A queued course audit refresh, see views.course_audit.plugin_cms_course_audit_refresh().
+    The Celery task reports its progress here, and the audit page polls it.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+    ACTIVE_STATES = (QUEUED, RUNNING)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["course_id", "-id"], name="cms_audit_job_course_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.course_id}: {self.state}"
+
+    course_id = CourseKeyField(
+        max_length=255,
+        verbose_name="course_id Course Key",
+        help_text="Example: course-v1:edX+DemoX+Demo_Course",
+    )
+    state = models.CharField(max_length=16, choices=STATES, default=QUEUED)
+    rows_processed = models.IntegerField(default=0)
+    rows_total = models.IntegerField(
+        blank=True,
+        null=True,
+        help_text="Estimated from the number of rows of the previous audit of the course.",
+    )
+    started = models.DateTimeField(blank=True, null=True)
+    finished = models.DateTimeField(blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True)
+
+    @property
+    def eta_seconds(self):
+        """
+        Seconds until the job is expected to finish, extrapolated from its
+        throughput so far. None if there is not enough to go on.
+        """
+        if self.state != self.RUNNING or not self.started or not self.rows_total or not self.rows_processed:
+            return None
+        elapsed = (timezone.now() - self.started).total_seconds()
+        remaining = max(self.rows_total - self.rows_processed, 0)
+        return round(elapsed / self.rows_processed * remaining, 1)
+
+    def as_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "course_id": str(self.course_id),
+            "state": self.state,
+            "rows_processed": self.rows_processed,
+            "rows_total": self.rows_total,
+            "eta_seconds": self.eta_seconds,
+            "created": self.created.isoformat() if self.created else None,
+            "started": self.started.isoformat() if self.started else None,
+            "finished": self.finished.isoformat() if self.finished else None,
+            "error": self.error,
+        }
@@ -0,0 +1,148 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Keyset (cursor) pagination on the primary key.
+
+Django's Paginator counts the whole queryset and then reads each page with
+an OFFSET, so the cost of a page grows with its depth. A cursor instead
+records the id of the row at the edge of the current page, and the next
+page is read with WHERE id > cursor ORDER BY id LIMIT n, which an index
+on id (or on (course_id, id)) answers at the same cost for every page.
+
+A cursor is an opaque token that encodes a direction and an id:
+    next        the rows after id, in the order of the listing.
+    previous    the rows before id, read backwards and then reversed.
+A token without an id reads backwards from the end of the listing, which
+is its last page.
+"""
+# python stuff
+import base64
+import binascii
+from typing import List
+
+CURSOR_NEXT = "n"
+CURSOR_PREVIOUS = "p"
+
+
+def encode_cursor(direction: str, position: int = None) -> str:
+    value = "{direction}{position}".format(direction=direction, position="" if position is None else position)
+    return base64.urlsafe_b64encode(value.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str):
+    """
+    Returns (direction, position), or (None, None) for a missing or
+    malformed token, which reads the first page.
+    """
+    if not token:
+        return None, None
+    try:
+        value = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode("ascii")
+        direction, position = value[:1], value[1:]
+        if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+            raise ValueError(value)
+        return direction, int(position) if position else None
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None, None
+
+
+class CursorPage:
+    """
+    One page of a keyset-paginated queryset.
+    """
+
+    def __init__(self, object_list: List, has_next: bool, has_previous: bool):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    @property
+    def next_cursor(self) -> str:
+        if not self._has_next or not self.object_list:
+            return None
+        return encode_cursor(CURSOR_NEXT, self.object_list[-1].pk)
+
+    @property
+    def previous_cursor(self) -> str:
+        if not self._has_previous or not self.object_list:
+            return None
+        return encode_cursor(CURSOR_PREVIOUS, self.object_list[0].pk)
+
+    @property
+    def last_cursor(self) -> str:
+        return encode_cursor(CURSOR_PREVIOUS)
+
+
+def paginate(queryset, cursor: str = None, per_page: int = 50, descending: bool = False) -> CursorPage:
+    """
+    Read the page of queryset at cursor, ordered by id, newest first if
+    descending. Any ordering of queryset is replaced. One query is made,
+    for one row more than per_page, to find out whether there is a further page.
+    """
+    direction, position = decode_cursor(cursor)
+    backwards = direction == CURSOR_PREVIOUS
+    # reading backwards reverses the order of the listing.
+    ascending = descending == backwards
+
+    if position is not None:
+        queryset = queryset.filter(**{"id__gt" if ascending else "id__lt": position})
+    rows = list(queryset.order_by("id" if ascending else "-id")[: per_page + 1])
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if backwards:
+        rows.reverse()
+        return CursorPage(rows, has_next=position is not None, has_previous=more)
+    return CursorPage(rows, has_next=more, has_previous=position is not None)
+
+
+def get_page_url(cursor: str, path: str = "") -> str:
+    """
+    The url of the page at cursor, relative to path, or None if there is no
+    such page.
+    """
+    if cursor is None:
+        return None
+    return "{path}?cursor={cursor}".format(path=path, cursor=cursor)
+
+
+def get_page_urls(page: CursorPage) -> dict:
+    """
+    The first, previous, next and last page urls of the pagination footer
+    of the report templates.
+    """
+    return {
+        "page_first_url": "?",
+        "page_previous_url": get_page_url(page.previous_cursor),
+        "page_next_url": get_page_url(page.next_cursor),
+        "page_last_url": get_page_url(page.last_cursor),
+    }
+
+
+def page_as_dict(request, page: CursorPage, as_dict) -> dict:
+    """
+    The json representation of page, with the absolute urls of its neighbours.
+
+    as_dict: converts one row of the page to a dict.
+    """
+    next_url = get_page_url(page.next_cursor, request.path)
+    previous_url = get_page_url(page.previous_cursor, request.path)
+    return {
+        "results": [as_dict(row) for row in page],
+        "next": request.build_absolute_uri(next_url) if next_url else None,
+        "previous": request.build_absolute_uri(previous_url) if previous_url else None,
+    }
@@ -0,0 +1,261 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Retention and purging of the plugin's tables.
+
+Rows are deleted in small, primary-key-ordered chunks, each in its own short
+transaction, so that purging a large backlog never holds long-running locks
+on the table. Optionally, every chunk is archived to a gzipped csv file
+before it is deleted.
+
+Policy (see settings/common.py):
+    PLUGIN_CMS_RETENTION_CHANGE_LOG_DAYS    purge CourseChangeLog rows older than this. None to keep forever.
+    PLUGIN_CMS_RETENTION_COURSE_AUDIT_DAYS  purge CourseAudit rows older than this, except for the
+                                            published generation of each course. None to keep forever.
+    PLUGIN_CMS_RETENTION_PURGE_DELETED_COURSES  opt-in, False by default. purge all rows of courses
+                                            whose deletion was logged and that no longer exist.
+    PLUGIN_CMS_RETENTION_CHUNK_SIZE         rows per DELETE statement.
+    PLUGIN_CMS_RETENTION_CHUNK_PAUSE        seconds to pause between chunks.
+    PLUGIN_CMS_RETENTION_ARCHIVE_DIR        if set, archive rows here before deleting them.
+"""
+# python stuff
+import csv
+import gzip
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+# django stuff
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+# Celery
+from celery import shared_task
+from edx_django_utils.monitoring import set_code_owner_attribute
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+# our stuff
+from .http_cache import invalidate_all, invalidate_change_log, invalidate_course_audit
+from .models import (
+    CourseAudit,
+    CourseAuditCheckpoint,
+    CourseAuditJob,
+    CourseAuditPointer,
+    CourseBlockSnapshot,
+    CourseChangeLog,
+    CourseChangeLogWatermark,
+)
+
+log = logging.getLogger(__name__)
+
+
+class CsvArchive:
+    """
+    Appends purged rows to one gzipped csv file per model and run, in directory.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+
+    def write(self, queryset) -> None:
+        model = queryset.model
+        field_names = [field.attname for field in model._meta.concrete_fields]
+        filename = os.path.join(
+            self.directory,
+            "{table}-{timestamp}.csv.gz".format(table=model._meta.db_table, timestamp=self.timestamp),
+        )
+        is_new = not os.path.exists(filename)
+
+        os.makedirs(self.directory, exist_ok=True)
+        with gzip.open(filename, "at", newline="") as archive_file:
+            writer = csv.writer(archive_file)
+            if is_new:
+                writer.writerow(field_names)
+            writer.writerows(queryset.values_list(*field_names))
+
+
+def get_archive(archive_dir: str = None) -> CsvArchive:
+    archive_dir = archive_dir or settings.PLUGIN_CMS_RETENTION_ARCHIVE_DIR
+    return CsvArchive(archive_dir) if archive_dir else None
+
+
+def purge_queryset(queryset, chunk_size: int = None, archive: CsvArchive = None, dry_run: bool = False) -> int:
+    """
+    Delete the rows of queryset in primary-key-ordered chunks of chunk_size.
+    A dry run only counts them: nothing is archived or deleted.
+
+    Returns the number of rows purged (or that would have been, if dry_run).
+    """
+    chunk_size = chunk_size or settings.PLUGIN_CMS_RETENTION_CHUNK_SIZE
+    pause = settings.PLUGIN_CMS_RETENTION_CHUNK_PAUSE
+    model = queryset.model
+    purged = 0
+    last_pk = None
+
+    while True:
+        chunk = queryset.order_by("pk")
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+        pks = list(chunk.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            break
+        last_pk = pks[-1]
+
+        if not dry_run:
+            if archive:
+                archive.write(model.objects.filter(pk__in=pks).order_by("pk"))
+            with transaction.atomic():
+                model.objects.filter(pk__in=pks).delete()
+        purged += len(pks)
+
+        if pause and not dry_run:
+            time.sleep(pause)
+
+    log.info(
+        "purge_queryset() {verb} {purged} {table} rows.".format(
+            verb="would purge" if dry_run else "purged", purged=purged, table=model._meta.db_table
+        )
+    )
+    return purged
+
+
+def purge_expired(
+    change_log_days: int = None,
+    course_audit_days: int = None,
+    chunk_size: int = None,
+    archive_dir: str = None,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Apply the age-based retention policy. Returns {table: rows purged}.
+    """
+    if change_log_days is None:
+        change_log_days = settings.PLUGIN_CMS_RETENTION_CHANGE_LOG_DAYS
+    if course_audit_days is None:
+        course_audit_days = settings.PLUGIN_CMS_RETENTION_COURSE_AUDIT_DAYS
+
+    archive = get_archive(archive_dir)
+    now = timezone.now()
+    retval = {}
+
+    if change_log_days:
+        queryset = CourseChangeLog.objects.filter(created__lt=now - timedelta(days=change_log_days))
+        retval[CourseChangeLog._meta.db_table] = purge_queryset(queryset, chunk_size, archive, dry_run)
+
+    if course_audit_days:
+        # the published generation of a course is its report, however old it is.
+        published = CourseAuditPointer.objects.filter(
+            course_id=OuterRef("course_id"), generation=OuterRef("generation")
+        )
+        queryset = CourseAudit.objects.filter(~Exists(published), created__lt=now - timedelta(days=course_audit_days))
+        retval[CourseAudit._meta.db_table] = purge_queryset(queryset, chunk_size, archive, dry_run)
+
+    if any(retval.values()) and not dry_run:
+        # the purged rows may belong to any course.
+        invalidate_all()
+    return retval
+
+
+def purge_course(course_key: CourseKey, chunk_size: int = None, archive_dir: str = None, dry_run: bool = False) -> dict:
+    """
+    Purge every row of course_key from the plugin's tables, except for the
+    change log record of the deletion of the course itself, which is the
+    only row written by auditor.write_log_delete_course().
+
+    Returns {table: rows purged}.
+    """
+    archive = get_archive(archive_dir)
+    querysets = (
+        CourseChangeLog.objects.filter(course_id=course_key).exclude(operation=CourseChangeLog.DB_DELETE, category=""),
+        CourseAudit.objects.filter(course_id=course_key),
+        CourseBlockSnapshot.objects.filter(course_id=course_key),
+        CourseChangeLogWatermark.objects.filter(course_id=course_key),
+        CourseAuditPointer.objects.filter(course_id=course_key),
+        CourseAuditCheckpoint.objects.filter(course_id=course_key),
+        CourseAuditJob.objects.filter(course_id=course_key),
+    )
+    retval = {
+        queryset.model._meta.db_table: purge_queryset(queryset, chunk_size, archive, dry_run) for queryset in querysets
+    }
+    if not dry_run:
+        invalidate_course_audit(course_key)
+        invalidate_change_log([course_key])
+    return retval
+
+
+def purge_stale_course_audit(course_key: CourseKey, chunk_size: int = None, dry_run: bool = False) -> int:
+    """
+    Garbage-collect the CourseAudit generations of course_key that are older
+    than the published one. Newer generations belong to runs that are still
+    in progress and are left alone.
+    """
+    generation = CourseAuditPointer.get_generation(course_key)
+    queryset = CourseAudit.objects.filter(course_id=course_key, generation__lt=generation)
+    return purge_queryset(queryset, chunk_size, dry_run=dry_run)
+
+
+def get_deleted_course_keys() -> set:
+    """
+    Returns the keys of the courses whose deletion was logged by
+    auditor.write_log_delete_course() and that no longer exist.
+
+    A missing CourseOverview alone is not enough: overviews are generated
+    asynchronously and are removed and rebuilt by a course re-import.
+    """
+    course_keys = set(
+        CourseChangeLog.objects.filter(operation=CourseChangeLog.DB_DELETE, category="")
+        .values_list("course_id", flat=True)
+        .distinct()
+    )
+    existing = set(CourseOverview.objects.filter(id__in=course_keys).values_list("id", flat=True))
+    return {course_key for course_key in course_keys if course_key not in existing}
+
+
+def purge_deleted_courses(chunk_size: int = None, archive_dir: str = None, dry_run: bool = False) -> dict:
+    """
+    Apply purge_course() to every course returned by get_deleted_course_keys().
+    Returns {course_key: {table: rows purged}}.
+    """
+    return {
+        str(course_key): purge_course(course_key, chunk_size, archive_dir, dry_run)
+        for course_key in get_deleted_course_keys()
+    }
+
+
+@shared_task()
+@set_code_owner_attribute
+def purge_course_task(course_key_str: str) -> None:
+    """
+    Background purge of all rows of a deleted course.
+    """
+    purge_course(CourseKey.from_string(course_key_str))
+
+
+@shared_task()
+@set_code_owner_attribute
+def purge_stale_course_audit_task(course_key_str: str) -> None:
+    """
+    Background garbage collection of the replaced generations of a course audit.
+    """
+    purge_stale_course_audit(CourseKey.from_string(course_key_str))
+
+
+@shared_task()
+@set_code_owner_attribute
+def purge_expired_task() -> None:
+    """
+    Periodic application of the retention policy. Intended to be scheduled
+    with celery beat.
+    """
+    purge_expired()
+    if settings.PLUGIN_CMS_RETENTION_PURGE_DELETED_COURSES:
+        purge_deleted_courses()
@@ -31,6 +31,55 @@ def plugin_settings(settings):
 
     settings.NACAR_FEATURES = getattr(settings, 'NACAR_FEATURES', {})
     settings.NACAR_FEATURES['BULK_ENROLLMENT'] = True
+
+    # Course change log / course audit persistence
+    # number of rows per bulk_create() / bulk_update() statement
+    settings.PLUGIN_CMS_BULK_BATCH_SIZE = getattr(settings, "PLUGIN_CMS_BULK_BATCH_SIZE", 500)
+
+    # in-process cache of the course authors resolved while auditing.
+    settings.PLUGIN_CMS_USER_CACHE_SIZE = getattr(settings, "PLUGIN_CMS_USER_CACHE_SIZE", 256)
+    settings.PLUGIN_CMS_USER_CACHE_TIMEOUT = getattr(settings, "PLUGIN_CMS_USER_CACHE_TIMEOUT", 300)
+
+    # publish-time auditing. publishes of the same course that land within
+    # the debounce window are collapsed into a single background scan.
+    settings.PLUGIN_CMS_PUBLISH_AUDIT_DEBOUNCE_SECONDS = getattr(
+        settings, "PLUGIN_CMS_PUBLISH_AUDIT_DEBOUNCE_SECONDS", 30
+    )
+    # upper bound on how long a single scan holds the per-course lock.
+    settings.PLUGIN_CMS_PUBLISH_AUDIT_LOCK_SECONDS = getattr(settings, "PLUGIN_CMS_PUBLISH_AUDIT_LOCK_SECONDS", 60 * 15)
+    # load the published course tree once per scan, rather than reading the
+    # block structure cache and then fetching each block individually.
+    settings.PLUGIN_CMS_AUDITOR_SINGLE_LOAD = getattr(settings, "PLUGIN_CMS_AUDITOR_SINGLE_LOAD", True)
+
+    # in-process cache of the results of utils.analyze_html(), keyed on a hash of the html.
+    settings.PLUGIN_CMS_HTML_ANALYSIS_CACHE_SIZE = getattr(settings, "PLUGIN_CMS_HTML_ANALYSIS_CACHE_SIZE", 2048)
+
+    # course audit refreshes only re-analyze the verticals that changed since the last audit.
+    settings.PLUGIN_CMS_AUDIT_INCREMENTAL = getattr(settings, "PLUGIN_CMS_AUDIT_INCREMENTAL", True)
+
+    # number of courses audited at a time by the local backend of the fleet-wide course audit.
+    settings.PLUGIN_CMS_AUDIT_FLEET_CONCURRENCY = getattr(settings, "PLUGIN_CMS_AUDIT_FLEET_CONCURRENCY", 4)
+
+    # rows per database round trip when streaming csv downloads.
+    settings.PLUGIN_CMS_CSV_CHUNK_SIZE = getattr(settings, "PLUGIN_CMS_CSV_CHUNK_SIZE", 2000)
+
+    # seconds that report validators and rendered report pages are kept in the Django cache.
+    settings.PLUGIN_CMS_HTTP_CACHE_TIMEOUT = getattr(settings, "PLUGIN_CMS_HTTP_CACHE_TIMEOUT", 60 * 60)
+
+    # retention. see openedx_plugin_cms/retention.py
+    # age in days after which rows are purged. None keeps them forever.
+    settings.PLUGIN_CMS_RETENTION_CHANGE_LOG_DAYS = getattr(settings, "PLUGIN_CMS_RETENTION_CHANGE_LOG_DAYS", None)
+    settings.PLUGIN_CMS_RETENTION_COURSE_AUDIT_DAYS = getattr(settings, "PLUGIN_CMS_RETENTION_COURSE_AUDIT_DAYS", None)
+    # opt-in: purge all rows of a course once its deletion has been logged
+    # and the course no longer exists.
+    settings.PLUGIN_CMS_RETENTION_PURGE_DELETED_COURSES = getattr(
+        settings, "PLUGIN_CMS_RETENTION_PURGE_DELETED_COURSES", False
+    )
+    # rows per DELETE statement, and seconds to pause between statements.
+    settings.PLUGIN_CMS_RETENTION_CHUNK_SIZE = getattr(settings, "PLUGIN_CMS_RETENTION_CHUNK_SIZE", 1000)
+    settings.PLUGIN_CMS_RETENTION_CHUNK_PAUSE = getattr(settings, "PLUGIN_CMS_RETENTION_CHUNK_PAUSE", 0)
+    # if set, purged rows are archived to gzipped csv files in this directory.
+    settings.PLUGIN_CMS_RETENTION_ARCHIVE_DIR = getattr(settings, "PLUGIN_CMS_RETENTION_ARCHIVE_DIR", None)
     
     # settings.SOCIAL_AUTH_REDIRECT_IS_HTTPS = True
     # SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
@@ -15,6 +15,7 @@ import logging
 import pytz
 # Django stuff
 from datetime import datetime, timedelta
+from django.conf import settings
 from django.dispatch import receiver
 from celery import shared_task
 from django.core.cache import cache
@@ -39,20 +40,91 @@ from .auditor import (
     write_log_delete_course,
     write_log_delete_item,
 )
+from .retention import purge_course_task
 from .utils import get_user
 
 log = logging.getLogger(__name__)
 log.info("openedx_plugin_cms.signals loaded")
 
 
+PUBLISH_AUDIT_CACHE_NAMESPACE = "plugin.cms.publish_audit."
+
+
+def _publish_audit_cache_key(state: str, course_key) -> str:
+    return "{namespace}{state}.{course_key}".format(
+        namespace=PUBLISH_AUDIT_CACHE_NAMESPACE, state=state, course_key=course_key
+    )
+
+
+def schedule_course_publish_audit(course_key: CourseKey, user_id) -> bool:
+    """
+    Debounce publish-time auditing of course_key.
+
+    The first publish of a burst schedules _course_publisher_hander to run
+    once the debounce window has elapsed. Any further publishes that land
+    inside the window are absorbed by that same scan.
+
+    Returns True if a new scan was scheduled.
+    """
+    window = settings.PLUGIN_CMS_PUBLISH_AUDIT_DEBOUNCE_SECONDS
+    scheduled_key = _publish_audit_cache_key("scheduled", course_key)
+
+    # cache.add fails if the key already exists
+    if not cache.add(scheduled_key, True, window + settings.PLUGIN_CMS_PUBLISH_AUDIT_LOCK_SECONDS):
+        log.info("publish audit for {course_key} is already scheduled.".format(course_key=course_key))
+        return False
+
+    _course_publisher_hander.apply_async(args=(str(course_key), user_id), countdown=window)
+    log.info(
+        "scheduled publish audit for {course_key} in {window} seconds.".format(course_key=course_key, window=window)
+    )
+    return True
+
+
 @shared_task()
 @set_code_owner_attribute
-def _course_publisher_hander(course_key_str):
+def _course_publisher_hander(course_key_str, user_id=None):
     """
     asynchronous task launcher
+
+    Only one scan per course runs at a time. If a publish lands while a scan
+    is in progress then a pending-rerun flag is set, and the running scan
+    goes around once more when it finishes.
+
+    The running scan releases its lock before it looks for the flag, and a
+    publish that sets the flag checks the lock again afterwards, taking
+    over if it has been released in the meantime. Either way, some scan
+    starts after every publish.
     """
     course_key = CourseKey.from_string(course_key_str)
-    eval_course_block_changes(course_key)
+    running_key = _publish_audit_cache_key("running", course_key)
+    rerun_key = _publish_audit_cache_key("rerun", course_key)
+    lock_expire = settings.PLUGIN_CMS_PUBLISH_AUDIT_LOCK_SECONDS
+
+    # from here on, new publishes need to schedule a new scan.
+    cache.delete(_publish_audit_cache_key("scheduled", course_key))
+
+    while True:
+        if not cache.add(running_key, True, lock_expire):
+            cache.set(rerun_key, {"user_id": user_id}, lock_expire)
+            if cache.get(running_key):
+                log.info(
+                    "publish audit for {course_key} is in progress. flagged for rerun.".format(course_key=course_key)
+                )
+                return
+            continue
+
+        try:
+            cache.delete(rerun_key)
+            eval_course_block_changes(course_key, get_user(user_id) or None)
+        finally:
+            cache.delete(running_key)
+
+        rerun = cache.get(rerun_key)
+        if not rerun:
+            return
+        user_id = rerun["user_id"]
+        log.info("rerunning publish audit for {course_key}.".format(course_key=course_key))
 
 
 @receiver(SignalHandler.course_published, dispatch_uid="plugin_course_publish")
@@ -142,19 +214,22 @@ def _plugin_listen_for_course_publish(sender, course_key, **kwargs):  # pylint:
     try:
         user_id = kwargs.get("user_id")
         if user_id and str(user_id).strip() and len(str(user_id).strip()) != 0:
-            eval_course_block_changes(course_key, get_user(user_id))
+            schedule_course_publish_audit(course_key, user_id)
     except Exception as e:
-        log.exception(f" >>>E<<< Failed to apply eval_course_block_changes({course_key}, {user_id}): {e}")
+        log.exception(f" >>>E<<< Failed to schedule eval_course_block_changes({course_key}, {user_id}): {e}")
         
   
 @receiver(SignalHandler.course_deleted, dispatch_uid="plugin_course_delete")
 def _plugin_listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=unused-argument
     """
     Catches the signal that a course has been deleted
-    and logs the course_key and user
+    and logs the course_key and user, then purges the
+    rest of the course's rows in the background.
     """
     user_id = kwargs.get("user_id")
     write_log_delete_course(course_key, get_user(user_id))
+    if settings.PLUGIN_CMS_RETENTION_PURGE_DELETED_COURSES:
+        purge_course_task.delay(str(course_key))
     return
 
 
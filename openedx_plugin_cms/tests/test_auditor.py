@@ -0,0 +1,447 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for the change log auditor, against a small stubbed course.
+"""
+# python stuff
+import warnings
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+# django stuff
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.auditor import eval_course_block_changes, write_log_delete_item
+from openedx_plugin_cms.block_index import normalize_key
+from openedx_plugin_cms.models import CourseBlockSnapshot, CourseChangeLog, CourseChangeLogWatermark
+from openedx_plugin_cms.views.change_log import get_change_log
+
+User = get_user_model()
+
+COURSE_KEY = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+PUBLISHED_BRANCH = "published-branch"
+EDITED_ON = datetime(2026, 10, 1, 10, 0, tzinfo=timezone.utc)
+EDITED_LATER = EDITED_ON + timedelta(hours=1)
+
+
+class FakeBlock:
+    """
+    The attributes of an XBlock that the auditor reads.
+    """
+
+    def __init__(self, location, display_name, children=(), edited_on=EDITED_ON):
+        self.location = location
+        self.category = location.block_type
+        self.display_name = display_name
+        self.children = list(children)
+        self.has_children = bool(self.children)
+        self.parent = None
+        for child in self.children:
+            child.parent = self
+        self.edited_on = edited_on
+        self.published_on = edited_on
+        self.edited_by = 0
+        self.published_by = 0
+        self.start = None
+        self.visible_to_staff_only = False
+        self.subtree_edited_on = max([edited_on] + [child.subtree_edited_on for child in self.children])
+
+    def get_children(self):
+        return self.children
+
+    def get_parent(self):
+        return self.parent
+
+
+def walk(block):
+    yield block
+    for child in block.get_children():
+        yield from walk(child)
+
+
+def build_course(branch: str = None, edited_on: dict = None) -> FakeBlock:
+    """
+    course
+        chapter_1 / sequential_1 / vertical_1 / problem_1, html_1
+        chapter_2 / sequential_2 / vertical_2 / problem_2
+
+    branch: the branch that the locations of the blocks carry.
+    edited_on: optional {block_id: datetime} overrides of EDITED_ON.
+    """
+    course_key = COURSE_KEY.for_branch(branch) if branch else COURSE_KEY
+    edited_on = edited_on or {}
+
+    def block(block_type, block_id, display_name, children=()):
+        location = course_key.make_usage_key(block_type, block_id)
+        return FakeBlock(location, display_name, children, edited_on.get(block_id, EDITED_ON))
+
+    return block(
+        "course",
+        "course",
+        "Demo Course",
+        [
+            block(
+                "chapter",
+                "chapter_1",
+                "Module 1",
+                [
+                    block(
+                        "sequential",
+                        "sequential_1",
+                        "Section 1",
+                        [
+                            block(
+                                "vertical",
+                                "vertical_1",
+                                "Unit 1",
+                                [block("problem", "problem_1", "Problem 1"), block("html", "html_1", "Text 1")],
+                            )
+                        ],
+                    )
+                ],
+            ),
+            block(
+                "chapter",
+                "chapter_2",
+                "Module 2",
+                [
+                    block(
+                        "sequential",
+                        "sequential_2",
+                        "Section 2",
+                        [block("vertical", "vertical_2", "Unit 2", [block("problem", "problem_2", "Problem 2")])],
+                    )
+                ],
+            ),
+        ],
+    )
+
+
+class FakeModuleStore:
+    def __init__(self, course: FakeBlock):
+        self.course = course
+        self.blocks = {normalize_key(block.location): block for block in walk(course)}
+
+    @contextmanager
+    def branch_setting(self, branch_setting, course_id=None):
+        yield
+
+    def get_course(self, course_key, depth=0):
+        return self.course
+
+    def get_item(self, usage_key):
+        return self.blocks[normalize_key(usage_key)]
+
+    def has_changes(self, xblock):
+        return False
+
+    def has_published_version(self, xblock):
+        return True
+
+
+class FakeBlockStructure:
+    """
+    The collected block structure of a course, as returned by get_course_in_cache().
+    """
+
+    def __init__(self, course: FakeBlock):
+        self.root = normalize_key(course.location)
+        self.children = {}
+        self.parents = {}
+        for block in walk(course):
+            location = normalize_key(block.location)
+            self.children[location] = [normalize_key(child.location) for child in block.get_children()]
+            for child in self.children[location]:
+                self.parents[child] = [location]
+
+    def topological_traversal(self, filter_func, yield_descendants_of_unyielded=False):
+        stack = [self.root]
+        while stack:
+            location = stack.pop()
+            if not filter_func(location):
+                continue
+            yield location
+            stack.extend(reversed(self.children[location]))
+
+    def get_parents(self, location):
+        return self.parents.get(location, [])
+
+    def get_children(self, location):
+        return self.children[location]
+
+
+def get_lms_link_for_item(location):
+    return "//lms.example.com/courses/{course_key}/jump_to/{location}".format(
+        course_key=location.course_key, location=location
+    )
+
+
+@override_settings(HTTPS="on", LMS_BASE="lms.example.com")
+class AuditorTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="auditor")
+
+    @contextmanager
+    def modulestore(self, course: FakeBlock):
+        """
+        Serve course from the modulestore and the block structure cache.
+        """
+        with mock.patch("openedx_plugin_cms.metrics.modulestore", return_value=FakeModuleStore(course)), mock.patch(
+            "openedx_plugin_cms.auditor.get_course_in_cache", return_value=FakeBlockStructure(course)
+        ), mock.patch(
+            "openedx_plugin_cms.auditor.get_lms_link_for_item", side_effect=get_lms_link_for_item
+        ), mock.patch(
+            "openedx_plugin_cms.auditor.is_currently_visible_to_students", return_value=True
+        ):
+            yield
+
+    def audit(self, course: FakeBlock, single_load: bool = False, full_scan: bool = False) -> dict:
+        with self.modulestore(course):
+            return eval_course_block_changes(COURSE_KEY, self.user, full_scan=full_scan, single_load=single_load)
+
+
+class TestSingleLoad(AuditorTestCase):
+    """
+    Single-load audits write the same, branch-less rows as the default mode.
+    """
+
+    def test_rows_are_stored_without_branch(self):
+        self.audit(build_course(branch=PUBLISHED_BRANCH), single_load=True)
+
+        rows = list(get_change_log(str(COURSE_KEY)))
+        self.assertEqual(len(rows), CourseChangeLog.objects.count())
+        self.assertEqual(len(rows), 10)
+        for row in rows:
+            self.assertEqual(row.course_id, COURSE_KEY)
+            for location in (
+                row.location,
+                row.parent_location,
+                row.chapter_location,
+                row.sequential_location,
+                row.vertical_location,
+            ):
+                if location is not None:
+                    self.assertEqual(location, normalize_key(location))
+            self.assertNotIn(PUBLISHED_BRANCH, row.url)
+
+    def test_same_rows_as_default_mode(self):
+        def get_rows():
+            fields = [
+                field.name
+                for field in CourseChangeLog._meta.concrete_fields
+                if field.name not in ("id", "created", "modified")
+            ]
+            return sorted(
+                CourseChangeLog.objects.values_list(*fields), key=lambda values: str(values[fields.index("location")])
+            )
+
+        self.audit(build_course())
+        default_rows = get_rows()
+        self.assertEqual(len(default_rows), 10)
+
+        CourseChangeLog.objects.all().delete()
+        CourseChangeLogWatermark.objects.all().delete()
+        CourseBlockSnapshot.objects.all().delete()
+        self.audit(build_course(branch=PUBLISHED_BRANCH), single_load=True)
+
+        self.assertEqual(get_rows(), default_rows)
+
+
+class TestWriteLogDeleteItem(AuditorTestCase):
+    """
+    write_log_delete_item() logs the deletion of a block and its subtree from the snapshots.
+    """
+
+    def test_delete_item(self):
+        course = build_course()
+        self.audit(course)
+        vertical_location = COURSE_KEY.make_usage_key("vertical", "vertical_1")
+
+        # django warns about naive datetimes when USE_TZ is set.
+        with self.modulestore(course), warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            write_log_delete_item(vertical_location, self.user)
+
+        deletions = CourseChangeLog.objects.filter(operation=CourseChangeLog.DB_DELETE)
+        self.assertEqual(
+            sorted(str(location) for location in deletions.values_list("location", flat=True)),
+            sorted(
+                str(COURSE_KEY.make_usage_key(*key))
+                for key in (("vertical", "vertical_1"), ("problem", "problem_1"), ("html", "html_1"))
+            ),
+        )
+        for deletion in deletions:
+            self.assertEqual(deletion.vertical_location, vertical_location)
+        # the upserts of the deleted blocks are kept
+        self.assertEqual(CourseChangeLog.objects.filter(operation=CourseChangeLog.DB_UPSERT).count(), 10)
+
+
+class TestDirtySet(AuditorTestCase):
+    """
+    Only blocks whose current version has not been logged are written.
+    """
+
+    def test_unchanged_blocks_are_skipped(self):
+        metrics = self.audit(build_course())
+        self.assertEqual(metrics["dirty_blocks"], 10)
+        self.assertEqual(CourseChangeLog.objects.count(), 10)
+
+        metrics = self.audit(build_course(), full_scan=True)
+        self.assertEqual(metrics["blocks_visited"], 10)
+        self.assertEqual(metrics["dirty_blocks"], 0)
+        self.assertEqual(CourseChangeLog.objects.count(), 10)
+
+    def test_edited_block_is_logged(self):
+        self.audit(build_course())
+
+        metrics = self.audit(build_course(edited_on={"problem_1": EDITED_LATER}), full_scan=True)
+
+        self.assertEqual(metrics["dirty_blocks"], 1)
+        location = COURSE_KEY.make_usage_key("problem", "problem_1")
+        self.assertEqual(
+            list(
+                CourseChangeLog.objects.filter(location=location)
+                .order_by("publication_date")
+                .values_list("publication_date", flat=True)
+            ),
+            [EDITED_ON, EDITED_LATER],
+        )
+
+
+class TestAncestry(AuditorTestCase):
+    """
+    The parent and chapter/sequential/vertical ancestry of the logged blocks.
+    """
+
+    def test_ancestry(self):
+        self.audit(build_course())
+
+        row = CourseChangeLog.objects.get(location=COURSE_KEY.make_usage_key("html", "html_1"))
+        self.assertEqual(row.parent_location, COURSE_KEY.make_usage_key("vertical", "vertical_1"))
+        self.assertEqual(row.chapter_location, COURSE_KEY.make_usage_key("chapter", "chapter_1"))
+        self.assertEqual(row.sequential_location, COURSE_KEY.make_usage_key("sequential", "sequential_1"))
+        self.assertEqual(row.vertical_location, COURSE_KEY.make_usage_key("vertical", "vertical_1"))
+        self.assertEqual(
+            (row.course_display_name, row.chapter_display_name, row.sequential_display_name, row.vertical_display_name),
+            ("Demo Course", "Module 1", "Section 1", "Unit 1"),
+        )
+
+        # a block is its own nearest ancestor of its category, and has none below it.
+        row = CourseChangeLog.objects.get(location=COURSE_KEY.make_usage_key("sequential", "sequential_2"))
+        self.assertEqual(row.parent_location, COURSE_KEY.make_usage_key("chapter", "chapter_2"))
+        self.assertEqual(row.chapter_location, COURSE_KEY.make_usage_key("chapter", "chapter_2"))
+        self.assertEqual(row.sequential_location, COURSE_KEY.make_usage_key("sequential", "sequential_2"))
+        self.assertIsNone(row.vertical_location)
+
+        row = CourseChangeLog.objects.get(location=COURSE_KEY.make_usage_key("course", "course"))
+        self.assertIsNone(row.parent_location)
+
+
+class TestOrdinalPositions(AuditorTestCase):
+    """
+    Blocks are numbered from 1 within their parent, in order of presentation.
+    """
+
+    def test_ordinal_positions(self):
+        self.audit(build_course())
+
+        ordinals = {
+            location.block_id: ordinal_position
+            for location, ordinal_position in CourseChangeLog.objects.values_list("location", "ordinal_position")
+        }
+        self.assertEqual(
+            ordinals,
+            {
+                "course": None,
+                "chapter_1": 1,
+                "chapter_2": 2,
+                "sequential_1": 1,
+                "sequential_2": 1,
+                "vertical_1": 1,
+                "vertical_2": 1,
+                "problem_1": 1,
+                "html_1": 2,
+                "problem_2": 1,
+            },
+        )
+
+
+class TestWriterCounts(AuditorTestCase):
+    """
+    Dirty blocks are inserted, or update the row that already exists for their version.
+    """
+
+    def test_insert_and_update(self):
+        # a row for the current version of problem_1 that was stored under
+        # the published branch, and so is not in the course's logged versions.
+        published_course_key = COURSE_KEY.for_branch(PUBLISHED_BRANCH)
+        location = COURSE_KEY.make_usage_key("problem", "problem_1")
+        CourseChangeLog.objects.create(
+            course_id=published_course_key,
+            location=location,
+            publication_date=EDITED_ON,
+            display_name="Problem 1",
+            category="problem",
+        )
+
+        metrics = self.audit(build_course())
+
+        self.assertEqual((metrics["rows_inserted"], metrics["rows_updated"]), (9, 1))
+        self.assertEqual(CourseChangeLog.objects.get(location=location).course_id, COURSE_KEY)
+
+        metrics = self.audit(build_course(edited_on={"problem_2": EDITED_LATER}))
+        self.assertEqual((metrics["rows_inserted"], metrics["rows_updated"]), (1, 0))
+        self.assertEqual(CourseChangeLog.objects.count(), 11)
+
+
+class TestWatermarks(AuditorTestCase):
+    """
+    Chapters and sequentials that have not been published since the last audit are pruned.
+    """
+
+    def test_unchanged_rerun_is_pruned(self):
+        metrics = self.audit(build_course())
+        self.assertEqual(metrics["blocks_visited"], 10)
+        self.assertEqual(
+            {
+                location.block_id: subtree_edited_on
+                for location, subtree_edited_on in CourseChangeLogWatermark.objects.filter(
+                    course_id=COURSE_KEY
+                ).values_list("location", "subtree_edited_on")
+            },
+            {"chapter_1": EDITED_ON, "chapter_2": EDITED_ON, "sequential_1": EDITED_ON, "sequential_2": EDITED_ON},
+        )
+
+        # only the course block is visited; both chapters are pruned.
+        metrics = self.audit(build_course())
+        self.assertEqual(metrics["blocks_visited"], 1)
+        self.assertEqual(metrics["dirty_blocks"], 0)
+
+    def test_published_subtree_is_visited(self):
+        self.audit(build_course())
+
+        metrics = self.audit(build_course(edited_on={"problem_2": EDITED_LATER}))
+
+        # the course, then chapter_2 / sequential_2 / vertical_2 / problem_2
+        self.assertEqual(metrics["blocks_visited"], 5)
+        self.assertEqual(metrics["dirty_blocks"], 1)
+        self.assertEqual(
+            CourseChangeLogWatermark.objects.get(
+                location=COURSE_KEY.make_usage_key("chapter", "chapter_2")
+            ).subtree_edited_on,
+            EDITED_LATER,
+        )
+
+    def test_full_scan(self):
+        self.audit(build_course())
+
+        metrics = self.audit(build_course(), full_scan=True)
+        self.assertEqual(metrics["blocks_visited"], 10)
@@ -0,0 +1,52 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for the XBlock component type registry.
+"""
+# python stuff
+from unittest import TestCase, mock
+
+# this repo
+from openedx_plugin_cms import component_types
+
+
+class TestComponentTypes(TestCase):
+    """
+    XBlock classes are loaded once per entry point signature.
+    """
+
+    def setUp(self):
+        component_types.clear_component_types()
+
+    @mock.patch.object(component_types, "get_entry_point_signature")
+    @mock.patch.object(component_types.XBlock, "load_classes")
+    def test_cached_until_the_entry_points_change(self, load_classes, get_signature):
+        load_classes.return_value = [("html", object), ("drag-and-drop-v2", object), ("poll", object)]
+        get_signature.return_value = (("poll", "poll:PollBlock"),)
+
+        self.assertEqual(component_types.get_advanced_component_types([]), ("drag-and-drop-v2", "poll"))
+        self.assertEqual(component_types.get_advanced_component_types(["poll"]), ("drag-and-drop-v2",))
+        self.assertEqual(component_types.get_advanced_component_types(["poll"]), ("drag-and-drop-v2",))
+        self.assertEqual(load_classes.call_count, 1)
+
+        get_signature.return_value = (("poll", "poll:PollBlock"), ("survey", "poll:SurveyBlock"))
+        load_classes.return_value += [("survey", object)]
+        self.assertEqual(component_types.get_advanced_component_types(["poll"]), ("drag-and-drop-v2", "survey"))
+        self.assertEqual(load_classes.call_count, 2)
+
+    @mock.patch.object(component_types, "_read_installed_entry_points")
+    def test_installed_entry_points_are_read_once(self, read_installed_entry_points):
+        read_installed_entry_points.return_value = (("poll", "poll:PollBlock"),)
+
+        with mock.patch.object(component_types.XBlock, "extra_entry_points", []):
+            signature = component_types.get_entry_point_signature()
+            self.assertEqual(component_types.get_entry_point_signature(), signature)
+        with mock.patch.object(component_types.XBlock, "extra_entry_points", [("survey", object)]):
+            self.assertNotEqual(component_types.get_entry_point_signature(), signature)
+        self.assertEqual(read_installed_entry_points.call_count, 1)
+
+        component_types.clear_component_types()
+        component_types.get_entry_point_signature()
+        self.assertEqual(read_installed_entry_points.call_count, 2)
@@ -0,0 +1,103 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for the lazily loaded course audit preview.
+"""
+# python stuff
+from contextlib import closing, contextmanager
+from types import SimpleNamespace
+from unittest import mock
+
+# django stuff
+from django.test import SimpleTestCase
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.views import course_audit
+
+COURSE_KEY = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+
+
+def block(block_type: str, block_id: str, children=()):
+    children = list(children)
+    return SimpleNamespace(
+        location=COURSE_KEY.make_usage_key(block_type, block_id),
+        get_children=lambda: children,
+        advanced_modules=[],
+    )
+
+
+class FakeStore:
+    """
+    A modulestore that serves an outline of one chapter, one sequential,
+    two verticals and a problem per vertical, and records its reads.
+    """
+
+    def __init__(self):
+        self.in_branch_setting = False
+        self.reads = []
+        problems = {"v1": block("problem", "p1"), "v2": block("problem", "p2")}
+        self.verticals = {name: block("vertical", name, [problem]) for name, problem in problems.items()}
+        self.sequential = block("sequential", "s1", self.verticals.values())
+
+    @contextmanager
+    def branch_setting(self, branch, course_key):
+        self.in_branch_setting = True
+        try:
+            yield
+        finally:
+            self.in_branch_setting = False
+
+    def get_course(self, course_key, depth):
+        self.reads.append(("course", depth))
+        # loaded down to the sequentials, whose children are not loaded.
+        return block("course", "course", [block("chapter", "c1", [block("sequential", "s1")])])
+
+    def get_item(self, location, depth):
+        assert self.in_branch_setting
+        self.reads.append((location.block_id, depth))
+        if location.block_type == "sequential":
+            return self.sequential
+        return self.verticals[location.block_id]
+
+
+def row(name):
+    return lambda i, *args, **kwargs: {"i": i, "row": name}
+
+
+@mock.patch("openedx_plugin_cms.views.course_audit.CourseUrlBuilder", mock.Mock())
+@mock.patch("openedx_plugin_cms.views.course_audit.get_advanced_component_types", mock.Mock(return_value=()))
+@mock.patch("openedx_plugin_cms.views.course_audit.get_chapter_dict", row("chapter"))
+@mock.patch("openedx_plugin_cms.views.course_audit.get_sequence_dict", row("sequential"))
+@mock.patch("openedx_plugin_cms.views.course_audit.get_vertical_dict", row("vertical"))
+@mock.patch("openedx_plugin_cms.views.course_audit.get_vertical_child_dict", row("child"))
+class TestLazyAnalyzedCourse(SimpleTestCase):
+    """
+    iter_analyzed_course(lazy=True) reads the modulestore only as far as it is consumed.
+    """
+
+    def setUp(self):
+        self.store = FakeStore()
+        patcher = mock.patch("openedx_plugin_cms.views.course_audit.modulestore", return_value=self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_stop_with_the_consumer(self):
+        with closing(course_audit.iter_analyzed_course(COURSE_KEY, lazy=True)) as rows:
+            self.assertEqual(next(rows)["row"], "chapter")
+            # the branch setting is not held while the consumer runs
+            self.assertFalse(self.store.in_branch_setting)
+            self.assertEqual([next(rows)["row"] for _ in range(3)], ["sequential", "vertical", "child"])
+
+        self.assertEqual(self.store.reads, [("course", 2), ("s1", 1), ("v1", 1)])
+
+    def test_all_rows(self):
+        rows = list(course_audit.iter_analyzed_course(COURSE_KEY, lazy=True))
+        self.assertEqual(
+            [row["row"] for row in rows], ["chapter", "sequential", "vertical", "child", "vertical", "child"]
+        )
+        self.assertEqual([row["i"] for row in rows], list(range(1, 7)))
@@ -0,0 +1,114 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for the course audit refresh jobs.
+"""
+# python stuff
+import json
+from unittest import mock
+
+# django stuff
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.client import RequestFactory
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.models import CourseAuditJob
+from openedx_plugin_cms.views.course_audit import (
+    _plugin_cms_course_audit_refresh,
+    plugin_cms_course_audit_refresh,
+    plugin_cms_course_audit_refresh_status,
+)
+
+User = get_user_model()
+COURSE_ID = "course-v1:edX+DemoX+Demo_Course"
+
+
+class TestCourseAuditRefresh(TestCase):
+    """
+    A refresh is queued as a CourseAuditJob, whose progress is polled.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.course_key = CourseKey.from_string(COURSE_ID)
+        self.user = User.objects.create(username="staff")
+
+    def get(self, view, **params):
+        request = RequestFactory().get("/", params)
+        request.user = self.user
+        response = view(request, course_id=COURSE_ID)
+        return response.status_code, json.loads(response.content)
+
+    @mock.patch("openedx_plugin_cms.views.course_audit._plugin_cms_course_audit_refresh.delay")
+    def test_refresh_is_queued_once(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            status, content = self.get(plugin_cms_course_audit_refresh)
+
+        self.assertEqual(status, 202)
+        job = CourseAuditJob.objects.get()
+        self.assertEqual(content["job"]["job_id"], job.id)
+        self.assertEqual(job.state, CourseAuditJob.QUEUED)
+        self.assertEqual(job.requested_by, self.user)
+        delay.assert_called_once_with(course_id=COURSE_ID, job_id=job.id)
+
+        # the queued job blocks another refresh
+        status, content = self.get(plugin_cms_course_audit_refresh)
+        self.assertEqual(status, 409)
+        self.assertEqual(content["job"]["job_id"], job.id)
+        self.assertEqual(CourseAuditJob.objects.count(), 1)
+
+    @mock.patch("openedx_plugin_cms.views.course_audit.persist_analyzed_course")
+    def test_job_succeeds(self, persist_analyzed_course):
+        job = CourseAuditJob.objects.create(course_id=self.course_key)
+        states = []
+
+        def persist(course_key, progress):
+            progress(5)
+            states.append(CourseAuditJob.objects.get(id=job.id).state)
+            return 7
+
+        persist_analyzed_course.side_effect = persist
+        _plugin_cms_course_audit_refresh(course_id=COURSE_ID, job_id=job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(states, [CourseAuditJob.RUNNING])
+        self.assertEqual(job.state, CourseAuditJob.SUCCEEDED)
+        self.assertEqual((job.rows_processed, job.rows_total), (7, 7))
+        self.assertIsNotNone(job.started)
+        self.assertIsNotNone(job.finished)
+
+    @mock.patch(
+        "openedx_plugin_cms.views.course_audit.persist_analyzed_course", side_effect=ValueError("broken course")
+    )
+    def test_job_fails(self, persist_analyzed_course):
+        job = CourseAuditJob.objects.create(course_id=self.course_key)
+
+        with self.assertRaises(ValueError):
+            _plugin_cms_course_audit_refresh(course_id=COURSE_ID, job_id=job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, CourseAuditJob.FAILED)
+        self.assertEqual(job.error, "broken course")
+
+    def test_status(self):
+        status, _ = self.get(plugin_cms_course_audit_refresh_status)
+        self.assertEqual(status, 404)
+
+        first = CourseAuditJob.objects.create(course_id=self.course_key, state=CourseAuditJob.SUCCEEDED)
+        latest = CourseAuditJob.objects.create(course_id=self.course_key)
+
+        status, content = self.get(plugin_cms_course_audit_refresh_status)
+        self.assertEqual((status, content["job"]["job_id"]), (200, latest.id))
+
+        status, content = self.get(plugin_cms_course_audit_refresh_status, job_id=first.id)
+        self.assertEqual((status, content["job"]["state"]), (200, CourseAuditJob.SUCCEEDED))
+
+        status, _ = self.get(plugin_cms_course_audit_refresh_status, job_id="x")
+        self.assertEqual(status, 404)
@@ -0,0 +1,75 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for the streaming csv downloads.
+"""
+# python stuff
+import gzip
+from datetime import datetime, timedelta, timezone
+
+# django stuff
+from django.test import SimpleTestCase, TestCase, override_settings
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.models import CourseChangeLog
+from openedx_plugin_cms.views.csv_export import csv_streaming_response, iterate_queryset
+
+HEADER = ["id", "display_name"]
+ROWS = [[1, "Unit 1"], [2, "Unit, 2"]]
+EXPECTED = 'id,display_name\r\n1,Unit 1\r\n2,"Unit, 2"\r\n'
+
+
+class TestCsvStreamingResponse(SimpleTestCase):
+    """
+    csv_streaming_response() streams the header and the rows, optionally gzipped.
+    """
+
+    def test_plain(self):
+        response = csv_streaming_response(HEADER, iter(ROWS), "export.csv")
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(response["Content-Disposition"], "attachment; filename=export.csv")
+        self.assertEqual(b"".join(response.streaming_content).decode("utf-8"), EXPECTED)
+
+    def test_gzipped(self):
+        response = csv_streaming_response(HEADER, iter(ROWS), "export.csv", gzipped=True)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertEqual(response["Content-Disposition"], "attachment; filename=export.csv.gz")
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)).decode("utf-8"), EXPECTED)
+
+
+@override_settings(PLUGIN_CMS_CSV_CHUNK_SIZE=2)
+class TestIterateQueryset(TestCase):
+    """
+    iterate_queryset() reads id-keyset chunks, in either order.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        course_key = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+        publication_date = datetime(2026, 10, 1, tzinfo=timezone.utc)
+        cls.ids = [
+            CourseChangeLog.objects.create(
+                course_id=course_key,
+                location=course_key.make_usage_key("vertical", "vertical_{0}".format(i)),
+                publication_date=publication_date + timedelta(minutes=i),
+                display_name="Unit {0}".format(i),
+                category="vertical",
+            ).id
+            for i in range(5)
+        ]
+
+    def test_ascending(self):
+        # one query per chunk of 2 rows
+        with self.assertNumQueries(3):
+            ids = [row.id for row in iterate_queryset(CourseChangeLog.objects.all())]
+        self.assertEqual(ids, self.ids)
+
+    def test_descending(self):
+        ids = [row.id for row in iterate_queryset(CourseChangeLog.objects.order_by("id"), descending=True)]
+        self.assertEqual(ids, self.ids[::-1])
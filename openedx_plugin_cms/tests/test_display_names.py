@@ -0,0 +1,101 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for the display names captured in the change log.
+"""
+# python stuff
+from datetime import datetime, timezone
+from unittest import mock
+
+# django stuff
+from django.test import SimpleTestCase, TestCase
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.auditor import backfill_display_names, get_deleted_course_display_name
+from openedx_plugin_cms.block_index import CourseBlockIndex
+from openedx_plugin_cms.models import CourseBlockSnapshot, CourseChangeLog
+from openedx_plugin_cms.utils import get_display_name
+
+
+class TestGetDisplayName(SimpleTestCase):
+    """
+    get_display_name() reads indexed display names without touching the modulestore.
+    """
+
+    def setUp(self):
+        course_key = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+        self.chapter = course_key.make_usage_key("chapter", "chapter_1")
+        self.sequential = course_key.make_usage_key("sequential", "sequential_1")
+        self.block_index = CourseBlockIndex()
+        self.block_index.add_block(self.chapter, display_name="Module 1")
+        self.block_index.add_block(self.sequential, self.chapter)
+
+    @mock.patch("openedx_plugin_cms.utils.get_xblock_attribute")
+    def test_indexed(self, get_xblock_attribute):
+        self.assertEqual(get_display_name(self.chapter, self.block_index), "Module 1")
+        self.assertEqual(get_display_name(None, self.block_index), "")
+        get_xblock_attribute.assert_not_called()
+
+    @mock.patch("openedx_plugin_cms.utils.get_xblock_attribute", return_value="x" * 300)
+    def test_not_indexed(self, get_xblock_attribute):
+        self.assertEqual(get_display_name(self.sequential, self.block_index), "x" * 255)
+        get_xblock_attribute.assert_called_once_with(self.sequential, "display_name")
+
+
+class TestDeletedCourseDisplayName(TestCase):
+    """
+    The name of a deleted course is read from what the plugin kept of it.
+    """
+
+    def setUp(self):
+        self.course_key = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+
+    def test_from_course_block_snapshot(self):
+        CourseBlockSnapshot.objects.create(
+            course_id=self.course_key,
+            location=self.course_key.make_usage_key("course", "course"),
+            display_name="Demo Course",
+            category="course",
+        )
+        self.assertEqual(get_deleted_course_display_name(self.course_key), "Demo Course")
+
+    def test_unknown(self):
+        self.assertEqual(get_deleted_course_display_name(self.course_key), "")
+
+
+class TestBackfillDisplayNames(TestCase):
+    """
+    backfill_display_names() fills in rows that predate the display name columns.
+    """
+
+    def setUp(self):
+        self.course_key = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+        self.chapter = self.course_key.make_usage_key("chapter", "chapter_1")
+        self.row = CourseChangeLog.objects.create(
+            course_id=self.course_key,
+            location=self.course_key.make_usage_key("vertical", "vertical_1"),
+            publication_date=datetime(2026, 10, 1, tzinfo=timezone.utc),
+            display_name="Unit 1",
+            category="vertical",
+            chapter_location=self.chapter,
+        )
+
+    @mock.patch("openedx_plugin_cms.auditor.get_course_display_names")
+    def test_backfill(self, get_course_display_names):
+        get_course_display_names.return_value = ("Demo Course", {str(self.chapter): "Module 1"})
+
+        self.assertEqual(backfill_display_names(self.course_key), 1)
+        row = CourseChangeLog.objects.get(id=self.row.id)
+        self.assertEqual(row.course_display_name, "Demo Course")
+        self.assertEqual(row.chapter_display_name, "Module 1")
+        self.assertEqual(row.parent_display_name, "")
+        # modified moves, so that the change log's http validator changes
+        self.assertGreater(row.modified, self.row.modified)
+
+        # filled-in rows are not visited again
+        self.assertEqual(backfill_display_names(self.course_key), 0)
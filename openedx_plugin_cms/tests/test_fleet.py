@@ -0,0 +1,75 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for fleet-wide course audits.
+"""
+# python stuff
+from unittest import mock
+
+# django stuff
+from django.test import TestCase
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms import fleet
+from openedx_plugin_cms.models import CourseAuditCheckpoint
+
+COURSE_KEYS = [CourseKey.from_string("course-v1:edX+DemoX+Course_{0}".format(i)) for i in range(3)]
+
+
+class TestFleet(TestCase):
+    """
+    Fleet runs checkpoint every course and resume the unfinished ones.
+    """
+
+    def test_create_run(self):
+        run_id = fleet.create_run(COURSE_KEYS)
+        self.assertEqual(fleet.get_unfinished_course_keys(run_id), COURSE_KEYS)
+
+        # registering the same courses again keeps their checkpoints
+        self.assertEqual(fleet.create_run(COURSE_KEYS[:1], run_id=run_id), run_id)
+        self.assertEqual(CourseAuditCheckpoint.objects.filter(run_id=run_id).count(), 3)
+
+    @mock.patch("openedx_plugin_cms.fleet.persist_analyzed_course", return_value=10)
+    def test_succeeded(self, persist_analyzed_course):
+        run_id = fleet.create_run(COURSE_KEYS[:1])
+
+        self.assertTrue(fleet.audit_course(run_id, COURSE_KEYS[0]))
+
+        checkpoint = CourseAuditCheckpoint.objects.get(run_id=run_id)
+        self.assertEqual(checkpoint.state, CourseAuditCheckpoint.SUCCEEDED)
+        self.assertEqual(checkpoint.attempts, 1)
+        self.assertEqual(checkpoint.rows, 10)
+        self.assertIsNotNone(checkpoint.duration)
+
+    @mock.patch("openedx_plugin_cms.fleet.persist_analyzed_course", side_effect=ValueError("broken course"))
+    def test_failure_is_checkpointed(self, persist_analyzed_course):
+        run_id = fleet.create_run(COURSE_KEYS[:1])
+
+        self.assertFalse(fleet.audit_course(run_id, COURSE_KEYS[0]))
+
+        checkpoint = CourseAuditCheckpoint.objects.get(run_id=run_id)
+        self.assertEqual(checkpoint.state, CourseAuditCheckpoint.FAILED)
+        self.assertIn("broken course", checkpoint.error)
+        self.assertEqual(fleet.get_summary(run_id)["failures"], [(COURSE_KEYS[0], checkpoint.error)])
+
+    def test_resume(self):
+        run_id = fleet.create_run(COURSE_KEYS)
+        succeeded, failed, interrupted = COURSE_KEYS
+        with mock.patch("openedx_plugin_cms.fleet.persist_analyzed_course", return_value=1):
+            fleet.audit_course(run_id, succeeded)
+        with mock.patch("openedx_plugin_cms.fleet.persist_analyzed_course", side_effect=ValueError):
+            fleet.audit_course(run_id, failed)
+        CourseAuditCheckpoint.objects.filter(run_id=run_id, course_id=interrupted).update(
+            state=CourseAuditCheckpoint.RUNNING
+        )
+
+        self.assertEqual(fleet.get_unfinished_course_keys(run_id), [failed, interrupted])
+
+        with mock.patch("openedx_plugin_cms.fleet._audit_course_in_thread", return_value=True) as audit:
+            self.assertEqual(fleet.run(run_id, concurrency=1), 2)
+        self.assertEqual([call.args[1] for call in audit.call_args_list], [failed, interrupted])
@@ -0,0 +1,55 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for utils.analyze_html().
+"""
+# python stuff
+from unittest import mock
+
+# django stuff
+from django.test import SimpleTestCase, override_settings
+
+# this repo
+from openedx_plugin_cms import utils
+
+HTML = """
+<p>
+    <a href="https://www.example.com/page">example</a>
+    <a href="https://www.example.com/page">example, again</a>
+    <a href="https://studio.example.org/local">local</a>
+    <img src="/static/getting-started_x250.png">
+    <iframe src="https://www.youtube.com/embed/abc"></iframe>
+</p>
+"""
+
+
+@override_settings(SITE_NAME="studio.example.org", PLUGIN_CMS_HTML_ANALYSIS_CACHE_SIZE=8)
+class TestAnalyzeHtml(SimpleTestCase):
+    """
+    analyze_html() parses once, and only once per distinct html.
+    """
+
+    def setUp(self):
+        utils.html_analysis_cache.clear()
+
+    def test_analyze_html(self):
+        analysis = utils.analyze_html(HTML)
+        self.assertEqual(analysis.links, ("https://www.example.com/page", "https://www.youtube.com/embed/abc"))
+        self.assertEqual(analysis.assets, ("getting-started_x250.png",))
+        self.assertEqual(analysis.iframes, ("https://www.youtube.com/embed/abc",))
+
+    def test_extractors(self):
+        self.assertEqual(
+            utils.link_extractor(HTML), "https://www.example.com/page,\r\nhttps://www.youtube.com/embed/abc"
+        )
+        self.assertEqual(utils.asset_extractor(HTML), "getting-started_x250.png")
+        self.assertEqual(utils.link_extractor(""), "")
+
+    def test_memoized(self):
+        with mock.patch.object(utils, "_analyze_html", wraps=utils._analyze_html) as analyze:
+            utils.analyze_html(HTML)
+            utils.link_extractor(HTML)
+            utils.asset_extractor(HTML)
+        self.assertEqual(analyze.call_count, 1)
@@ -0,0 +1,120 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for conditional requests and rendered page caching of the report views.
+"""
+# python stuff
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+# django stuff
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.client import RequestFactory
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.http_cache import Validator, conditional_view, get_change_log_validator
+from openedx_plugin_cms.models import CourseChangeLog
+from openedx_plugin_cms.writers import CourseChangeLogWriter
+
+COURSE_ID = "course-v1:edX+DemoX+Demo_Course"
+LAST_MODIFIED = datetime(2026, 10, 1, 10, 0, tzinfo=timezone.utc)
+
+
+@override_settings(
+    PLUGIN_CMS_HTTP_CACHE_TIMEOUT=60,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class TestConditionalView(SimpleTestCase):
+    """
+    conditional_view() answers conditional GETs and caches rendered pages by validator.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.validator = Validator("1", LAST_MODIFIED)
+        self.view = mock.Mock(side_effect=lambda request, **kwargs: HttpResponse("report"))
+        self.view.__name__ = "report"
+
+    def get(self, user_id=1, **headers):
+        request = RequestFactory().get("/report/", **headers)
+        request.user = SimpleNamespace(pk=user_id)
+        decorated = conditional_view(lambda course_key: self.validator)(self.view)
+        return decorated(request, course_id=COURSE_ID)
+
+    def test_not_modified(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+        response = self.get(HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.view.call_count, 1)
+
+    def test_rendered_page_is_cached(self):
+        self.get()
+        response = self.get()
+        self.assertEqual(response.content, b"report")
+        self.assertEqual(self.view.call_count, 1)
+
+        # neither the etag nor the rendered page is shared between users
+        self.assertNotEqual(self.get(user_id=2)["ETag"], response["ETag"])
+        self.assertEqual(self.view.call_count, 2)
+
+    def test_new_validator(self):
+        etag = self.get()["ETag"]
+        self.validator = Validator("2", LAST_MODIFIED)
+
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.view.call_count, 2)
+
+
+@override_settings(
+    PLUGIN_CMS_HTTP_CACHE_TIMEOUT=60,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class TestChangeLogInvalidation(TestCase):
+    """
+    Writing change log rows invalidates the validator of their course.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.view = mock.Mock(side_effect=lambda request, **kwargs: HttpResponse("change log"))
+        self.view.__name__ = "change_log"
+
+    def get(self, **headers):
+        request = RequestFactory().get("/log/", **headers)
+        request.user = SimpleNamespace(pk=1)
+        return conditional_view(get_change_log_validator)(self.view)(request, course_id=COURSE_ID)
+
+    def test_writer_invalidates_published_branch_rows(self):
+        etag = self.get()["ETag"]
+
+        # the auditor reads single-load courses from the published branch.
+        course_key = CourseKey.from_string(COURSE_ID).for_branch("published-branch")
+        writer = CourseChangeLogWriter()
+        writer.add(
+            CourseChangeLog(
+                course_id=course_key,
+                location=course_key.make_usage_key("vertical", "vertical_1"),
+                publication_date=LAST_MODIFIED,
+                display_name="Unit 1",
+                category="vertical",
+            )
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            writer.flush()
+
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"change log")
+        self.assertEqual(self.view.call_count, 2)
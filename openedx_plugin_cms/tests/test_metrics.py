@@ -0,0 +1,47 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for the auditor instrumentation.
+"""
+# python stuff
+from unittest import mock
+
+# django stuff
+from django.test import TestCase
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.metrics import AuditorMetrics, get_modulestore
+from openedx_plugin_cms.utils import get_course_display_name
+
+COURSE_KEY = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+
+
+@mock.patch("openedx_plugin_cms.metrics.modulestore")
+class TestGetModulestore(TestCase):
+    """
+    get_modulestore() counts fetches only while a run is being measured.
+    """
+
+    def test_counted_while_measured(self, modulestore):
+        metrics = AuditorMetrics(COURSE_KEY)
+        with metrics.measure():
+            get_course_display_name(COURSE_KEY)
+            get_modulestore().get_item(COURSE_KEY.make_usage_key("vertical", "vertical_1"))
+            # not a fetch
+            get_modulestore().has_published_version(None)
+
+        self.assertEqual(metrics.counters["modulestore_fetches"], 2)
+
+    def test_not_counted_outside_a_run(self, modulestore):
+        metrics = AuditorMetrics(COURSE_KEY)
+        with metrics.measure():
+            pass
+
+        self.assertIs(get_modulestore(), modulestore.return_value)
+        get_course_display_name(COURSE_KEY)
+        self.assertEqual(metrics.counters["modulestore_fetches"], 0)
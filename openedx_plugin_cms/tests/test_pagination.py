@@ -0,0 +1,88 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for keyset (cursor) pagination.
+"""
+# python stuff
+from datetime import datetime, timedelta, timezone
+
+# django stuff
+from django.test import SimpleTestCase, TestCase
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.models import CourseChangeLog
+from openedx_plugin_cms.pagination import CURSOR_NEXT, decode_cursor, encode_cursor, paginate
+
+
+class TestCursor(SimpleTestCase):
+    """
+    Cursors are opaque tokens; malformed ones read the first page.
+    """
+
+    def test_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(CURSOR_NEXT, 42)), (CURSOR_NEXT, 42))
+
+    def test_malformed(self):
+        for token in (None, "", "!!", encode_cursor("x", 1)):
+            self.assertEqual(decode_cursor(token), (None, None))
+
+
+class TestPaginate(TestCase):
+    """
+    paginate() walks a queryset forwards and backwards in either order.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        course_key = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+        publication_date = datetime(2026, 10, 1, tzinfo=timezone.utc)
+        cls.ids = [
+            CourseChangeLog.objects.create(
+                course_id=course_key,
+                location=course_key.make_usage_key("vertical", "vertical_{0}".format(i)),
+                publication_date=publication_date + timedelta(minutes=i),
+                display_name="Unit {0}".format(i),
+                category="vertical",
+            ).id
+            for i in range(7)
+        ]
+        cls.queryset = CourseChangeLog.objects.all()
+
+    def ids_of(self, page):
+        return [row.id for row in page]
+
+    def test_forwards_and_backwards(self):
+        page = paginate(self.queryset, per_page=3)
+        self.assertEqual(self.ids_of(page), self.ids[:3])
+        self.assertFalse(page.has_previous())
+
+        page = paginate(self.queryset, page.next_cursor, per_page=3)
+        self.assertEqual(self.ids_of(page), self.ids[3:6])
+
+        page = paginate(self.queryset, page.next_cursor, per_page=3)
+        self.assertEqual(self.ids_of(page), self.ids[6:])
+        self.assertFalse(page.has_next())
+        self.assertIsNone(page.next_cursor)
+
+        page = paginate(self.queryset, page.previous_cursor, per_page=3)
+        self.assertEqual(self.ids_of(page), self.ids[3:6])
+        self.assertTrue(page.has_next())
+        self.assertTrue(page.has_previous())
+
+    def test_last_page_descending(self):
+        page = paginate(self.queryset, per_page=3, descending=True)
+        self.assertEqual(self.ids_of(page), self.ids[::-1][:3])
+
+        page = paginate(self.queryset, page.last_cursor, per_page=3, descending=True)
+        self.assertEqual(self.ids_of(page), self.ids[::-1][-3:])
+        self.assertFalse(page.has_next())
+        self.assertTrue(page.has_previous())
+
+    def test_one_query_per_page(self):
+        with self.assertNumQueries(1):
+            paginate(self.queryset, encode_cursor(CURSOR_NEXT, self.ids[3]), per_page=3)
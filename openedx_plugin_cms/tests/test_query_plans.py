@@ -0,0 +1,100 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Query plan tests for CourseChangeLog.
+
+Each test captures the EXPLAIN output of one of the CourseChangeLog access
+paths against the test database and asserts that it is served by the
+intended index, so that a model or query change that silently degrades
+one of them into a table scan fails here.
+"""
+# python stuff
+from datetime import datetime, timezone
+from unittest import skipUnless
+
+# django stuff
+from django.db import connection
+from django.test import TestCase
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.models import CourseChangeLog
+from openedx_plugin_cms.utils import get_logged_versions, logged_version_key
+
+
+@skipUnless(connection.vendor in ("sqlite", "mysql"), "query plan assertions are written for sqlite and mysql")
+class TestCourseChangeLogQueryPlans(TestCase):
+    """
+    Lock in the query plans of the CourseChangeLog access paths.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.course_key = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+        cls.location = cls.course_key.make_usage_key("vertical", "vertical_1fef54c2b23b")
+        cls.publication_date = datetime(2026, 10, 1, tzinfo=timezone.utc)
+        CourseChangeLog.objects.create(
+            course_id=cls.course_key,
+            location=cls.location,
+            publication_date=cls.publication_date,
+            display_name="Unit 1",
+            category="vertical",
+        )
+
+    def assertPlanUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, msg="unexpected query plan:\n{plan}".format(plan=plan))
+        return plan
+
+    def test_course_listing(self):
+        """
+        views.change_log.get_context() and the csv export
+        """
+        queryset = CourseChangeLog.objects.filter(course_id=self.course_key).order_by("-id")
+        plan = self.assertPlanUsesIndex(queryset, "cms_changelog_course_id_idx")
+        self.assertNotIn("TEMP B-TREE", plan.upper())
+
+    def test_course_listing_cursor(self):
+        """
+        a deep page of views.change_log.get_context(), read with a cursor
+        """
+        queryset = CourseChangeLog.objects.filter(course_id=self.course_key, id__lt=1000).order_by("-id")
+        plan = self.assertPlanUsesIndex(queryset, "cms_changelog_course_id_idx")
+        self.assertNotIn("TEMP B-TREE", plan.upper())
+
+    def test_logged_versions(self):
+        """
+        utils.get_logged_versions(), the auditor's batch dirty-check
+        """
+        queryset = CourseChangeLog.objects.filter(course_id=self.course_key).values_list("location", "publication_date")
+        self.assertPlanUsesIndex(queryset, "cms_changelog_course_loc_idx")
+        self.assertEqual(
+            get_logged_versions(self.course_key),
+            {(str(self.location), self.publication_date)},
+        )
+        # a location of the published branch matches the stored, stripped location
+        published_location = self.course_key.for_branch("published-branch").make_usage_key(
+            "vertical", "vertical_1fef54c2b23b"
+        )
+        self.assertIn(
+            logged_version_key(published_location, self.publication_date), get_logged_versions(self.course_key)
+        )
+
+    def test_course_delete_lookup(self):
+        """
+        auditor.write_log_delete_course()
+        """
+        queryset = CourseChangeLog.objects.filter(course_id=self.course_key, operation=CourseChangeLog.DB_DELETE)
+        self.assertPlanUsesIndex(queryset, "cms_changelog_course_op_idx")
+
+    def test_location_publication_date_lookup(self):
+        """
+        utils.is_dirty() without a logged_versions set, and write_log_upsert()
+        """
+        queryset = CourseChangeLog.objects.filter(location=self.location, publication_date=self.publication_date)
+        plan = queryset.explain()
+        self.assertIn("location_publication_date", plan, msg="unexpected query plan:\n{plan}".format(plan=plan))
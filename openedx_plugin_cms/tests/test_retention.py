@@ -0,0 +1,149 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for retention and purging.
+"""
+# python stuff
+import gzip
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+# django stuff
+from django.test import TestCase, override_settings
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.models import CourseAudit, CourseAuditPointer, CourseChangeLog
+from openedx_plugin_cms.retention import (
+    CsvArchive,
+    get_deleted_course_keys,
+    purge_course,
+    purge_expired,
+    purge_queryset,
+)
+
+COURSE_KEY = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+OTHER_COURSE_KEY = CourseKey.from_string("course-v1:edX+DemoX+Other_Course")
+
+
+def create_change_log(course_key, i: int, **kwargs) -> CourseChangeLog:
+    return CourseChangeLog.objects.create(
+        course_id=course_key,
+        location=course_key.make_usage_key("vertical", "vertical_{0}".format(i)),
+        publication_date=datetime(2026, 10, 1, tzinfo=timezone.utc) + timedelta(minutes=i),
+        display_name="Unit {0}".format(i),
+        category="vertical",
+        **kwargs,
+    )
+
+
+class TestPurgeQueryset(TestCase):
+    """
+    purge_queryset() deletes in chunks, optionally archiving them first.
+    """
+
+    def setUp(self):
+        for i in range(5):
+            create_change_log(COURSE_KEY, i)
+
+    @override_settings(PLUGIN_CMS_RETENTION_CHUNK_PAUSE=1)
+    @mock.patch("openedx_plugin_cms.retention.time.sleep")
+    def test_chunks(self, sleep):
+        self.assertEqual(purge_queryset(CourseChangeLog.objects.all(), chunk_size=2), 5)
+        self.assertFalse(CourseChangeLog.objects.exists())
+        # one pause after each of the chunks of 2, 2 and 1 rows
+        self.assertEqual(sleep.call_count, 3)
+
+    def test_archive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            archive = CsvArchive(directory)
+            purge_queryset(CourseChangeLog.objects.all(), chunk_size=2, archive=archive)
+
+            (filename,) = os.listdir(directory)
+            with gzip.open(os.path.join(directory, filename), "rt") as archive_file:
+                # a header plus one line per row
+                self.assertEqual(len(archive_file.read().splitlines()), 6)
+
+    @override_settings(PLUGIN_CMS_RETENTION_CHUNK_PAUSE=1)
+    @mock.patch("openedx_plugin_cms.retention.time.sleep")
+    def test_dry_run(self, sleep):
+        with tempfile.TemporaryDirectory() as directory:
+            archive = CsvArchive(os.path.join(directory, "archive"))
+            purged = purge_queryset(CourseChangeLog.objects.all(), chunk_size=2, archive=archive, dry_run=True)
+
+            self.assertEqual(purged, 5)
+            self.assertFalse(os.path.exists(archive.directory))
+        self.assertEqual(CourseChangeLog.objects.count(), 5)
+        sleep.assert_not_called()
+
+
+class TestPurgeCourse(TestCase):
+    """
+    purge_course() removes every row of one course, except its deletion record.
+    """
+
+    def test_purge_course(self):
+        create_change_log(COURSE_KEY, 1)
+        deletion = CourseChangeLog.objects.create(
+            course_id=COURSE_KEY,
+            location=COURSE_KEY.make_usage_key("course", "course"),
+            publication_date=datetime(2026, 10, 2, tzinfo=timezone.utc),
+            operation=CourseChangeLog.DB_DELETE,
+            display_name="Demo Course",
+            category="",
+        )
+        other = create_change_log(OTHER_COURSE_KEY, 1)
+        CourseAuditPointer.allocate_generation(COURSE_KEY)
+        CourseAudit.objects.create(course_id=COURSE_KEY, generation=1, a_order=1)
+
+        counts = purge_course(COURSE_KEY)
+
+        self.assertEqual(counts[CourseChangeLog._meta.db_table], 1)
+        self.assertEqual(counts[CourseAudit._meta.db_table], 1)
+        self.assertEqual(list(CourseChangeLog.objects.order_by("id")), [deletion, other])
+        self.assertFalse(CourseAuditPointer.objects.filter(course_id=COURSE_KEY).exists())
+
+
+class TestPurgeExpired(TestCase):
+    """
+    purge_expired() applies the age-based policy.
+    """
+
+    def test_published_generation_is_kept(self):
+        for generation in (1, 2):
+            CourseAuditPointer.allocate_generation(COURSE_KEY)
+            CourseAudit.objects.create(course_id=COURSE_KEY, generation=generation, a_order=1)
+        CourseAuditPointer.publish(COURSE_KEY, 2)
+        CourseAudit.objects.update(created=datetime.now(timezone.utc) - timedelta(days=30))
+
+        counts = purge_expired(change_log_days=0, course_audit_days=7)
+
+        self.assertEqual(counts, {CourseAudit._meta.db_table: 1})
+        self.assertEqual(list(CourseAudit.objects.values_list("generation", flat=True)), [2])
+
+
+class TestGetDeletedCourseKeys(TestCase):
+    """
+    Only courses whose deletion was logged are treated as deleted.
+    """
+
+    def test_missing_course_overview_alone(self):
+        # neither course has a CourseOverview, e.g. one that is not generated yet.
+        create_change_log(COURSE_KEY, 1)
+        create_change_log(OTHER_COURSE_KEY, 1)
+        CourseChangeLog.objects.create(
+            course_id=OTHER_COURSE_KEY,
+            location=OTHER_COURSE_KEY.make_usage_key("course", "course"),
+            publication_date=datetime(2026, 10, 2, tzinfo=timezone.utc),
+            operation=CourseChangeLog.DB_DELETE,
+            display_name="Other Course",
+            category="",
+        )
+
+        self.assertEqual(get_deleted_course_keys(), {OTHER_COURSE_KEY})
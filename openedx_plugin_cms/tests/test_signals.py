@@ -0,0 +1,85 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for the debounced publish-time course audit.
+"""
+# python stuff
+from unittest import mock
+
+# django stuff
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms import signals
+
+COURSE_KEY = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+
+
+@override_settings(
+    PLUGIN_CMS_PUBLISH_AUDIT_DEBOUNCE_SECONDS=30,
+    PLUGIN_CMS_PUBLISH_AUDIT_LOCK_SECONDS=60,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+@mock.patch.object(signals, "get_user", mock.Mock(return_value=None))
+@mock.patch.object(signals, "eval_course_block_changes")
+class TestPublishAudit(SimpleTestCase):
+    """
+    Publishes are debounced, coalesced while a scan runs, and never lost.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def run_scan(self, user_id=1):
+        signals._course_publisher_hander(str(COURSE_KEY), user_id)
+
+    @mock.patch.object(signals._course_publisher_hander, "apply_async")
+    def test_debounce(self, apply_async, eval_course_block_changes):
+        self.assertTrue(signals.schedule_course_publish_audit(COURSE_KEY, 1))
+        self.assertFalse(signals.schedule_course_publish_audit(COURSE_KEY, 2))
+        apply_async.assert_called_once_with(args=(str(COURSE_KEY), 1), countdown=30)
+
+        # once the scan starts, the next publish schedules a new one.
+        self.run_scan()
+        self.assertTrue(signals.schedule_course_publish_audit(COURSE_KEY, 2))
+        self.assertEqual(apply_async.call_count, 2)
+
+    def test_publishes_during_a_scan_are_coalesced(self, eval_course_block_changes):
+        def publish_during_scan(course_key, user):
+            if eval_course_block_changes.call_count == 1:
+                # two more publishes land while the first scan is in progress.
+                self.run_scan(user_id=2)
+                self.run_scan(user_id=3)
+
+        eval_course_block_changes.side_effect = publish_during_scan
+        self.run_scan()
+
+        # the first scan plus a single rerun for both of the publishes.
+        self.assertEqual(eval_course_block_changes.call_count, 2)
+        self.assertIsNone(cache.get(signals._publish_audit_cache_key("running", COURSE_KEY)))
+        self.assertIsNone(cache.get(signals._publish_audit_cache_key("rerun", COURSE_KEY)))
+
+    def test_lock_released_while_flagging_rerun(self, eval_course_block_changes):
+        # the scan in progress releases its lock, and misses the flag, right
+        # after this publish fails to take the lock.
+        running_key = signals._publish_audit_cache_key("running", COURSE_KEY)
+        add = cache.add
+        lock_attempts = []
+
+        def add_once_held(key, *args, **kwargs):
+            if key == running_key and not lock_attempts:
+                lock_attempts.append(key)
+                return False
+            return add(key, *args, **kwargs)
+
+        with mock.patch.object(signals.cache, "add", side_effect=add_once_held):
+            self.run_scan()
+
+        eval_course_block_changes.assert_called_once()
+        self.assertIsNone(cache.get(signals._publish_audit_cache_key("rerun", COURSE_KEY)))
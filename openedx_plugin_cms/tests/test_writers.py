@@ -0,0 +1,151 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Tests for the bulk writers.
+"""
+# python stuff
+from datetime import datetime, timezone
+
+# django stuff
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+# open edx stuff
+from opaque_keys.edx.keys import CourseKey
+
+# this repo
+from openedx_plugin_cms.models import CourseAudit, CourseAuditPointer, CourseChangeLog
+from openedx_plugin_cms.writers import CourseAuditWriter, CourseChangeLogWriter
+
+User = get_user_model()
+
+
+def get_row(i: int, changed_by="") -> dict:
+    return {
+        "a_order": str(i),
+        "b_course": "Demo Course",
+        "c_module": "Module 1",
+        "d_section": "Section 1",
+        "e_unit": "Unit 1",
+        "e2_block_type": "problem",
+        "f_graded": True,
+        "g_section_weight": "0.25",
+        "h_number_graded_sections": "4",
+        "i_component_type": "multiplechoiceresponse",
+        "j_non_standard_element": "",
+        "k_problem_weight": "1",
+        "m_iframe_external_url": "",
+        "m_external_links": "",
+        "n_asset_type": "",
+        "o_unit_url": "",
+        "p_studio_url": "",
+        "q_xml_filename": "problem/1.xml",
+        "r_publication_date": "01-Oct-2026, 10:00",
+        "s_changed_by": changed_by,
+        "t_change_made": "01-Oct-2026, 09:00",
+    }
+
+
+class TestCourseChangeLogWriter(TestCase):
+    """
+    CourseChangeLogWriter inserts new rows and updates existing ones, per operation.
+    """
+
+    def setUp(self):
+        self.course_key = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+        self.location = self.course_key.make_usage_key("vertical", "vertical_1")
+        self.publication_date = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+    def get_change_log(self, operation=CourseChangeLog.DB_UPSERT, display_name="Unit 1") -> CourseChangeLog:
+        return CourseChangeLog(
+            course_id=self.course_key,
+            location=self.location,
+            publication_date=self.publication_date,
+            operation=operation,
+            display_name=display_name,
+            category="vertical",
+        )
+
+    def test_update(self):
+        writer = CourseChangeLogWriter()
+        writer.add(self.get_change_log())
+        self.assertEqual(writer.flush(), (1, 0))
+
+        writer.add(self.get_change_log(display_name="Unit 1, renamed"))
+        self.assertEqual(writer.flush(), (0, 1))
+        self.assertEqual(CourseChangeLog.objects.get().display_name, "Unit 1, renamed")
+
+    def test_delete_does_not_replace_upsert(self):
+        writer = CourseChangeLogWriter()
+        writer.add(self.get_change_log())
+        writer.add(self.get_change_log(CourseChangeLog.DB_DELETE))
+        self.assertEqual(writer.flush(), (2, 0))
+
+        # a later run, for the same version
+        writer.add(self.get_change_log(CourseChangeLog.DB_DELETE))
+        self.assertEqual(writer.flush(), (0, 1))
+        self.assertEqual(
+            sorted(CourseChangeLog.objects.values_list("operation", flat=True)),
+            sorted([CourseChangeLog.DB_UPSERT, CourseChangeLog.DB_DELETE]),
+        )
+
+
+class TestCourseAuditWriter(TestCase):
+    """
+    CourseAuditWriter replaces the rows of a course in bulk.
+    """
+
+    def setUp(self):
+        self.course_key = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+        self.author = User.objects.create(username="author")
+
+    def test_write(self):
+        rows = [get_row(i, changed_by=self.author if i % 2 else "") for i in range(1, 8)]
+
+        with CaptureQueriesContext(connection) as queries:
+            written = CourseAuditWriter(self.course_key, batch_size=5).write(rows)
+
+        self.assertEqual(written, 7)
+        # one INSERT per batch
+        statements = [query["sql"].split()[0].upper() for query in queries.captured_queries]
+        self.assertEqual(statements.count("INSERT"), 2)
+        records = CourseAudit.objects.current(self.course_key).order_by("a_order")
+        self.assertEqual(list(records.values_list("a_order", flat=True)), list(range(1, 8)))
+        self.assertEqual(records[0].s_changed_by, self.author)
+        self.assertIsNone(records[1].s_changed_by)
+        self.assertEqual(records[0].g_section_weight, 0.25)
+
+    def test_write_publishes_a_new_generation(self):
+        CourseAuditWriter(self.course_key).write([get_row(1), get_row(2)])
+        self.assertEqual(CourseAuditPointer.get_generation(self.course_key), 1)
+
+        writer = CourseAuditWriter(self.course_key)
+        writer.write([get_row(1)])
+        self.assertEqual(writer.generation, 2)
+        self.assertEqual(CourseAuditPointer.get_generation(self.course_key), 2)
+        self.assertEqual(CourseAudit.objects.current(self.course_key).count(), 1)
+
+    def test_unpublished_generation_is_invisible(self):
+        CourseAuditWriter(self.course_key).write([get_row(1), get_row(2)])
+        generation = CourseAuditPointer.allocate_generation(self.course_key)
+        CourseAudit.objects.create(course_id=self.course_key, generation=generation, a_order=1)
+
+        self.assertEqual(CourseAudit.objects.current(self.course_key).count(), 2)
+        self.assertFalse(CourseAuditPointer.publish(self.course_key, 1))
+
+    def test_write_copies_reused_records(self):
+        CourseAuditWriter(self.course_key).write([get_row(1), get_row(2, changed_by=self.author)])
+        reused = CourseAudit.objects.current(self.course_key).get(a_order=2)
+        reused.a_order = 1
+
+        CourseAuditWriter(self.course_key).write([reused, get_row(2)])
+
+        records = CourseAudit.objects.current(self.course_key).order_by("a_order")
+        self.assertEqual(list(records.values_list("a_order", "generation")), [(1, 2), (2, 2)])
+        self.assertEqual(records[0].s_changed_by, self.author)
+        # the record of the previous generation is left for the garbage collector
+        self.assertEqual(CourseAudit.objects.filter(course_id=self.course_key, generation=1).count(), 2)
@@ -8,11 +8,13 @@ CMS App urls
 from django.conf import settings
 from django.urls import path, re_path
 
-from .views.change_log import plugin_cms_change_log, plugin_cms_change_csv
+from .views.change_log import plugin_cms_change_log, plugin_cms_change_log_json, plugin_cms_change_csv
 from .views.course_audit import (
     plugin_cms_course_audit,
     plugin_cms_course_audit_csv,
+    plugin_cms_course_audit_json,
     plugin_cms_course_audit_refresh,
+    plugin_cms_course_audit_refresh_status,
 )
 from .views.course_audit_html import (
     plugin_cms_course_audit_html,
@@ -40,6 +42,13 @@ if waffle_switches[AUDIT_REPORT]:
             plugin_cms_change_log,
             name="plugin_cms_change_log",
         ),
+        # Log paginated json
+        re_path(r"^log/json/$", plugin_cms_change_log_json, name="plugin_cms_change_log_json"),
+        re_path(
+            rf"^courses/{settings.COURSE_ID_PATTERN}/log/json/$",
+            plugin_cms_change_log_json,
+            name="plugin_cms_change_log_json",
+        ),
         # Log paginated CSV download file
         re_path(r"^log/csv/$", plugin_cms_change_csv, name="plugin_cms_change_csv"),
         re_path(
@@ -58,6 +67,11 @@ if waffle_switches[AUDIT_REPORT]:
             plugin_cms_course_audit_refresh,
             name="plugin_cms_course_audit_refresh",
         ),
+        re_path(
+            rf"^courses/{settings.COURSE_ID_PATTERN}/audit/refresh/status/$",
+            plugin_cms_course_audit_refresh_status,
+            name="plugin_cms_course_audit_refresh_status",
+        ),
         # Course Audit paginated UI
         re_path(
             rf"^courses/{settings.COURSE_ID_PATTERN}/audit/$",
@@ -69,6 +83,12 @@ if waffle_switches[AUDIT_REPORT]:
             plugin_cms_course_audit,
             name="plugin_cms_course_audit",
         ),
+        # Course Audit paginated json
+        re_path(
+            rf"^courses/{settings.COURSE_ID_PATTERN}/audit/json/$",
+            plugin_cms_course_audit_json,
+            name="plugin_cms_course_audit_json",
+        ),
         # Course Audit CSV download file
         re_path(
             rf"^courses/{settings.COURSE_ID_PATTERN}/audit/csv/$",
@@ -9,6 +9,10 @@ App Models
 # python stuff
 import datetime as dt
 import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from hashlib import sha1
 from re import X
 from lxml.html import fromstring
 from os.path import basename
@@ -21,7 +25,7 @@ from django.contrib.auth import get_user_model
 # open edx common libs
 from xblock.fields import Boolean, String
 from xblock.core import XBlock
-from opaque_keys.edx.keys import UsageKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 
 
 # open edx stuff
@@ -45,31 +49,103 @@ except ImportError:
     )  # lint-amnesty, pylint: disable=wrong-import-order
 
 # our stuff
+from .block_index import normalize_key
+from .metrics import get_modulestore
 from .models import CourseChangeLog
 
 User = get_user_model()
 log = logging.getLogger(__name__)
 
 
-def link_extractor(html: str):
+# the result of analyze_html(). links are the unique external urls, in
+# order of appearance; assets the filenames of the images; iframes the
+# urls of the embedded iframes.
+HtmlAnalysis = namedtuple("HtmlAnalysis", ["links", "assets", "iframes"])
+EMPTY_HTML_ANALYSIS = HtmlAnalysis((), (), ())
+
+
+class HtmlAnalysisCache:
+    """
+    Process-wide, thread-safe LRU of {sha1 of html: HtmlAnalysis}, holding
+    at most PLUGIN_CMS_HTML_ANALYSIS_CACHE_SIZE entries. Keying on a digest
+    rather than on the html itself keeps the memory of large documents
+    out of the cache.
+    """
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            analysis = self._data.get(key)
+            if analysis is not None:
+                self._data.move_to_end(key)
+            return analysis
+
+    def set(self, key, analysis: HtmlAnalysis) -> None:
+        with self._lock:
+            self._data[key] = analysis
+            self._data.move_to_end(key)
+            while len(self._data) > settings.PLUGIN_CMS_HTML_ANALYSIS_CACHE_SIZE:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+html_analysis_cache = HtmlAnalysisCache()
+
+
+def analyze_html(html: str) -> HtmlAnalysis:
     """
     receives ´html´ from xblock.data
-    finds and returns a list of all external urls.
+    parses it once and returns its external links, Studio CMS assets and
+    iframes. Results are memoized on a hash of the html, so re-auditing
+    unchanged content costs a dictionary lookup.
     """
+    if not html:
+        return EMPTY_HTML_ANALYSIS
+
+    key = sha1(html.encode("utf-8")).hexdigest()
+    analysis = html_analysis_cache.get(key)
+    if analysis is None:
+        analysis = _analyze_html(html)
+        html_analysis_cache.set(key, analysis)
+    return analysis
+
+
+def _analyze_html(html: str) -> HtmlAnalysis:
     try:
         doc = fromstring(html)
     except Exception:  # noqa: B902
-        return ""
+        return EMPTY_HTML_ANALYSIS
 
-    retval = []
-    for _, _, link, _ in doc.iterlinks():
+    site_name = settings.SITE_NAME.lower()
+    links = {}
+    assets = []
+    iframes = []
+    for element, attribute, link, _ in doc.iterlinks():
         url = str(link).lower()
-        parsed_url = urlparse(url)
-        domain = str(parsed_url.netloc).lower()
-        if domain != "" and domain != settings.SITE_NAME.lower() and url not in retval:
-            retval.append(url)
+        domain = str(urlparse(url).netloc).lower()
+        if domain != "" and domain != site_name:
+            links[url] = None
+
+        if attribute == "src" and element.tag == "img":
+            assets.append(basename(link))
+        elif attribute == "src" and element.tag == "iframe":
+            iframes.append(link)
 
-    return ",\r\n".join(retval)
+    return HtmlAnalysis(tuple(links), tuple(assets), tuple(iframes))
+
+
+def link_extractor(html: str):
+    """
+    receives ´html´ from xblock.data
+    finds and returns a list of all external urls.
+    """
+    return ",\r\n".join(analyze_html(html).links)
 
 
 def asset_extractor(html: str):
@@ -77,17 +153,7 @@ def asset_extractor(html: str):
     receives ´html´ from xblock.data
     finds and returns a list of Studio CMS assets.
     """
-    try:
-        doc = fromstring(html)
-    except Exception:  # noqa: B902
-        return ""
-
-    retval = []
-    for img in doc.xpath("//img"):
-        filename_and_path = img.attrib["src"]
-        filename = basename(filename_and_path)
-        retval.append(filename)
-    return ",\r\n".join(retval)
+    return ",\r\n".join(analyze_html(html).assets)
 
 
 def get_grade_weight(xblock: XBlock, course: CourseBlock):
@@ -109,18 +175,24 @@ def get_grade_weight(xblock: XBlock, course: CourseBlock):
             return grade_type_dict["weight"], grade_type_dict["min_count"]
 
 
-def get_ordinal_position(block_key: UsageKey, parent_key: UsageKey) -> int:
+def get_ordinal_position(block_key: UsageKey, parent_key: UsageKey, block_index=None) -> int:
     """
     returns the ordinal position of the  chile block_key within the parent parent_key.
     returns -1 if not found within the parent_key xblock.
+
+    block_index: optional block_index.CourseBlockIndex. If the children of
+    parent_key are indexed then this is a dictionary lookup.
     """
+    if block_index is not None and block_index.has_children(parent_key):
+        return block_index.get_ordinal_position(block_key, parent_key)
+
     log.debug(
         "get_ordinal_position() block_key: {block_key}, parent_key: {parent_key}".format(
             block_key=block_key, parent_key=parent_key
         )
     )
     i = 0
-    xblock_parent = modulestore().get_item(parent_key)
+    xblock_parent = get_modulestore().get_item(parent_key)
     if xblock_parent:
         children = xblock_parent.get_children()
         for child_block in children:
@@ -130,7 +202,7 @@ def get_ordinal_position(block_key: UsageKey, parent_key: UsageKey) -> int:
     return -1
 
 
-def get_parent_block(category: String, block_key: UsageKey) -> UsageKey:
+def get_parent_block(category: String, block_key: UsageKey, block_index=None) -> UsageKey:
     """
     Returns the XBlock for one of the following: course, chapter, sequential, vertical.
     These equate to:
@@ -139,13 +211,21 @@ def get_parent_block(category: String, block_key: UsageKey) -> UsageKey:
         sequential is a "Subsection"
         vertical is a "Unit"
 
+    block_index: optional block_index.CourseBlockIndex. If block_key is indexed
+    then the ancestor is resolved from the index and only the ancestor itself
+    is fetched from the modulestore.
+
     Returns None if nothing is found.
     """
     category = category or ""
     category = category.lower()
 
+    if block_index is not None and block_key in block_index:
+        location = block_index.get_ancestor(category, block_key)
+        return get_modulestore().get_item(location) if location else None
+
     while True:
-        xblock = modulestore().get_item(block_key)
+        xblock = get_modulestore().get_item(block_key)
 
         if xblock.category.lower() == category:
             return xblock
@@ -157,7 +237,7 @@ def get_parent_block(category: String, block_key: UsageKey) -> UsageKey:
         block_key = parent.location
 
 
-def get_parent_location(category: String, block_key: UsageKey) -> UsageKey:
+def get_parent_location(category: String, block_key: UsageKey, block_index=None) -> UsageKey:
     """
     Returns the UsageKey (location) for one of the following: course, chapter, sequential, vertical.
     These equate to:
@@ -166,8 +246,14 @@ def get_parent_location(category: String, block_key: UsageKey) -> UsageKey:
         sequential is a "Subsection"
         vertical is a "Unit"
 
+    block_index: optional block_index.CourseBlockIndex. If block_key is indexed
+    then no modulestore reads are made.
+
     Returns None if nothing is found.
     """
+    if block_index is not None and block_key in block_index:
+        return block_index.get_ancestor(category, block_key)
+
     parent = get_parent_block(category, block_key)
     return parent.location if parent else None
 
@@ -202,16 +288,114 @@ def get_user(user_id):
         return ""
 
 
+class UserCache:
+    """
+    Small, process-wide, thread-safe LRU of {user_id: User} whose entries
+    expire after PLUGIN_CMS_USER_CACHE_TIMEOUT seconds. Users that do not
+    exist are cached as None so that they are not looked up repeatedly.
+    """
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """
+        Returns (hit, user).
+        """
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                return False, None
+            user, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[user_id]
+                return False, None
+            self._data.move_to_end(user_id)
+            return True, user
+
+    def set(self, user_id, user) -> None:
+        with self._lock:
+            self._data[user_id] = (user, time.monotonic() + settings.PLUGIN_CMS_USER_CACHE_TIMEOUT)
+            self._data.move_to_end(user_id)
+            while len(self._data) > settings.PLUGIN_CMS_USER_CACHE_SIZE:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+user_cache = UserCache()
+
+
+def prefetch_users(user_ids) -> None:
+    """
+    Resolve every user id in user_ids that is not already cached, with a
+    single in_bulk() query.
+    """
+    missing = {user_id for user_id in user_ids if user_id and user_id > 0 and not user_cache.get(user_id)[0]}
+    if not missing:
+        return
+
+    users = User.objects.in_bulk(missing)
+    for user_id in missing:
+        user_cache.set(user_id, users.get(user_id))
+
+
+def get_cached_user(user_id):
+    """
+    Cached equivalent of get_user() for the auditing paths, where the same
+    handful of course authors are resolved over and over again.
+
+    Returns None if the user does not exist.
+    """
+    hit, user = user_cache.get(user_id)
+    if not hit:
+        prefetch_users([user_id])
+        hit, user = user_cache.get(user_id)
+    if user is None:
+        log.info(f" >>>E>>> User with user id: '{user_id}' not found")
+    return user
+
+
 def get_xblock_attribute(usage_key: UsageKey, attr: String):
     if usage_key:
         try:
-            xblock = modulestore().get_item(usage_key)
+            xblock = get_modulestore().get_item(usage_key)
             return xblock.__getattribute__(attr)
         except Exception:  # noqa: B902
             return None
     return None
 
 
+def get_display_name(usage_key: UsageKey, block_index=None) -> str:
+    """
+    Returns the display name of the block at usage_key, truncated to fit a
+    CharField(max_length=255), or "" if there is no such block.
+
+    block_index: optional block_index.CourseBlockIndex. If the display name of
+    usage_key is indexed then no modulestore reads are made.
+    """
+    if not usage_key:
+        return ""
+    display_name = block_index.get_display_name(usage_key) if block_index is not None else None
+    if display_name is None:
+        display_name = get_xblock_attribute(usage_key, "display_name")
+    return str(display_name or "")[:255]
+
+
+def get_course_display_name(course_key: CourseKey) -> str:
+    """
+    Returns the display name of a course, or "" if it no longer exists.
+    """
+    try:
+        course = get_modulestore().get_course(course_key, depth=0)
+    except Exception:  # noqa: B902
+        course = None
+    return str(course.display_name or "")[:255] if course else ""
+
+
 def get_xml_filename(xblock: XBlock) -> str:
     if hasattr(xblock, "xml_attributes"):
         if "filename" in xblock.xml_attributes:
@@ -225,23 +409,57 @@ def get_xml_filename(xblock: XBlock) -> str:
     return ""
 
 
-def get_url(xblock: XBlock, app="cms") -> str:
+class CourseUrlBuilder:
+    """
+    Builds the LMS/CMS urls of blocks from precomputed prefixes, so that a
+    traversal that visits every block of a course reads the settings once,
+    calls get_lms_link_for_item() once per course and, when it passes in
+    the parent that it already has in hand, never reads the modulestore.
+    """
+
+    def __init__(self):
+        self.cms_host_url = get_host_url("cms")
+        self._lms_prefixes = {}
+
+    def cms_url(self, xblock: XBlock, parent: XBlock = None) -> str:
+        if parent is None:
+            parent = get_modulestore().get_item(xblock.parent)
+        if parent.category == "vertical":
+            # https://cms.dev.engineplatform.co.uk/container/block-v1:edX+DemoX+Demo_Course+type@vertical+block@867dddb6f55d410caaa9c1eb9c6743ec
+            return self.cms_host_url + "/container/" + str(parent.location)
+        # https://cms.dev.engineplatform.co.uk/course/course-v1:edX+DemoX+Demo_Course
+        return self.cms_host_url + "/course/" + str(xblock.location.course_key)
+
+    def lms_url(self, xblock: XBlock) -> str:
+        """
+        get_lms_link_for_item() returns //<lms base>/courses/<course key>/jump_to/<location>,
+        where the lms base can depend on the course's org. The prefix is
+        derived from the first link of each course.
+        """
+        location = str(xblock.location)
+        course_key = xblock.location.course_key
+        prefix = self._lms_prefixes.get(course_key)
+        if prefix is None:
+            link = get_lms_link_for_item(xblock.location)
+            if not link.endswith(location):
+                return "https:" + link
+            prefix = self._lms_prefixes[course_key] = link[: -len(location)]
+        return "https:" + prefix + location
+
+
+def get_url(xblock: XBlock, app="cms", parent: XBlock = None, url_builder: CourseUrlBuilder = None) -> str:
     """
     returns the application url to the corresponding
     page in the LMS/CMS for the xblock.
+
+    parent: optional, the parent of xblock if the caller already has it.
+    url_builder: optional, a CourseUrlBuilder shared by all the calls of a traversal.
     """
-    parent = modulestore().get_item(xblock.parent)
-    host_url = get_host_url(app)
-    course_key = str(xblock.location.course_key)
+    url_builder = url_builder or CourseUrlBuilder()
     if app == "cms":
-        if parent.category == "vertical":
-            # https://cms.dev.engineplatform.co.uk/container/block-v1:edX+DemoX+Demo_Course+type@vertical+block@867dddb6f55d410caaa9c1eb9c6743ec
-            return host_url + "/container/" + str(parent.location)
-        else:
-            # https://cms.dev.engineplatform.co.uk/course/course-v1:edX+DemoX+Demo_Course
-            return host_url + "/course/" + course_key
+        return url_builder.cms_url(xblock, parent)
     if app == "lms":
-        return "https:" + get_lms_link_for_item(xblock.location)
+        return url_builder.lms_url(xblock)
 
 
 def make_url(location, category=""):
@@ -272,13 +490,56 @@ def is_xblock(obj) -> Boolean:
     return isinstance(obj, XBlock) or issubclass(obj, XBlock)
 
 
-def is_dirty(xblock: XBlock) -> Boolean:
+def get_logged_versions(course_key: CourseKey) -> set:
+    """
+    Returns the set of (location, publication_date) pairs that have already
+    been written to the change log for course_key.
+
+    This is a single query for the entire course, intended to be passed to
+    is_dirty() while iterating the course structure so that dirty detection
+    does not cost a database round trip per block.
+    """
+    queryset = CourseChangeLog.objects.filter(course_id=course_key).values_list("location", "publication_date")
+    return {logged_version_key(location, publication_date) for location, publication_date in queryset.iterator()}
+
+
+def logged_version_key(location: UsageKey, publication_date: dt.datetime) -> tuple:
+    """
+    normalized membership key for the set returned by get_logged_versions().
+    Locations of the published branch carry branch and version information
+    that the stored locations do not, so both are normalized.
+    """
+    return (str(normalize_key(location)), publication_date)
+
+
+def is_visible_to_students(xblock: XBlock) -> Boolean:
+    """
+    Equivalent of contentstore.utils.is_currently_visible_to_students() for an
+    xblock that was loaded from the published branch, which therefore does
+    not need to be re-read from the modulestore.
+    """
+    if xblock.visible_to_staff_only:
+        return False
+
+    if "detached" not in getattr(xblock, "_class_tags", set()) and xblock.start is not None:
+        return dt.datetime.now(dt.timezone.utc) > xblock.start
+
+    return True
+
+
+def is_dirty(xblock: XBlock, logged_versions: set = None, published: bool = False) -> Boolean:
     """
     Returns true if all of the following are true:
     1. the block state has not already been logged.
     2. the block is published
     3. modifications exist
     4. the modifications have not yet been logged.
+
+    logged_versions: optional result of get_logged_versions(). When provided
+    the 'already logged' test is made against this set rather than the database.
+
+    published: True if xblock was loaded from the published branch, which
+    makes the has_published_version() test redundant.
     """
 
     publication_date = xblock_publication_date(xblock)
@@ -292,14 +553,19 @@ def is_dirty(xblock: XBlock) -> Boolean:
     #
     # evaluate this first, as we're assuming that it's the most performant
     # test that's being made in this def.
-    if not modulestore().has_published_version(xblock):
+    if not published and not get_modulestore().has_published_version(xblock):
         log.debug("is_dirty() returning False. not published: {location}".format(location=xblock.location))
         return False
 
     # we do not consider an XBlock to be dirty if
     # we already logged its state.
-    course_change_log = CourseChangeLog.objects.filter(location=xblock.location, publication_date=publication_date)
-    if course_change_log:
+    if logged_versions is not None:
+        already_logged = logged_version_key(xblock.location, publication_date) in logged_versions
+    else:
+        already_logged = CourseChangeLog.objects.filter(
+            location=xblock.location, publication_date=publication_date
+        ).exists()
+    if already_logged:
         log.debug("is_dirty() returning False. already logged: {location}".format(location=xblock.location))
         return False
 
@@ -311,6 +577,20 @@ def is_dirty(xblock: XBlock) -> Boolean:
     # return len(xblock._dirty_fields.keys()) > 0
 
 
+def chunked(iterable, size: int):
+    """
+    split iterable into lists of at most size items.
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
 def log_date(log_record):
     """
     normalized business rules for generating the "log date"
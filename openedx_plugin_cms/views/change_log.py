@@ -7,16 +7,12 @@ View to dump log data to a simple row-column paginated layout.
 see: https://docs.djangoproject.com/en/2.2/topics/pagination/
 """
 # Python stuff
-import csv
 from typing import List
 import logging
 
 # Django stuff
-from django.core.paginator import Paginator
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.cache import cache_control
-from django.http import HttpResponse
-from six import StringIO
+from django.http import JsonResponse
 
 
 # Open edX stuff
@@ -31,159 +27,170 @@ from opaque_keys.edx.keys import CourseKey
 #     # for backward compatibility with nutmeg and earlier
 #     from common.lib.xmodule.xmodule.course_module import CourseSummary
     
-try:
-    # for Teak and later
-    from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
-except ImportError:
-    # for olive and later
-    from xmodule.course_module import CourseSummary
-
 # our stuff
+from openedx_plugin_cms.http_cache import conditional_view, get_change_log_validator
 from openedx_plugin_cms.models import CourseChangeLog
-from openedx_plugin_cms.utils import get_xblock_attribute
+from openedx_plugin_cms.pagination import get_page_urls, page_as_dict, paginate
+from openedx_plugin_cms.views.csv_export import csv_streaming_response, gzip_requested, iterate_queryset
 
 log = logging.getLogger(__name__)
 # Grade book: max students per page
 MAX_ROWS_PER_PAGE = 50
 
 
-def get_csv_url(course_id=None, page_number=None):
+def get_csv_url(course_id=None):
     if course_id:
         url = "/plugin_cms/courses/{course_id}/log/csv/".format(course_id=course_id)
     else:
         url = "/plugin_cms/log/csv/"
 
-    if page_number:
-        url += "?page={page_number}".format(page_number=page_number)
-
     return url
 
 
-def get_context(course_id=None, page_number=None):
-    """
-    mcdaniel oct-2021
-
-    """
+def get_change_log(course_id=None):
     if course_id:
         course_key = CourseKey.from_string(course_id)
-        change_log = CourseChangeLog.objects.filter(course_id=course_key).order_by("-id")
-    else:
-        change_log = CourseChangeLog.objects.all().select_related("published_by", "edited_by").order_by("-id")
+        return CourseChangeLog.objects.filter(course_id=course_key).select_related("published_by", "edited_by")
+    return CourseChangeLog.objects.all().select_related("published_by", "edited_by")
+
 
-    paginator = Paginator(change_log, MAX_ROWS_PER_PAGE)
-    page = paginator.get_page(page_number)
+def get_context(course_id=None, cursor=None):
+    """
+    mcdaniel oct-2021
 
-    # mcdaniel nov-2021
-    # this is a workaround to buggy behavior with the paginator object.
-    page_number = int(page_number or 1)
-    page_next = page_number + 1 if page_number < page.paginator.num_pages else -1
-    page_previous = page_number - 1 if page_number > 1 else -1
+    Newest first, paginated with a cursor on id so that the cost of a page
+    does not depend on its depth.
+    """
+    page = paginate(get_change_log(course_id), cursor, MAX_ROWS_PER_PAGE, descending=True)
 
     context = {
         "course_id": course_id,
         "page_obj": page,
-        "page_previous": page_previous,
-        "page_next": page_next,
         "uses_bootstrap": True,
-        "csv_url": get_csv_url(course_id, page_number),
+        "csv_url": get_csv_url(course_id),
     }
+    context.update(get_page_urls(page))
     return context
 
 
+def change_log_as_dict(log_entry: CourseChangeLog) -> dict:
+    return {
+        "id": log_entry.id,
+        "operation": log_entry.operation,
+        "location": str(log_entry.location),
+        "category": log_entry.category,
+        "course_id": str(log_entry.course_id),
+        "course_display_name": log_entry.course_display_name,
+        "display_name": log_entry.display_name,
+        "ordinal_position": log_entry.ordinal_position,
+        "visible": log_entry.visible,
+        "url": log_entry.url,
+        "parent_url": log_entry.parent_url,
+        "parent_display_name": log_entry.parent_display_name,
+        "chapter_url": log_entry.chapter_url,
+        "chapter_display_name": log_entry.chapter_display_name,
+        "sequential_url": log_entry.sequential_url,
+        "sequential_display_name": log_entry.sequential_display_name,
+        "vertical_url": log_entry.vertical_url,
+        "vertical_display_name": log_entry.vertical_display_name,
+        "publication_date": log_entry.publication_date,
+        "published_on": log_entry.published_on,
+        "published_by": log_entry.published_by.username if log_entry.published_by else None,
+        "edited_on": log_entry.edited_on,
+        "edited_by": log_entry.edited_by.username if log_entry.edited_by else None,
+    }
+
+
 @login_required
 @ensure_valid_course_key
+@conditional_view(get_change_log_validator)
 def plugin_cms_change_log(request, course_id=None, **kwargs):
     """
     mcdaniel oct-2021
 
     """
-    page_number = request.GET.get("page")
+    cursor = request.GET.get("cursor")
     template_name = "course_change_log.html"
-    context = get_context(course_id, page_number)
+    context = get_context(course_id, cursor)
 
     return render_to_response(template_name=template_name, dictionary=context, request=request)
 
 
 @login_required
 @ensure_valid_course_key
-@cache_control(no_cache=True, no_store=True, must_revalidate=True)
+@conditional_view(get_change_log_validator)
+def plugin_cms_change_log_json(request, course_id=None, **kwargs):
+    """
+    The change log as json, newest first, one page per request. Follow the
+    next and previous urls of the response to page through it.
+    """
+    page = paginate(get_change_log(course_id), request.GET.get("cursor"), MAX_ROWS_PER_PAGE, descending=True)
+    return JsonResponse(page_as_dict(request, page, change_log_as_dict))
+
+
+@login_required
+@ensure_valid_course_key
+@conditional_view(get_change_log_validator, cache_page=False)
 def plugin_cms_change_csv(request, course_id=None, **kwargs):
     """
     mcdaniel oct-2021
 
-    Generate a csv download of CMS change log data
+    Generate a csv download of CMS change log data. Rows are streamed, and
+    gzip compressed if the request includes ?gzip=1
+
+    The display names of the course and of the ancestors of each block are
+    read from the row itself, so the download makes no modulestore reads.
     """
-    if course_id:
-        course_key = CourseKey.from_string(course_id)
-        change_log = CourseChangeLog.objects.filter(course_id=course_key).order_by("-id")
-        # course_display_name = CourseSummary(course_key).display_name
-        course_display_name = CourseOverview.get_from_id(course_key).display_name
-    else:
-        course_display_name = ""
-        change_log = CourseChangeLog.objects.all().select_related("published_by", "edited_by").order_by("-id")
+    change_log = get_change_log(course_id)
 
     filename = "openedx_plugin_cms_change_log"
     if course_id:
         filename += "-{course_id}".format(course_id=course_id)
     filename += ".csv"
 
-    output = []
-
-    for log_entry in change_log:
-        output.append(
-            [
-                log_entry.id,
-                log_entry.operation,
-                log_entry.location,
-                log_entry.category,
-                log_entry.course_id,
-                # str(course_display_name if course_id else CourseSummary(log_entry.course_id).display_name).replace(
-                #     "Empty", ""
-                # ),
-                str(course_display_name if course_id else CourseOverview.get_from_id(CourseKey.from_string(log_entry.course_id)).display_name).replace(
-                    "Empty", ""
-                ),
-                log_entry.parent_url,
-                get_xblock_attribute(log_entry.parent_location, "display_name"),
-                log_entry.chapter_url,
-                get_xblock_attribute(log_entry.chapter_location, "display_name"),
-                log_entry.sequential_url,
-                get_xblock_attribute(log_entry.sequential_location, "display_name"),
-                log_entry.vertical_url,
-                get_xblock_attribute(log_entry.vertical_location, "display_name"),
-                log_entry.display_name,
-                log_entry.ordinal_position,
-                log_entry.publication_date,
-                log_entry.published_by,
-            ]
-        )
-
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = "attachment; filename={filename}".format(filename=filename)
-
-    writer = csv.writer(response)
-    writer.writerow(
+    header = [
+        "id",
+        "operation",
+        "location",
+        "category",
+        "course_id",
+        "course_display_name",
+        "parent_url",
+        "parent_display_name",
+        "chapter_url",
+        "chapter_display_name",
+        "sequential_url",
+        "sequential_display_name",
+        "vertical_url",
+        "vertical_display_name",
+        "display_name",
+        "ordinal_position",
+        "publication_date",
+        "published_by",
+    ]
+
+    rows = (
         [
-            "id",
-            "operation",
-            "location",
-            "category",
-            "course_id",
-            "course_display_name",
-            "parent_url",
-            "parent_display_name",
-            "chapter_url",
-            "chapter_display_name",
-            "sequential_url",
-            "sequential_display_name",
-            "vertical_url",
-            "vertical_display_name",
-            "display_name",
-            "ordinal_position",
-            "publication_date",
-            "published_by",
+            log_entry.id,
+            log_entry.operation,
+            log_entry.location,
+            log_entry.category,
+            log_entry.course_id,
+            log_entry.course_display_name,
+            log_entry.parent_url,
+            log_entry.parent_display_name,
+            log_entry.chapter_url,
+            log_entry.chapter_display_name,
+            log_entry.sequential_url,
+            log_entry.sequential_display_name,
+            log_entry.vertical_url,
+            log_entry.vertical_display_name,
+            log_entry.display_name,
+            log_entry.ordinal_position,
+            log_entry.publication_date,
+            log_entry.published_by,
         ]
+        for log_entry in iterate_queryset(change_log, descending=True)
     )
-    writer.writerows(output)
 
-    return response
+    return csv_streaming_response(header, rows, filename, gzipped=gzip_requested(request))
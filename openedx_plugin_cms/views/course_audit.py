@@ -9,21 +9,21 @@ also: https://docs.djangoproject.com/en/2.2/topics/pagination/
 """
 # Python stuff
 import time
-import csv
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List
-from contextlib import contextmanager
+from contextlib import closing, contextmanager
+from itertools import islice
 from hashlib import md5
 
 # Django stuff
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
-from django.http import HttpResponse, JsonResponse
-from django.core.exceptions import ObjectDoesNotExist
+from django.http import JsonResponse
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.db.utils import DatabaseError
+from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.core.cache import cache
 
@@ -40,7 +40,6 @@ from celery_utils.persist_on_failure import LoggedPersistOnFailureTask
 
 # Open edX stuff
 from common.djangoapps.util.views import ensure_valid_course_key
-from openedx.core.lib.cache_utils import request_cached
 from common.djangoapps.edxmako.shortcuts import render_to_response
 from cms.djangoapps.models.settings.course_grading import CourseGradingModel
 from opaque_keys.edx.keys import CourseKey
@@ -90,23 +89,53 @@ except ImportError:
     from common.lib.xmodule.xmodule.unit_block import UnitBlock  # Units are verticals.
 
 # This repo
-from openedx_plugin_cms.models import CourseAudit
+from openedx_plugin_cms.block_index import normalize_key
+from openedx_plugin_cms.component_types import get_advanced_component_types
+from openedx_plugin_cms.http_cache import conditional_view, get_course_audit_validator
+from openedx_plugin_cms.models import CourseAudit, CourseAuditJob
+from openedx_plugin_cms.pagination import get_page_urls, page_as_dict, paginate
 from openedx_plugin_cms.utils import (
-    get_user,
+    get_cached_user,
     xblock_edit_dates,
+    CourseUrlBuilder,
     get_url,
     get_problem_type,
     get_xml_filename,
     get_grade_weight,
-    asset_extractor,
-    link_extractor,
+    analyze_html,
 )
+from openedx_plugin_cms.writers import CourseAuditWriter
+from openedx_plugin_cms.views.csv_export import csv_streaming_response, gzip_requested, iterate_queryset
 
 User = get_user_model()
 log = logging.getLogger(__name__)
 
 MAX_ROWS_PER_PAGE = 200
-CACHE_NAMESPACE = "plugin.cms.CourseAudit.cache."
+
+# the columns of the csv download and of the json listing.
+COURSE_AUDIT_FIELDS = [
+    "a_order",
+    "b_course",
+    "c_module",
+    "d_section",
+    "e_unit",
+    "e2_block_type",
+    "f_graded",
+    "g_section_weight",
+    "h_number_graded_sections",
+    "i_component_type",
+    "j_non_standard_element",
+    "k_problem_weight",
+    "m_iframe_external_url",
+    "m_external_links",
+    "n_asset_type",
+    "o_unit_url",
+    "p_studio_url",
+    "q_xml_filename",
+    "r_publication_date",
+    "s_changed_by",
+    "t_change_made",
+]
 
 # Celery tasks constants
 LOCK_EXPIRE = 60 * 15
@@ -158,10 +187,8 @@ def task_lock(oid, course_id):
             cache.delete(lock_id)
 
 
-def get_csv_url(course_key, page_number=None):
+def get_csv_url(course_key):
     url = "/plugin/cms/courses/{course_id}/audit/csv/".format(course_id=str(course_key))
-    if page_number:
-        url += "?page={page_number}".format(page_number=page_number)
     return url
 
 
@@ -170,6 +197,11 @@ def get_refresh_url(course_key):
     return url
 
 
+def get_refresh_status_url(course_key):
+    url = "/plugin/cms/courses/{course_id}/audit/refresh/status/".format(course_id=str(course_key))
+    return url
+
+
 def get_blank_dict() -> Dict:
     """
     doing this as a means of documenting what the final output looks
@@ -197,19 +229,21 @@ def get_blank_dict() -> Dict:
     row["r_publication_date"] = ""
     row["s_changed_by"] = ""
     row["t_change_made"] = ""
+    row["vertical_location"] = None
+    row["vertical_edited_on"] = None
 
     return row
 
 
 # def get_chapter_dict(i: int, course: CourseBlock, chapter: SectionBlock) -> Dict:
-def get_chapter_dict(i: int, course: XBlock, chapter: XBlock) -> Dict:
+def get_chapter_dict(i: int, course: XBlock, chapter: XBlock, url_builder: CourseUrlBuilder = None) -> Dict:
     row = get_blank_dict()
     row["a_order"] = str(i)
     row["b_course"] = course.display_name
     row["c_module"] = chapter.display_name
     row["e2_block_type"] = chapter.location.block_type
-    row["o_unit_url"] = get_url(chapter, "lms")
-    row["p_studio_url"] = get_url(chapter, "cms")
+    row["o_unit_url"] = get_url(chapter, "lms", parent=course, url_builder=url_builder)
+    row["p_studio_url"] = get_url(chapter, "cms", parent=course, url_builder=url_builder)
     return row
 
 
@@ -221,14 +255,15 @@ def get_sequence_dict(
     course: XBlock,
     chapter: XBlock,
     sequence: XBlock,
+    url_builder: CourseUrlBuilder = None,
 ) -> Dict:
-    row = get_chapter_dict(i, course, chapter)
+    row = get_chapter_dict(i, course, chapter, url_builder)
     row["d_section"] = sequence.display_name
     # e_unit -- skip. handled in get_vertical_dict()
     row["e2_block_type"] = sequence.location.block_type
     row["f_graded"] = sequence.graded if sequence.graded else ""
-    row["o_unit_url"] = get_url(sequence, "lms")
-    row["p_studio_url"] = get_url(sequence, "cms")
+    row["o_unit_url"] = get_url(sequence, "lms", parent=chapter, url_builder=url_builder)
+    row["p_studio_url"] = get_url(sequence, "cms", parent=chapter, url_builder=url_builder)
     return row
 
 
@@ -242,15 +277,16 @@ def get_vertical_dict(
     chapter: XBlock,
     sequence: XBlock,
     vertical: XBlock,
+    url_builder: CourseUrlBuilder = None,
 ) -> Dict:
-    row = get_sequence_dict(i, course, chapter, sequence)
+    row = get_sequence_dict(i, course, chapter, sequence, url_builder)
     row["e_unit"] = vertical.display_name
     row["e2_block_type"] = vertical.location.block_type
     row["f_graded"] = vertical.graded
     # g_section_weight - skip. handled in parent loop, get_sequence_dict()
     # h_number_graded_sections - skip. handled in parent loop, get_sequence_dict()
-    row["o_unit_url"] = get_url(vertical, "lms")
-    row["p_studio_url"] = get_url(vertical, "cms")
+    row["o_unit_url"] = get_url(vertical, "lms", parent=sequence, url_builder=url_builder)
+    row["p_studio_url"] = get_url(vertical, "cms", parent=sequence, url_builder=url_builder)
     return row
 
 
@@ -266,6 +302,7 @@ def get_vertical_child_dict(
     vertical: XBlock,
     child: XBlock,
     advanced_component_types: list,
+    url_builder: CourseUrlBuilder = None,
 ) -> Dict:
     """
     Note that all of these parameters are descendants of XBlock, including child.
@@ -275,7 +312,7 @@ def get_vertical_child_dict(
     of data and so we'll defer that indefinitely until a real need arises.
     """
     edited_on, published_on = xblock_edit_dates(child)
-    row = get_vertical_dict(i, course, chapter, sequence, vertical)
+    row = get_vertical_dict(i, course, chapter, sequence, vertical, url_builder)
     row["e2_block_type"] = child.location.block_type
 
     if hasattr(child, "data"):
@@ -289,27 +326,106 @@ def get_vertical_child_dict(
         row["i_component_type"] = component_type
         row["j_non_standard_element"] = component_type if component_type in advanced_component_types else ""
 
+    iframes = ()
     if child.location.block_type == "html" and hasattr(child, "data"):
-        row["n_asset_type"] = asset_extractor(child.data)
-        row["m_external_links"] = link_extractor(child.data)
+        html_analysis = analyze_html(child.data)
+        row["n_asset_type"] = ",\r\n".join(html_analysis.assets)
+        row["m_external_links"] = ",\r\n".join(html_analysis.links)
+        iframes = html_analysis.iframes
 
     if hasattr(child, "html_file"):
         row["m_iframe_external_url"] = child.html_file
+    elif iframes:
+        row["m_iframe_external_url"] = iframes[0]
 
-    row["o_unit_url"] = get_url(child, "lms")
-    row["p_studio_url"] = get_url(child, "cms")
+    row["o_unit_url"] = get_url(child, "lms", parent=vertical, url_builder=url_builder)
+    row["p_studio_url"] = get_url(child, "cms", parent=vertical, url_builder=url_builder)
     row["q_xml_filename"] = get_xml_filename(child)
     row["r_publication_date"] = published_on.strftime("%d-%b-%Y, %H:%M")
-    row["s_changed_by"] = get_user(child.edited_by) if child.edited_by > 0 else ""
+    row["s_changed_by"] = (get_cached_user(child.edited_by) or "") if child.edited_by > 0 else ""
     row["t_change_made"] = edited_on.strftime("%d-%b-%Y, %H:%M")
+    row["vertical_location"] = vertical.location
+    row["vertical_edited_on"] = get_vertical_edited_on(sequence, vertical)
 
     return row
 
 
-def get_analyzed_course(course_key: CourseKey) -> List:
+def get_vertical_edited_on(sequence: XBlock, vertical: XBlock):
+    """
+    the rows of the children of vertical are fully determined by the
+    vertical's subtree plus the settings of its sequence (graded, format),
+    so they are still valid for as long as this value does not change.
+    """
+    dates = [
+        date for date in (getattr(vertical, "subtree_edited_on", None), getattr(sequence, "edited_on", None)) if date
+    ]
+    return max(dates) if dates else None
+
+
+def get_reused_child_record(
+    i: int,
+    course: XBlock,
+    chapter: XBlock,
+    sequence: XBlock,
+    vertical: XBlock,
+    record: CourseAudit,
+) -> CourseAudit:
+    """
+    Incremental audits: bring a persisted row of an unchanged vertical up to
+    date with everything that lives outside of the vertical's subtree, which
+    is its position in the course and the names and grading policy of its
+    ancestors.
+    """
+    record.a_order = i
+    record.b_course = course.display_name
+    record.c_module = chapter.display_name
+    record.d_section = sequence.display_name
+    record.e_unit = vertical.display_name
+    if record.e2_block_type == "problem" and sequence.graded:
+        record.g_section_weight, record.h_number_graded_sections = get_grade_weight(sequence, course)
+    return record
+
+
+def get_persisted_verticals(course_key: CourseKey) -> Dict:
+    """
+    Returns {vertical_location: (vertical_edited_on, [CourseAudit])} for the
+    children of the verticals in the published audit of course_key.
+    """
+    retval = {}
+    records = CourseAudit.objects.current(course_key).filter(vertical_location__isnull=False).order_by("a_order")
+    for record in records:
+        vertical_edited_on, children = retval.setdefault(
+            normalize_key(record.vertical_location), (record.vertical_edited_on, [])
+        )
+        children.append(record)
+    return retval
+
+
+def get_analyzed_course(course_key: CourseKey, persisted_verticals: Dict = None) -> List:
+    """
+    Returns all of the rows of iter_analyzed_course() as a list.
+    """
+    return list(iter_analyzed_course(course_key, persisted_verticals))
+
+
+def fetch_published(store, course_key: CourseKey, location, depth: int):
+    """
+    Read the block at location, with depth levels of its descendants, from
+    the published branch. The branch setting is thread-local, so it is held
+    for the duration of the read only, and never across the yields of
+    iter_analyzed_course() into the consumer's code.
+    """
+    with store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+        return store.get_item(location, depth=depth)
+
+
+def iter_analyzed_course(course_key: CourseKey, persisted_verticals: Dict = None, lazy: bool = False):
     """
     Iterate the course blocks, in order of presentation, as you'd see in the
-    Course Outline page in CMS.
+    Course Outline page in CMS, yielding one row per block.
+
+    This is a generator: the course is walked only as far as the consumer
+    reads.
 
     The get_children() iterators in this def each return instantiated
     XBlock-derivative objects that vary in type depending on which level
@@ -319,257 +435,296 @@ def get_analyzed_course(course_key: CourseKey) -> List:
     objects returns any of a wide variety of XBlock derivatives. A common
     authoring pattern for graded problems is to create a
     series of html, problem, and discussion objects.
+
+    persisted_verticals: optional, the result of get_persisted_verticals().
+    The children of the verticals that have not changed since they were
+    persisted are not analyzed again; their persisted CourseAudit records
+    are returned in their place, renumbered and with refreshed ancestors.
+
+    lazy: only load the course outline down to the sequentials up front,
+    and fetch the verticals of each sequential and the children of each
+    vertical as the walk reaches them. For previews, which only read the
+    first rows.
     """
     log.debug("get_context - Start: {course_key}".format(course_key=course_key))
 
     store = modulestore()
-    retval = []
+    url_builder = CourseUrlBuilder()
     i = 0
 
     # since we're auditing changes to published course content, we can
     # optimize the entire traversal by filtering for published content
     # at the onset.
+    #
+    # depth=4 causes get_course() to prefetch all of the xblock objects that
+    # we're going to inspect. Incremental audits stop at the verticals, and
+    # only load the children of the changed ones; previews stop at the
+    # sequentials. Whatever is not prefetched is fetched explicitly, with
+    # fetch_published().
+    if lazy:
+        depth = 2
+    elif persisted_verticals is not None:
+        depth = 3
+    else:
+        depth = 4
     with store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
-        # The optional param "depth=4" causes get_course() to prefetch all of the
-        # xblock objects that we're going to inspect.
-        course = store.get_course(course_key, depth=4)
-        STANDARD_COMPONENT_TYPES = [
-            "about",
-            "chapter",
-            "course",
-            "course_info",
-            "discussion",
-            "html",
-            "image",
-            "library",
-            "library_content",
-            "library_sourced",
-            "lti",
-            "lti_consumer",
-            "openassessment",
-            "sequential",
-            "unit",
-            "vertical",
-            "video",
-            "wrapper",
-        ]
-        ADVANCED_COMPONENT_TYPES = sorted(
-            {name for name, class_ in XBlock.load_classes()}
-            - set(STANDARD_COMPONENT_TYPES)
-            - set(course.advanced_modules)
-        )
-
-        for chapter in course.get_children():
-            # chapter is a SectionBlock
+        course = store.get_course(course_key, depth=depth)
+    ADVANCED_COMPONENT_TYPES = get_advanced_component_types(course.advanced_modules)
+
+    for chapter in course.get_children():
+        # chapter is a SectionBlock
+        i += 1
+        row = get_chapter_dict(i, course, chapter, url_builder)
+        yield row
+        for sequence in chapter.get_children():
+            # sequence is a SequenceBlock
             i += 1
-            row = get_chapter_dict(i, course, chapter)
-            retval.append(row)
-            for sequence in chapter.get_children():
-                # sequence is a SequenceBlock
+            row = get_sequence_dict(i, course, chapter, sequence, url_builder)
+            yield row
+            if depth < 3:
+                sequence = fetch_published(store, course_key, sequence.location, depth=1)
+            for vertical in sequence.get_children():
+                # vertical is a VerticalBlock
                 i += 1
-                row = get_sequence_dict(i, course, chapter, sequence)
-                retval.append(row)
-                for vertical in sequence.get_children():
-                    # vertical is a VerticalBlock
-                    i += 1
-                    row = get_vertical_dict(i, course, chapter, sequence, vertical)
-                    retval.append(row)
-                    for child in vertical.get_children():
-                        # child is any of ProblemBlock, DiscussionXBlock, HtmlBlock
-                        # or an object that descends from one of these.
-                        #
-                        # it might also be something more esoteric like AnnotatableBlock, etc.
+                row = get_vertical_dict(i, course, chapter, sequence, vertical, url_builder)
+                yield row
+
+                vertical_edited_on, persisted_children = (persisted_verticals or {}).get(
+                    normalize_key(vertical.location), (None, None)
+                )
+                if (
+                    persisted_children
+                    and vertical_edited_on is not None
+                    and vertical_edited_on == get_vertical_edited_on(sequence, vertical)
+                ):
+                    for record in persisted_children:
                         i += 1
-                        print("Analyzing content block: {course_key} - {i}".format(course_key=course_key, i=i))
-                        row = get_vertical_child_dict(
-                            i,
-                            course,
-                            chapter,
-                            sequence,
-                            vertical,
-                            child,
-                            ADVANCED_COMPONENT_TYPES,
-                        )
-                        retval.append(row)
+                        yield get_reused_child_record(i, course, chapter, sequence, vertical, record)
+                    continue
+
+                if depth < 4:
+                    vertical = fetch_published(store, course_key, vertical.location, depth=1)
+                for child in vertical.get_children():
+                    # child is any of ProblemBlock, DiscussionXBlock, HtmlBlock
+                    # or an object that descends from one of these.
+                    #
+                    # it might also be something more esoteric like AnnotatableBlock, etc.
+                    i += 1
+                    log.debug("Analyzing content block: {course_key} - {i}".format(course_key=course_key, i=i))
+                    row = get_vertical_child_dict(
+                        i,
+                        course,
+                        chapter,
+                        sequence,
+                        vertical,
+                        child,
+                        ADVANCED_COMPONENT_TYPES,
+                        url_builder,
+                    )
+                    yield row
 
     log.debug("get_context - End: {course_key}".format(course_key=course_key))
 
-    return retval
 
+def persist_analyzed_course(course_key: CourseKey, incremental: bool = None, progress=None) -> int:
+    """
+    write all records of an analyzed course to the database, replacing
+    the previously persisted records. Returns the number of rows written.
+
+    incremental: only analyze the verticals that changed since the last
+    audit. defaults to PLUGIN_CMS_AUDIT_INCREMENTAL.
+    progress: optional callable, see CourseAuditWriter.write()
+    """
+    if incremental is None:
+        incremental = settings.PLUGIN_CMS_AUDIT_INCREMENTAL
+    persisted_verticals = get_persisted_verticals(course_key) if incremental else None
+    return CourseAuditWriter(course_key).write(iter_analyzed_course(course_key, persisted_verticals), progress)
 
-def persist_analyzed_course(course_key: CourseKey) -> None:
+
+class PreviewPage:
     """
-    write all records of an analyzed course to the database.
+    Stands in for a pagination.CursorPage in get_context(cached=False),
+    where only the rows up to the end of the requested page are analyzed and
+    so the total number of pages is not known. Pages are numbered, because
+    there are no persisted ids for a cursor to point at.
+    """
+
+    def __init__(self, object_list: List, number: int, has_next: bool):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self.number > 1
+
+
+def get_preview_page(course_key: CourseKey, page_number=None) -> PreviewPage:
+    """
+    Analyze course_key only as far as the end of page page_number, plus one
+    row to find out whether there is a next page. The course is loaded
+    lazily, so the modulestore reads stop there too.
     """
     try:
-        CourseAudit.objects.filter(course_id=course_key).delete()
-    except ObjectDoesNotExist:
-        log.info("No persisted records to replace for course_key: {course_key}".format(course_key=course_key))
+        page_number = max(int(page_number or 1), 1)
+    except ValueError:
+        page_number = 1
+    start = (page_number - 1) * MAX_ROWS_PER_PAGE
 
-    course_audit = get_analyzed_course(course_key)
-    for row in course_audit:
-        user = User.objects.get(username=row["s_changed_by"]) if row["s_changed_by"] != "" else None
+    with closing(iter_analyzed_course(course_key, lazy=True)) as rows:
+        preview = list(islice(rows, start, start + MAX_ROWS_PER_PAGE + 1))
 
-        rec = CourseAudit.objects.create(
-            course_id=course_key,
-            a_order=int(row["a_order"]),
-            b_course=row["b_course"][-255:] if row["b_course"] is not None else None,
-            c_module=row["c_module"][-255:] if row["c_module"] is not None else None,
-            d_section=row["d_section"][-255:] if row["d_section"] is not None else None,
-            e_unit=row["e_unit"][-255:] if row["e_unit"] is not None else None,
-            e2_block_type=row["e2_block_type"][-255:] if row["e2_block_type"] is not None else None,
-            f_graded=row["f_graded"],
-            g_section_weight=float(row["g_section_weight"]) if row["g_section_weight"] != "" else None,
-            h_number_graded_sections=int(row["h_number_graded_sections"])
-            if row["h_number_graded_sections"] != ""
-            else None,
-            i_component_type=row["i_component_type"][-255:] if row["i_component_type"] is not None else None,
-            j_non_standard_element=row["j_non_standard_element"][-255:]
-            if row["j_non_standard_element"] is not None
-            else None,
-            k_problem_weight=float(row["k_problem_weight"]) if row["k_problem_weight"] != "" else None,
-            m_iframe_external_url=row["m_iframe_external_url"],
-            n_asset_type=row["n_asset_type"],
-            o_unit_url=row["o_unit_url"],
-            p_studio_url=row["p_studio_url"],
-            q_xml_filename=row["q_xml_filename"][-255:] if row["q_xml_filename"] is not None else None,
-            r_publication_date=datetime.strptime(row["r_publication_date"], "%d-%b-%Y, %H:%M")
-            if row["r_publication_date"] != ""
-            else None,
-            s_changed_by=user,
-            t_change_made=datetime.strptime(row["t_change_made"], "%d-%b-%Y, %H:%M")
-            if row["t_change_made"] != ""
-            else None,
-        )
-        rec.save()
-        print("persisted row: {i}".format(i=rec.a_order))
+    # convert to unsaved CourseAudit instances, which is what the template renders.
+    writer = CourseAuditWriter(course_key)
+    users = writer.get_users(preview)
+    records = [writer.to_course_audit(row, users) for row in preview[:MAX_ROWS_PER_PAGE]]
+    return PreviewPage(records, page_number, has_next=len(preview) > MAX_ROWS_PER_PAGE)
 
 
-def get_context(course_key: CourseKey, page_number=None, cached=True, report_message="") -> Dict:
+def get_context(course_key: CourseKey, cursor=None, cached=True, report_message="", page_number=None) -> Dict:
     """
-    write all records of an analyzed course to the database.
+    cached: page through the persisted audit with a cursor on id. Otherwise
+    analyze the course as far as page page_number.
     """
 
     report_as_of = ""
     if cached:
-        course_audit = CourseAudit.objects.filter(course_id=course_key).order_by("id")
+        course_audit = CourseAudit.objects.current(course_key)
         try:
-            report_as_of = course_audit[0].created.strftime("%d-%b-%Y, %H:%M")
-        except ObjectDoesNotExist:
+            report_as_of = course_audit.order_by("id")[0].created.strftime("%d-%b-%Y, %H:%M")
+        except IndexError:
             pass
+        page = paginate(course_audit, cursor, MAX_ROWS_PER_PAGE)
+        page_urls = get_page_urls(page)
     else:
-        course_audit = get_analyzed_course(course_key)
+        page = get_preview_page(course_key, page_number)
         report_as_of = datetime.today().strftime("%d-%b-%Y, %H:%M")
-    paginator = Paginator(course_audit, MAX_ROWS_PER_PAGE)
-    page = paginator.get_page(page_number)
-
-    # mcdaniel nov-2021
-    # this is a workaround to buggy behavior with the paginator object.
-    page_number = int(page_number or 1)
-    page_next = page_number + 1 if page_number < page.paginator.num_pages else -1
-    page_previous = page_number - 1 if page_number > 1 else -1
+        page_urls = {
+            "page_first_url": "?page=1",
+            "page_previous_url": "?page={0}".format(page.number - 1) if page.has_previous() else None,
+            "page_next_url": "?page={0}".format(page.number + 1) if page.has_next() else None,
+            # the preview does not know how many rows there are.
+            "page_last_url": None,
+        }
 
     context = {
         "course_id": str(course_key),
         "report_as_of": report_as_of,
         "page_obj": page,
-        "page_previous": page_previous,
-        "page_next": page_next,
         "uses_bootstrap": True,
-        "csv_url": get_csv_url(course_key, page_number),
+        "csv_url": get_csv_url(course_key),
         "refresh_url": get_refresh_url(course_key),
     }
+    context.update(page_urls)
 
     return context
 
 
+def course_audit_as_dict(record: CourseAudit) -> Dict:
+    retval = {field: getattr(record, field) for field in COURSE_AUDIT_FIELDS}
+    retval["s_changed_by"] = record.s_changed_by.username if record.s_changed_by else None
+    return retval
+
+
 @login_required
-@request_cached(CACHE_NAMESPACE)
 @ensure_valid_course_key
+@conditional_view(get_course_audit_validator)
 def plugin_cms_course_audit(request, course_id: str, **kwargs):
     """
     mcdaniel nov-2021
     """
-    page_number = request.GET.get("page")
+    cursor = request.GET.get("cursor")
     template_name = "course_audit.html"
     course_key = CourseKey.from_string(course_id)
     report_message = kwargs.get("report_message")
 
-    context = get_context(course_key, page_number, cached=True, report_message=report_message)
+    context = get_context(course_key, cursor, cached=True, report_message=report_message)
 
     return render_to_response(template_name=template_name, dictionary=context, request=request)
 
 
 @login_required
 @ensure_valid_course_key
-@request_cached(CACHE_NAMESPACE)
+@conditional_view(get_course_audit_validator)
+def plugin_cms_course_audit_json(request, course_id: str, **kwargs):
+    """
+    The published course audit as json, one page per request. Follow the
+    next and previous urls of the response to page through it.
+    """
+    course_key = CourseKey.from_string(course_id)
+    course_audit = CourseAudit.objects.current(course_key).select_related("s_changed_by")
+    page = paginate(course_audit, request.GET.get("cursor"), MAX_ROWS_PER_PAGE)
+    return JsonResponse(page_as_dict(request, page, course_audit_as_dict))
+
+
+@login_required
+@ensure_valid_course_key
+@conditional_view(get_course_audit_validator, cache_page=False)
 def plugin_cms_course_audit_csv(request, course_id: str, **kwargs):
     """
     mcdaniel oct-2021
 
-    Generate a csv download of CMS change log data
+    Generate a csv download of CMS change log data. Rows are streamed, and
+    gzip compressed if the request includes ?gzip=1
     """
     course_key = CourseKey.from_string(course_id)
-    output = CourseAudit.objects.filter(course_id=course_key).order_by("id")
+    output = CourseAudit.objects.current(course_key).select_related("s_changed_by").order_by("id")
     filename = "openedx_plugin_cms_course_audit-{course_id}.csv".format(course_id=course_id)
 
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = "attachment; filename={filename}".format(filename=filename)
-
-    writer = csv.writer(response)
-    writer.writerow(
+    header = COURSE_AUDIT_FIELDS
+    rows = (
         [
-            "a_order",
-            "b_course",
-            "c_module",
-            "d_section",
-            "e_unit",
-            "e2_block_type",
-            "f_graded",
-            "g_section_weight",
-            "h_number_graded_sections",
-            "i_component_type",
-            "j_non_standard_element",
-            "k_problem_weight",
-            "m_iframe_external_url",
-            "m_external_links",
-            "n_asset_type",
-            "o_unit_url",
-            "p_studio_url",
-            "q_xml_filename",
-            "r_publication_date",
-            "s_changed_by",
-            "t_change_made",
+            row.a_order,
+            row.b_course,
+            row.c_module,
+            row.d_section,
+            row.e_unit,
+            row.e2_block_type,
+            row.f_graded,
+            row.g_section_weight,
+            row.h_number_graded_sections,
+            row.i_component_type,
+            row.j_non_standard_element,
+            row.k_problem_weight,
+            row.m_iframe_external_url,
+            row.m_external_links,
+            row.n_asset_type,
+            row.o_unit_url,
+            row.p_studio_url,
+            row.q_xml_filename,
+            row.r_publication_date,
+            row.s_changed_by,
+            row.t_change_made,
         ]
+        for row in iterate_queryset(output)
     )
-    for row in output:
-        writer.writerow(
-            [
-                row.a_order,
-                row.b_course,
-                row.c_module,
-                row.d_section,
-                row.e_unit,
-                row.e2_block_type,
-                row.f_graded,
-                row.g_section_weight,
-                row.h_number_graded_sections,
-                row.i_component_type,
-                row.j_non_standard_element,
-                row.k_problem_weight,
-                row.m_iframe_external_url,
-                row.m_external_links,
-                row.n_asset_type,
-                row.o_unit_url,
-                row.p_studio_url,
-                row.q_xml_filename,
-                row.r_publication_date,
-                row.s_changed_by,
-                row.t_change_made,
-            ]
-        )
 
-    return response
+    return csv_streaming_response(header, rows, filename, gzipped=gzip_requested(request))
+
+
+def get_active_job(course_key: CourseKey) -> CourseAuditJob:
+    """
+    Returns the queued or running refresh job of course_key, if any. Jobs
+    that have not reported progress for longer than the task time limit
+    are presumed dead, so that they cannot block refreshes forever.
+    """
+    return (
+        CourseAuditJob.objects.filter(
+            course_id=course_key,
+            state__in=CourseAuditJob.ACTIVE_STATES,
+            modified__gte=timezone.now() - timedelta(seconds=TASK_TIME_LIMIT),
+        )
+        .order_by("-id")
+        .first()
+    )
 
 
 @login_required
@@ -578,25 +733,69 @@ def plugin_cms_course_audit_refresh(request, course_id: str, **kwargs):
     """
     mcdaniel dec-2021.
 
-    wrapper method to force serialization of calls to persist_analyzed_course()
+    queue a refresh of the report data of course_id, unless one is already
+    in progress, and return immediately. The job's progress is reported by
+    plugin_cms_course_audit_refresh_status().
     """
-    message = "An unknown error occurred."
+    course_key = CourseKey.from_string(course_id)
+    status_url = get_refresh_status_url(course_key)
+    content = {"description": "An unknown error occurred."}
     status = 500
+
+    # serializes the check for an active job and the creation of a new one.
     with task_lock(oid="plugin_cms_course_audit_refresh", course_id=course_id) as acquired:
-        if acquired:
-            _plugin_cms_course_audit_refresh(course_id=course_id)
-            message = "Report data refresh process was successfully initiated for course_key:" " {course_id}".format(
+        if not acquired:
+            content["description"] = "Refresh process is currently locked for course_key: {course_id}".format(
                 course_id=course_id
             )
-            status = 204
-        else:
-            message = "Refresh process is currently locked for course_key: {course_id}".format(course_id=course_id)
             status = 403
+        else:
+            job = get_active_job(course_key)
+            if job:
+                content["description"] = "A refresh is already in progress for course_key: {course_id}".format(
+                    course_id=course_id
+                )
+                status = 409
+            else:
+                job = CourseAuditJob.objects.create(
+                    course_id=course_key,
+                    rows_total=CourseAudit.objects.current(course_key).count() or None,
+                    requested_by=request.user if request.user.is_authenticated else None,
+                )
+                transaction.on_commit(
+                    lambda: _plugin_cms_course_audit_refresh.delay(course_id=course_id, job_id=job.id)
+                )
+                content["description"] = (
+                    "Report data refresh process was successfully initiated for course_key: {course_id}".format(
+                        course_id=course_id
+                    )
+                )
+                status = 202
+            content["job"] = job.as_dict()
+            content["status_url"] = status_url
 
-    content = {"description": message}
     return JsonResponse(data=content, status=status)
 
 
+@login_required
+@ensure_valid_course_key
+def plugin_cms_course_audit_refresh_status(request, course_id: str, **kwargs):
+    """
+    JSON status of a refresh job of course_id: the job given by ?job_id=,
+    or else the most recent one.
+    """
+    course_key = CourseKey.from_string(course_id)
+    jobs = CourseAuditJob.objects.filter(course_id=course_key).order_by("-id")
+    job_id = request.GET.get("job_id")
+    if job_id:
+        jobs = jobs.filter(id=job_id) if job_id.isdigit() else jobs.none()
+
+    job = jobs.first()
+    if job is None:
+        return JsonResponse(data={"description": "No refresh job found."}, status=404)
+    return JsonResponse(data={"job": job.as_dict()}, status=200)
+
+
 @task(
     bind=True,
     base=LoggedPersistOnFailureTask,
@@ -607,13 +806,37 @@ def plugin_cms_course_audit_refresh(request, course_id: str, **kwargs):
     task_time_limit=TASK_TIME_LIMIT,
     task_soft_time_limit=TASK_SOFT_TIME_LIMIT,
 )
-def _plugin_cms_course_audit_refresh(self, course_id: str) -> None:
+def _plugin_cms_course_audit_refresh(self, course_id: str, job_id: int = None) -> None:
     """
     mcdaniel dec-2021.
 
-    launch a background task to refresh report data for course_key
+    launch a background task to refresh report data for course_key, and
+    report its progress to the CourseAuditJob job_id.
     """
     course_key = CourseKey.from_string(course_id)
-    if course_key:
-        log.info("refreshing report data for course_key: {course_id}".format(course_id=course_id))
-        persist_analyzed_course(course_key)
+    if not course_key:
+        return
+
+    log.info("refreshing report data for course_key: {course_id}".format(course_id=course_id))
+    jobs = CourseAuditJob.objects.filter(id=job_id)
+    now = timezone.now()
+    jobs.update(state=CourseAuditJob.RUNNING, started=now, modified=now)
+
+    def progress(rows_processed: int):
+        jobs.update(rows_processed=rows_processed, modified=timezone.now())
+
+    try:
+        rows = persist_analyzed_course(course_key, progress=progress)
+    except Exception as e:  # noqa: B902
+        now = timezone.now()
+        jobs.update(state=CourseAuditJob.FAILED, finished=now, modified=now, error=str(e))
+        raise
+
+    now = timezone.now()
+    jobs.update(
+        state=CourseAuditJob.SUCCEEDED,
+        rows_processed=rows,
+        rows_total=rows,
+        finished=now,
+        modified=now,
+    )
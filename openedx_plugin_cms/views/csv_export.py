@@ -0,0 +1,90 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+CMS App - streaming csv downloads
+
+Rows are written one at a time to the response as they are read in
+id-keyset chunks, so memory use is bounded by the chunk size regardless of
+the size of the export. QuerySet.iterator() does not bound memory on MySQL,
+whose driver buffers the whole result set on the client.
+
+see: https://docs.djangoproject.com/en/3.2/howto/outputting-csv/#streaming-large-csv-files
+"""
+# Python
+import csv
+import zlib
+
+# Django
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+# gzip container, rather than a raw zlib stream.
+GZIP_WBITS = zlib.MAX_WBITS | 16
+
+
+class Echo:
+    """
+    An object that implements just the write method of the file-like
+    interface, returning the value written rather than buffering it.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iterate_queryset(queryset, descending: bool = False):
+    """
+    Iterate queryset ordered by id, newest first if descending, reading one
+    query of PLUGIN_CMS_CSV_CHUNK_SIZE rows at a time. Any ordering of
+    queryset is replaced.
+    """
+    chunk_size = settings.PLUGIN_CMS_CSV_CHUNK_SIZE
+    queryset = queryset.order_by("-id" if descending else "id")
+    last_id = None
+    while True:
+        chunk = queryset
+        if last_id is not None:
+            chunk = chunk.filter(**{"id__lt" if descending else "id__gt": last_id})
+        chunk = list(chunk[:chunk_size])
+        yield from chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1].id
+
+
+def gzip_requested(request) -> bool:
+    return request.GET.get("gzip", "").lower() in ("1", "true", "yes")
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def csv_streaming_response(header: list, rows, filename: str, gzipped: bool = False) -> StreamingHttpResponse:
+    """
+    Returns a StreamingHttpResponse that downloads header followed by rows,
+    an iterable of lists, as filename. If gzipped then the download is
+    compressed on the fly to filename.gz.
+    """
+    writer = csv.writer(Echo())
+
+    def generate():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+
+    if gzipped:
+        response = StreamingHttpResponse(_gzip(generate()), content_type="application/gzip")
+        filename += ".gz"
+    else:
+        response = StreamingHttpResponse(generate(), content_type="text/csv")
+
+    response["Content-Disposition"] = "attachment; filename={filename}".format(filename=filename)
+    return response
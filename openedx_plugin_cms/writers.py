@@ -0,0 +1,312 @@
+# coding=utf-8
+"""
+Paul Okeke - https://pauldiconline.com
+Oct-2026
+
+Buffered, bulk persistence of plugin model instances.
+"""
+# python stuff
+import logging
+from datetime import datetime
+
+# django stuff
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+# our stuff
+from .block_index import normalize_key
+from .http_cache import invalidate_change_log, invalidate_course_audit
+from .models import CourseAudit, CourseAuditPointer, CourseBlockSnapshot, CourseChangeLog
+from .retention import purge_stale_course_audit_task
+from .utils import chunked, logged_version_key
+
+User = get_user_model()
+log = logging.getLogger(__name__)
+
+# the format of the dates in the rows produced by views.course_audit.get_analyzed_course()
+COURSE_AUDIT_DATE_FORMAT = "%d-%b-%Y, %H:%M"
+
+# CourseBlockSnapshot fields that are maintained by write_block_snapshots()
+SNAPSHOT_FIELDS = (
+    "display_name",
+    "category",
+    "ordinal_position",
+    "url",
+    "parent_location",
+    "parent_url",
+    "chapter_location",
+    "chapter_url",
+    "sequential_location",
+    "sequential_url",
+    "vertical_location",
+    "vertical_url",
+)
+
+
+class CourseChangeLogWriter:
+    """
+    Collects the CourseChangeLog instances produced during one auditor run
+    and persists them in chunks with bulk_create() / bulk_update(), inside a
+    single transaction.
+
+    Instances are keyed on (location, publication_date, operation), the
+    natural key of CourseChangeLog. Rows that already exist for a key are
+    updated in place, everything else is inserted.
+    """
+
+    def __init__(self, batch_size: int = None):
+        self.batch_size = batch_size or settings.PLUGIN_CMS_BULK_BATCH_SIZE
+        self.inserted = 0
+        self.updated = 0
+        self._pending = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, course_change_log: CourseChangeLog) -> None:
+        """
+        queue course_change_log for the next flush(). A later instance for
+        the same (location, publication_date, operation) replaces an earlier one.
+        """
+        course_change_log.course_id = normalize_key(course_change_log.course_id)
+        course_change_log.location = normalize_key(course_change_log.location)
+        self._pending[self._get_key(course_change_log)] = course_change_log
+
+    def flush(self) -> tuple:
+        """
+        persist all queued instances. Returns the number of rows (inserted, updated).
+        """
+        if not self._pending:
+            return 0, 0
+
+        records = list(self._pending.values())
+        self._pending = {}
+        update_fields = [
+            field.name
+            for field in CourseChangeLog._meta.concrete_fields
+            if not field.primary_key and field.name != "created"
+        ]
+        inserted = 0
+        updated = 0
+
+        with transaction.atomic():
+            for chunk in chunked(records, self.batch_size):
+                existing = self._get_existing_ids(chunk)
+                now = timezone.now()
+                to_create = []
+                to_update = []
+                for record in chunk:
+                    pk = record.pk or existing.get(self._get_key(record))
+                    if pk:
+                        record.pk = pk
+                        record.modified = now
+                        to_update.append(record)
+                    else:
+                        to_create.append(record)
+
+                if to_create:
+                    CourseChangeLog.objects.bulk_create(to_create, batch_size=self.batch_size)
+                if to_update:
+                    CourseChangeLog.objects.bulk_update(to_update, update_fields, batch_size=self.batch_size)
+                inserted += len(to_create)
+                updated += len(to_update)
+
+        course_keys = {record.course_id for record in records}
+        transaction.on_commit(lambda: invalidate_change_log(course_keys))
+
+        self.inserted += inserted
+        self.updated += updated
+        log.info(
+            "CourseChangeLogWriter.flush() inserted {inserted} and updated {updated} rows.".format(
+                inserted=inserted, updated=updated
+            )
+        )
+        return inserted, updated
+
+    @staticmethod
+    def _get_key(course_change_log: CourseChangeLog) -> tuple:
+        key = logged_version_key(course_change_log.location, course_change_log.publication_date)
+        return key + (course_change_log.operation,)
+
+    @staticmethod
+    def _get_existing_ids(records) -> dict:
+        """
+        Returns {(location, publication_date, operation): id} for the rows
+        that already exist for records, in a single query.
+        """
+        locations = {normalize_key(record.location) for record in records}
+        queryset = CourseChangeLog.objects.filter(location__in=locations).values_list(
+            "id", "location", "publication_date", "operation"
+        )
+        return {
+            logged_version_key(location, publication_date) + (operation,): pk
+            for pk, location, publication_date, operation in queryset
+        }
+
+
+def write_block_snapshots(course_key, snapshots: dict, batch_size: int = None) -> tuple:
+    """
+    Bring the CourseBlockSnapshot rows of course_key up to date.
+
+    snapshots: {location: {field: value}} for the blocks visited by an audit,
+    where the fields are those of SNAPSHOT_FIELDS. Only rows that are new or
+    whose values have changed are written.
+
+    Returns the number of rows (inserted, updated).
+    """
+    batch_size = batch_size or settings.PLUGIN_CMS_BULK_BATCH_SIZE
+    existing = {
+        str(snapshot.location): snapshot for snapshot in CourseBlockSnapshot.objects.filter(course_id=course_key)
+    }
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    for location, values in snapshots.items():
+        snapshot = existing.get(str(location))
+        if snapshot is None:
+            to_create.append(CourseBlockSnapshot(course_id=course_key, location=location, **values))
+        elif any(getattr(snapshot, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(snapshot, field, value)
+            snapshot.modified = now
+            to_update.append(snapshot)
+
+    with transaction.atomic():
+        CourseBlockSnapshot.objects.bulk_create(to_create, batch_size=batch_size)
+        CourseBlockSnapshot.objects.bulk_update(to_update, SNAPSHOT_FIELDS + ("modified",), batch_size=batch_size)
+
+    return len(to_create), len(to_update)
+
+
+def _truncate(value):
+    return value[-255:] if value is not None else None
+
+
+def _to_float(value):
+    return float(value) if value != "" else None
+
+
+def _to_int(value):
+    return int(value) if value != "" else None
+
+
+def _to_datetime(value):
+    return datetime.strptime(value, COURSE_AUDIT_DATE_FORMAT) if value != "" else None
+
+
+class CourseAuditWriter:
+    """
+    Writes a new generation of the CourseAudit rows of a course from the rows
+    produced by views.course_audit.get_analyzed_course().
+
+    Rows are consumed in chunks: the authors of each chunk are resolved in
+    a single query, the rows are converted to CourseAudit instances in memory
+    and then written with bulk_create(), under a newly allocated generation that readers
+    do not see until write() publishes it. The generations it replaces are
+    garbage-collected in the background.
+    """
+
+    def __init__(self, course_key, batch_size: int = None):
+        self.course_key = course_key
+        self.batch_size = batch_size or settings.PLUGIN_CMS_BULK_BATCH_SIZE
+        self.generation = None
+        self.inserted = 0
+
+    @staticmethod
+    def get_users(rows) -> dict:
+        """
+        Returns {username: User} for the s_changed_by values of rows.
+        """
+        usernames = {
+            str(row["s_changed_by"]) for row in rows if not isinstance(row, CourseAudit) and row["s_changed_by"]
+        }
+        if not usernames:
+            return {}
+        return User.objects.filter(username__in=usernames).in_bulk(field_name="username")
+
+    def to_course_audit(self, row, users: dict) -> CourseAudit:
+        """
+        Convert one row of get_analyzed_course() into an unsaved CourseAudit.
+        Rows that are persisted CourseAudit records, reused by incremental
+        audits, are copied into the new generation.
+        """
+        if isinstance(row, CourseAudit):
+            return self.copy_course_audit(row)
+
+        return CourseAudit(
+            course_id=self.course_key,
+            generation=self.generation,
+            a_order=int(row["a_order"]),
+            b_course=_truncate(row["b_course"]),
+            c_module=_truncate(row["c_module"]),
+            d_section=_truncate(row["d_section"]),
+            e_unit=_truncate(row["e_unit"]),
+            e2_block_type=_truncate(row["e2_block_type"]),
+            f_xblock_customized_html=row.get("f_xblock_customized_html"),
+            f_graded=row["f_graded"],
+            g_section_weight=_to_float(row["g_section_weight"]),
+            h_number_graded_sections=_to_int(row["h_number_graded_sections"]),
+            i_component_type=_truncate(row["i_component_type"]),
+            # the row carries the name of the non-standard component type, if any.
+            j_non_standard_element=True if row["j_non_standard_element"] else None,
+            k_problem_weight=_to_float(row["k_problem_weight"]),
+            m_iframe_external_url=row["m_iframe_external_url"],
+            m_external_links=row["m_external_links"],
+            n_asset_type=row["n_asset_type"],
+            o_unit_url=row["o_unit_url"],
+            p_studio_url=row["p_studio_url"],
+            q_xml_filename=_truncate(row["q_xml_filename"]),
+            r_publication_date=_to_datetime(row["r_publication_date"]),
+            s_changed_by=users.get(str(row["s_changed_by"])) if row["s_changed_by"] else None,
+            t_change_made=_to_datetime(row["t_change_made"]),
+            vertical_location=row.get("vertical_location"),
+            vertical_edited_on=row.get("vertical_edited_on"),
+        )
+
+    def copy_course_audit(self, record: CourseAudit) -> CourseAudit:
+        now = timezone.now()
+        record.pk = None
+        record._state.adding = True
+        record.generation = self.generation
+        record.created = now
+        record.modified = now
+        for field in ("b_course", "c_module", "d_section", "e_unit"):
+            setattr(record, field, _truncate(getattr(record, field)))
+        return record
+
+    def write(self, rows, progress=None) -> int:
+        """
+        Write rows as a new generation of the course's audit and publish it.
+        Returns the number of rows written.
+
+        progress: optional callable, called with the number of rows written
+        so far after each chunk.
+        """
+        self.generation = CourseAuditPointer.allocate_generation(self.course_key)
+
+        # rows is consumed one chunk at a time, so that it can be a generator
+        # and memory use stays flat. each chunk is written in its own short
+        # transaction: the generation is not visible to readers until it is
+        # published, so a failed run only leaves behind unpublished rows for
+        # the garbage collector.
+        for chunk in chunked(rows, self.batch_size):
+            users = self.get_users(chunk)
+            records = [self.to_course_audit(row, users) for row in chunk]
+            with transaction.atomic():
+                CourseAudit.objects.bulk_create(records, batch_size=self.batch_size)
+            self.inserted += len(records)
+            if progress is not None:
+                progress(self.inserted)
+
+        if CourseAuditPointer.publish(self.course_key, self.generation):
+            transaction.on_commit(lambda: invalidate_course_audit(self.course_key))
+            transaction.on_commit(lambda: purge_stale_course_audit_task.delay(str(self.course_key)))
+
+        log.info(
+            "CourseAuditWriter.write() wrote {inserted} rows for {course_key}, generation {generation}.".format(
+                inserted=self.inserted, course_key=self.course_key, generation=self.generation
+            )
+        )
+        return self.inserted